@@ -0,0 +1,186 @@
+import argparse
+import os
+import sqlite3
+import time
+from datetime import datetime, timedelta, timezone
+
+# Atribusi PnL per strategi: deal dari history_deals_get dimasukkan bertahap ke tabel
+# SQLite lokal (ticket unik, jadi sync berulang aman), sekaligus memperbarui rollup harian
+# per tag strategi / simbol / side. Laporan rentang tanggal hanya membaca rollup.
+# Tag strategi = comment deal pembuka posisi ("Auto entry (RSI/Fibo)", "TrendCatcherBot", ...),
+# jadi deal penutup (TP/SL, "Partial Close") tetap masuk ke strategi yang membuka posisinya.
+
+DB_PATH = 'data/attribution.sqlite'
+SYNC_SLACK = 12 * 3600  # detik mundur dari deal terakhir (selisih zona waktu server)
+DEAL_BUY = 0
+DEAL_SELL = 1
+ENTRY_IN = 0
+SIDES = {DEAL_BUY: 'BUY', DEAL_SELL: 'SELL'}
+METRICS = ['deals', 'closed', 'volume', 'profit', 'commission', 'swap', 'fee', 'net', 'wins', 'losses']
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS deals (
+    ticket INTEGER PRIMARY KEY,
+    time INTEGER NOT NULL,
+    day TEXT NOT NULL,
+    position_id INTEGER,
+    order_ticket INTEGER,
+    symbol TEXT,
+    type INTEGER,
+    entry INTEGER,
+    volume REAL,
+    price REAL,
+    profit REAL,
+    commission REAL,
+    swap REAL,
+    fee REAL,
+    magic INTEGER,
+    comment TEXT,
+    tag TEXT,
+    side TEXT
+);
+CREATE INDEX IF NOT EXISTS deals_time ON deals (time);
+CREATE INDEX IF NOT EXISTS deals_position ON deals (position_id, entry);
+CREATE TABLE IF NOT EXISTS daily (
+    day TEXT NOT NULL,
+    tag TEXT NOT NULL,
+    symbol TEXT NOT NULL,
+    side TEXT NOT NULL,
+    deals INTEGER NOT NULL DEFAULT 0,
+    closed INTEGER NOT NULL DEFAULT 0,
+    volume REAL NOT NULL DEFAULT 0,
+    profit REAL NOT NULL DEFAULT 0,
+    commission REAL NOT NULL DEFAULT 0,
+    swap REAL NOT NULL DEFAULT 0,
+    fee REAL NOT NULL DEFAULT 0,
+    net REAL NOT NULL DEFAULT 0,
+    wins INTEGER NOT NULL DEFAULT 0,
+    losses INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, tag, symbol, side)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER);
+"""
+
+ROLLUP_SQL = """
+INSERT INTO daily (day, tag, symbol, side, deals, closed, volume, profit, commission, swap, fee, net, wins, losses)
+VALUES (?, ?, ?, ?, 1, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (day, tag, symbol, side) DO UPDATE SET
+    deals = deals + 1,
+    closed = closed + excluded.closed,
+    volume = volume + excluded.volume,
+    profit = profit + excluded.profit,
+    commission = commission + excluded.commission,
+    swap = swap + excluded.swap,
+    fee = fee + excluded.fee,
+    net = net + excluded.net,
+    wins = wins + excluded.wins,
+    losses = losses + excluded.losses
+"""
+
+def connect(path=DB_PATH):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA)
+    return conn
+
+def day_of(ts):
+    return datetime.fromtimestamp(int(ts), timezone.utc).strftime('%Y-%m-%d')
+
+# --- INGEST ---
+def _opening(conn, position_id):
+    return conn.execute('SELECT tag, side FROM deals WHERE position_id = ? AND entry = ? LIMIT 1',
+                        (position_id, ENTRY_IN)).fetchone()
+
+def ingest(conn, deals, magic=None):
+    added = 0
+    last_time = 0
+    with conn:
+        for deal in sorted(deals, key=lambda d: (d.time, d.ticket)):
+            last_time = max(last_time, deal.time)
+            # Hanya deal buy/sell; balance, credit, dsb. dilewati
+            if deal.type not in SIDES or (magic is not None and deal.magic != magic):
+                continue
+            if deal.entry == ENTRY_IN:
+                tag, side = deal.comment or '-', SIDES[deal.type]
+            else:
+                # Deal penutup mewarisi tag dan side posisi (side keluar berlawanan dengan posisi)
+                opening = _opening(conn, deal.position_id)
+                tag, side = opening if opening else ('(tanpa entry)', SIDES[1 - deal.type])
+            day = day_of(deal.time)
+            cursor = conn.execute(
+                'INSERT OR IGNORE INTO deals VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (deal.ticket, deal.time, day, deal.position_id, deal.order, deal.symbol, deal.type, deal.entry,
+                 deal.volume, deal.price, deal.profit, deal.commission, deal.swap, deal.fee, deal.magic,
+                 deal.comment, tag, side))
+            if cursor.rowcount == 0:
+                continue
+            added += 1
+            net = deal.profit + deal.commission + deal.swap + deal.fee
+            closing = deal.entry != ENTRY_IN
+            conn.execute(ROLLUP_SQL, (day, tag, deal.symbol, side, int(closing), deal.volume, deal.profit,
+                                      deal.commission, deal.swap, deal.fee, net,
+                                      int(closing and net > 0), int(closing and net < 0)))
+        if last_time:
+            conn.execute('INSERT INTO meta VALUES (?, ?) ON CONFLICT (key) DO UPDATE SET value = MAX(value, excluded.value)',
+                         ('last_deal_time', last_time))
+    return added
+
+def sync(conn, since=None, magic=None):
+    # Diimport di sini supaya laporan tetap bisa dibuat di mesin tanpa terminal MT5
+    import MetaTrader5 as mt5
+    if not mt5.initialize():
+        print(f'Gagal koneksi MT5: {mt5.last_error()}')
+        return 0
+    try:
+        row = conn.execute("SELECT value FROM meta WHERE key = 'last_deal_time'").fetchone()
+        if since is None:
+            since = datetime.fromtimestamp(row[0] - SYNC_SLACK, timezone.utc) if row else \
+                datetime.now(timezone.utc) - timedelta(days=90)
+        deals = mt5.history_deals_get(since, datetime.now(timezone.utc) + timedelta(days=1))
+        if deals is None:
+            print(f'Gagal ambil history deal: {mt5.last_error()}')
+            return 0
+        return ingest(conn, deals, magic)
+    finally:
+        mt5.shutdown()
+
+# --- REPORT ---
+def report(conn, start, end, by=('tag',)):
+    columns = ', '.join(by)
+    sums = ', '.join(f'SUM({m}) AS {m}' for m in METRICS)
+    sql = f'SELECT {columns}, {sums} FROM daily WHERE day BETWEEN ? AND ? GROUP BY {columns} ORDER BY net DESC'
+    return list(by) + METRICS, conn.execute(sql, (start, end)).fetchall()
+
+def print_report(header, rows):
+    widths = [max(len(str(h)), *(len(_fmt(r[i])) for r in rows)) if rows else len(h) for i, h in enumerate(header)]
+    print('  '.join(h.ljust(w) for h, w in zip(header, widths)))
+    for r in rows:
+        print('  '.join(_fmt(v).ljust(w) for v, w in zip(r, widths)))
+
+def _fmt(value):
+    return f'{value:.2f}' if isinstance(value, float) else str(value)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Atribusi PnL per strategi (comment) / simbol / side')
+    parser.add_argument('--db', default=DB_PATH)
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p_sync = sub.add_parser('sync', help='ambil deal baru dari terminal MT5')
+    p_sync.add_argument('--since', help='mis. 2024-01-01 (default: lanjut dari deal terakhir)')
+    p_sync.add_argument('--magic', type=int)
+
+    p_report = sub.add_parser('report', help='laporan rentang tanggal dari rollup harian')
+    p_report.add_argument('start', help='YYYY-MM-DD')
+    p_report.add_argument('end', help='YYYY-MM-DD')
+    p_report.add_argument('--by', nargs='+', default=['tag'], choices=['day', 'tag', 'symbol', 'side'])
+
+    args = parser.parse_args()
+    conn = connect(args.db)
+    if args.command == 'sync':
+        since = datetime.fromisoformat(args.since).replace(tzinfo=timezone.utc) if args.since else None
+        print(f'{sync(conn, since, args.magic)} deal baru disimpan')
+    else:
+        start = time.perf_counter()
+        header, rows = report(conn, args.start, args.end, args.by)
+        print_report(header, rows)
+        print(f'({(time.perf_counter() - start) * 1000:.1f} ms)')
@@ -0,0 +1,199 @@
+import argparse
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+# Dataset histori bar terpartisi: <root>/<symbol>/<tf>/<YYYY-MM>.arrow
+# Format Arrow IPC (feather v2) kolumnar, terkompresi lz4 per kolom. Baca rentang waktu
+# hanya membuka partisi bulan yang dibutuhkan, lewat memory map.
+# Sumber: download bertahap dari MT5 (bisa dilanjutkan) atau import CSV export MT5 (paralel).
+
+DATA_ROOT = 'data/history'
+COMPRESSION = 'lz4'  # None = tanpa kompresi, partisi bisa dibaca zero-copy
+COLUMNS = ['time', 'open', 'high', 'low', 'close', 'tick_volume', 'spread', 'real_volume']
+TIMEFRAMES = ['M1', 'M5', 'M15', 'M30', 'H1', 'H4', 'D1']
+TF_SECONDS = {'M1': 60, 'M5': 300, 'M15': 900, 'M30': 1800, 'H1': 3600, 'H4': 14400, 'D1': 86400}
+SYMBOLS = ['XAUUSDm', 'EURUSDm', 'USDJPYm', 'EURJPYm', 'GBPJPYm']
+
+SCHEMA = pa.schema([
+    ('time', pa.int64()),
+    ('open', pa.float64()),
+    ('high', pa.float64()),
+    ('low', pa.float64()),
+    ('close', pa.float64()),
+    ('tick_volume', pa.int64()),
+    ('spread', pa.int32()),
+    ('real_volume', pa.int64()),
+])
+
+# --- PARTITIONS ---
+def partition_path(root, symbol, tf, month):
+    return os.path.join(root, symbol, tf, f'{month}.arrow')
+
+def month_key(ts):
+    return datetime.fromtimestamp(int(ts), timezone.utc).strftime('%Y-%m')
+
+def month_range(start, end):
+    y, m = start.year, start.month
+    while (y, m) <= (end.year, end.month):
+        yield f'{y:04d}-{m:02d}'
+        y, m = (y + 1, 1) if m == 12 else (y, m + 1)
+
+def month_bounds(month):
+    y, m = map(int, month.split('-'))
+    start = datetime(y, m, 1, tzinfo=timezone.utc)
+    end = datetime(y + 1, 1, 1, tzinfo=timezone.utc) if m == 12 else datetime(y, m + 1, 1, tzinfo=timezone.utc)
+    return start, end
+
+def write_partition(root, symbol, tf, month, df):
+    path = partition_path(root, symbol, tf, month)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    if os.path.exists(path):
+        df = pd.concat([read_partition(path), df])
+    df = df.drop_duplicates('time', keep='last').sort_values('time')
+    table = pa.Table.from_pandas(df[COLUMNS], schema=SCHEMA, preserve_index=False)
+    # Tulis ke file sementara lalu rename supaya partisi tidak pernah setengah jadi
+    tmp = path + '.tmp'
+    feather.write_feather(table, tmp, compression=COMPRESSION or 'uncompressed')
+    os.replace(tmp, path)
+    return len(df)
+
+def read_partition(path):
+    return feather.read_table(path, memory_map=True).to_pandas()
+
+def last_time(path):
+    # Partisi selalu ditulis urut waktu: cukup baca kolom time
+    times = feather.read_table(path, columns=['time'], memory_map=True)['time']
+    return int(times[-1].as_py()) if len(times) else None
+
+def write_frame(root, symbol, tf, df):
+    months = df['time'].map(month_key)
+    total = 0
+    for month, part in df.groupby(months):
+        total += write_partition(root, symbol, tf, month, part)
+    return total
+
+# --- DOWNLOAD DARI MT5 ---
+def download(root, symbols, tfs, start, end=None):
+    # Diimport di sini supaya baca dataset tetap bisa di mesin tanpa terminal MT5
+    import MetaTrader5 as mt5
+    if not mt5.initialize():
+        print(f'Gagal koneksi MT5: {mt5.last_error()}')
+        return
+    end = end or datetime.now(timezone.utc)
+    try:
+        for symbol in symbols:
+            mt5.symbol_select(symbol, True)
+            for tf in tfs:
+                timeframe = getattr(mt5, f'TIMEFRAME_{tf}')
+                for month in month_range(start, end):
+                    path = partition_path(root, symbol, tf, month)
+                    m_start, m_end = month_bounds(month)
+                    until = min(m_end, end)
+                    # Resume: partisi yang ada hanya dilanjutkan dari bar terakhirnya; dilewati
+                    # jika bar terakhir sudah menutup rentang (akhir bulan atau akhir permintaan)
+                    last = last_time(path) if os.path.exists(path) else None
+                    if last is not None:
+                        if last + TF_SECONDS[tf] >= until.timestamp():
+                            continue
+                        m_start = datetime.fromtimestamp(last, timezone.utc)
+                    rates = mt5.copy_rates_range(symbol, timeframe, m_start, until)
+                    if rates is None or len(rates) == 0:
+                        continue
+                    # Bulan yang berakhir di libur pasar tidak pernah "penuh": tanpa bar baru, tidak ditulis
+                    if last is not None and rates['time'][-1] <= last and until < end:
+                        continue
+                    n = write_partition(root, symbol, tf, month, pd.DataFrame(rates))
+                    print(f'{symbol} {tf} {month}: {n} bar')
+    finally:
+        mt5.shutdown()
+
+# --- IMPORT CSV EXPORT MT5 ---
+FILENAME_RE = re.compile(r'^(?P<symbol>[A-Za-z0-9.#_-]+?)_(?P<tf>M\d+|H\d+|D1|W1|MN1)(?:_|\.)')
+
+def parse_mt5_csv(path):
+    df = pd.read_csv(path, sep='\t')
+    df.columns = [c.strip('<>').lower() for c in df.columns]
+    stamp = df['date'] + ' ' + df['time'] if 'time' in df.columns else df['date']
+    times = pd.to_datetime(stamp, format='%Y.%m.%d %H:%M:%S' if 'time' in df.columns else '%Y.%m.%d')
+    out = pd.DataFrame({
+        'time': times.to_numpy().astype('datetime64[s]').astype(np.int64),
+        'open': df['open'],
+        'high': df['high'],
+        'low': df['low'],
+        'close': df['close'],
+        'tick_volume': df.get('tickvol', 0),
+        'spread': df.get('spread', 0),
+        'real_volume': df.get('vol', 0),
+    })
+    return path, out
+
+def import_csv(root, paths, symbol=None, tf=None, workers=None):
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for path, df in pool.map(parse_mt5_csv, paths):
+            match = FILENAME_RE.match(os.path.basename(path))
+            sym = symbol or (match and match.group('symbol'))
+            frame = tf or (match and match.group('tf'))
+            if not sym or not frame:
+                print(f'{path}: symbol/timeframe tidak dikenali, pakai --symbol dan --tf')
+                continue
+            n = write_frame(root, sym, frame, df)
+            print(f'{path}: {len(df)} bar -> {sym} {frame} ({n} bar di partisi terkait)')
+
+# --- READ ---
+def load(symbol, tf, start, end, root=DATA_ROOT):
+    frames = []
+    for month in month_range(start, end):
+        path = partition_path(root, symbol, tf, month)
+        if os.path.exists(path):
+            frames.append(feather.read_table(path, memory_map=True))
+    if not frames:
+        return pd.DataFrame(columns=COLUMNS)
+    table = pa.concat_tables(frames)
+    times = table.column('time').to_numpy()
+    lo = np.searchsorted(times, int(start.timestamp()))
+    hi = np.searchsorted(times, int(end.timestamp()), side='right')
+    df = table.slice(lo, hi - lo).to_pandas()
+    df['time'] = df['time'].to_numpy().astype('datetime64[s]')
+    return df
+
+def _parse_date(text):
+    return datetime.fromisoformat(text).replace(tzinfo=timezone.utc)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Dataset histori bar terpartisi')
+    parser.add_argument('--root', default=DATA_ROOT)
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p_dl = sub.add_parser('download', help='download bertahap dari terminal MT5')
+    p_dl.add_argument('--symbols', nargs='+', default=SYMBOLS)
+    p_dl.add_argument('--tf', nargs='+', default=['M1', 'M15', 'H1', 'H4'], choices=TIMEFRAMES)
+    p_dl.add_argument('--start', required=True, help='mis. 2022-01-01')
+    p_dl.add_argument('--end')
+
+    p_csv = sub.add_parser('import', help='import CSV export MT5 secara paralel')
+    p_csv.add_argument('paths', nargs='+')
+    p_csv.add_argument('--symbol')
+    p_csv.add_argument('--tf', choices=TIMEFRAMES)
+    p_csv.add_argument('--workers', type=int)
+
+    p_read = sub.add_parser('read', help='baca rentang waktu')
+    p_read.add_argument('symbol')
+    p_read.add_argument('tf', choices=TIMEFRAMES)
+    p_read.add_argument('start')
+    p_read.add_argument('end')
+
+    args = parser.parse_args()
+    if args.command == 'download':
+        download(args.root, args.symbols, args.tf, _parse_date(args.start),
+                 _parse_date(args.end) if args.end else None)
+    elif args.command == 'import':
+        import_csv(args.root, args.paths, args.symbol, args.tf, args.workers)
+    else:
+        df = load(args.symbol, args.tf, _parse_date(args.start), _parse_date(args.end), args.root)
+        print(df)
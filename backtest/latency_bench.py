@@ -0,0 +1,504 @@
+import argparse
+import collections
+import datetime as _dt
+import io
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import types
+import numpy as np
+
+# Benchmark latency tick-ke-order end-to-end untuk loop asli tiap bot.
+# Setiap bot dijalankan di subprocess sendiri dengan modul MetaTrader5 palsu (pasar lokal
+# berskrip) dan time.sleep virtual, jadi siklus 60 / 900 detik selesai dalam milidetik.
+# Harness menyuntikkan pergerakan harga saat bot tidur lalu mengukur sampai request
+# order_send entry terkirim:
+#   virtual  = waktu pasar (termasuk sisa sleep / jadwal bot)  -> latency keputusan sebenarnya
+#   compute  = waktu CPU sejak bot bangun sampai order_send     -> biaya kode bot
+# compute dipecah per stage: wake (bangun -> panggilan MT5 pertama), data_fetch
+# (sampai panggilan copy_rates terakhir selesai), decision (sisa sampai order_send).
+# Harga injeksi diturunkan dari swing / high-low M15 yang sama dengan yang dilihat bot (lihat
+# SCENARIOS), jadi setiap injeksi memang memicu entry. yahmin diukur lewat scan_batch seperti loop
+# produksinya. Order entry pertama setelah injeksi = sampel; order lain
+# di siklus yang sama (mis. simbol lain di scan yahmin) bagian dari respon yang sama.
+# missed (injeksi tanpa order) dan spurious (order tanpa injeksi) dilaporkan sebagai
+# peringatan: jika tidak nol, angka latency tidak mewakili semua injeksi.
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# nama: (direktori, modul, fungsi loop, skenario, datetime virtual)
+BOTS = {
+    'plekendu': ('plekendu_hytam', 'bot', 'main', 'pullback', True),
+    'donovan_bot': ('donovan_watkins', 'bot', 'main_loop', 'pullback', False),
+    'donovan_botv2': ('donovan_watkins', 'botv2', 'main_loop', 'pullback', False),
+    'donovan_botv3': ('donovan_watkins', 'botv3', 'main_loop', 'new_swing', False),
+    'yahmin': ('yahmin_demand', 'bot', 'scan_batch', 'fibo_zone', False),
+}
+# Konstanta modul bot yang diganti sebelum loop jalan (skenario new_swing mengukur pemasangan limit)
+OVERRIDES = {'donovan_botv3': {'ENTRY_MODE': 'limit'}}
+# skenario: (acuan high/low, posisi harga injeksi di antara low..high)
+#   pullback  : swing fractal, di atas swing low dan di bawah level entry Fibonacci 0.382 (RSI turun)
+#   new_swing : swing fractal, dekat swing high sehingga limit di level Fibonacci masih valid
+#   fibo_zone : high/low 50 candle M15 (jumlah_candle_m15 yahmin), di zona 0.5-0.618
+SCENARIOS = {'pullback': ('swing', 0.2), 'new_swing': ('swing', 0.8), 'fibo_zone': ('extremes', 0.56)}
+STAGES = ('wake', 'data_fetch', 'decision')
+MAX_WAIT_CYCLES = 200  # siklus tanpa order setelah injeksi sebelum sampel dianggap missed
+SPIN_STEP = 1.0        # detik virtual per datetime.now() (loop busy-wait seperti plekendu)
+YAHMIN_SLEEP = 900
+
+class StopBench(BaseException):
+    # BaseException supaya tidak tertangkap `except Exception` di loop bot
+    pass
+
+# --- PASAR LOKAL BERSKRIP ---
+RATES_DTYPE = np.dtype([('time', '<i8'), ('open', '<f8'), ('high', '<f8'), ('low', '<f8'), ('close', '<f8'),
+                        ('tick_volume', '<u8'), ('spread', '<i4'), ('real_volume', '<u8')])
+TradePosition = collections.namedtuple('TradePosition', 'ticket time type magic volume price_open sl tp '
+                                                        'price_current profit symbol comment identifier')
+TradeOrder = collections.namedtuple('TradeOrder', 'ticket time_setup type magic volume_initial volume_current '
+                                                  'price_open sl tp symbol comment')
+TradeDeal = collections.namedtuple('TradeDeal', 'ticket order time type entry magic position_id volume price '
+                                                'commission swap profit fee symbol comment')
+TF_SECONDS = {1: 60, 15: 900, 30: 1800, 16385: 3600, 16388: 14400}
+
+class Market:
+    def __init__(self, clock, base=2000.0, slope=0.5, amp=6.0, period=24, spread=0.2):
+        self.clock = clock
+        self.base = base
+        self.slope = slope
+        self.amp = amp
+        self.period = period
+        self.spread = spread
+        self.bar = 2000
+        self.bid = self.mid(self.bar)
+        self.msc = 1
+        self.positions = {}
+        self.orders = {}
+        self.deals = []
+        self.next_ticket = 1000
+        self.hook = None
+
+    def mid(self, i):
+        return self.base + self.slope * i + self.amp * np.sin(2 * np.pi * np.asarray(i) / self.period)
+
+    def rates(self, timeframe, start, count):
+        last = self.bar - start
+        idx = np.arange(max(last - count + 1, 1), last + 1)
+        out = np.zeros(len(idx), RATES_DTYPE)
+        close = self.mid(idx)
+        open_ = self.mid(idx - 1)
+        if start == 0:
+            close[-1] = self.bid  # candle berjalan: close = bid terbaru
+        out['time'] = idx * TF_SECONDS.get(timeframe, 900)
+        out['open'] = open_
+        out['close'] = close
+        out['high'] = np.maximum(open_, close) + 0.3
+        out['low'] = np.minimum(open_, close) - 0.3
+        out['tick_volume'] = 100 + idx % 50
+        out['spread'] = int(round(self.spread / 0.01))
+        return out
+
+    # Swing fractal terakhir di M15 (window 2, termasuk candle berjalan) seperti detect_fractal bot
+    def swing(self, window=2, count=100):
+        rates = self.rates(15, 0, count)
+        highs, lows = rates['high'], rates['low']
+        high = low = None
+        for i in range(window, len(rates) - window):
+            if highs[i] == highs[i - window:i + window + 1].max():
+                high = highs[i]
+            if lows[i] == lows[i - window:i + window + 1].min():
+                low = lows[i]
+        return high, low
+
+    def extremes(self, count=50):
+        rates = self.rates(15, 0, count)
+        return rates['high'].max(), rates['low'].min()
+
+    # Pergerakan yang disuntikkan
+    def inject(self, scenario):
+        self.bar += 1
+        self.settle()
+        anchor, ratio = SCENARIOS[scenario]
+        self.bid = float(self.mid(self.bar))
+        # Harga baru mengubah candle berjalan (dan bisa menggeser swing): ulangi sampai stabil
+        for _ in range(5):
+            high, low = getattr(self, anchor)()
+            if high is None or low is None or high <= low:
+                break
+            target = round(float(low + ratio * (high - low)), 2)
+            if target == self.bid:
+                break
+            self.bid = target
+        self.msc += 1
+
+    def quiet(self):
+        self.bid = float(self.mid(self.bar))
+        self.msc += 1
+
+    # Posisi kena TP dan pending terisi: terminal kembali kosong untuk sampel berikutnya
+    def settle(self):
+        now = int(self.clock.now())
+        for pos in list(self.positions.values()):
+            self.next_ticket += 1
+            self.deals.append(TradeDeal(self.next_ticket, self.next_ticket, now, 1 - pos.type, 1, pos.magic,
+                                        pos.ticket, pos.volume, self.bid, 0.0, 0.0, 0.0, 0.0, pos.symbol, '[tp]'))
+        self.positions.clear()
+        self.orders.clear()
+
+    # Pending terisi: posisi baru dengan ticket = ticket order (akun hedging), deal IN membawa ticket order
+    def fill(self, ticket):
+        order = self.orders.pop(ticket)
+        now = int(self.clock.now())
+        side = order.type % 2  # BUY_LIMIT/BUY_STOP -> BUY, SELL_LIMIT/SELL_STOP -> SELL
+        self.positions[ticket] = TradePosition(ticket, now, side, order.magic, order.volume_current, order.price_open,
+                                               order.sl, order.tp, order.price_open, 0.0, order.symbol, order.comment,
+                                               ticket)
+        self.next_ticket += 1
+        self.deals.append(TradeDeal(self.next_ticket, ticket, now, side, 0, order.magic, ticket, order.volume_current,
+                                    order.price_open, 0.0, 0.0, 0.0, 0.0, order.symbol, order.comment))
+
+    # --- API MetaTrader5 ---
+    def tick(self, symbol):
+        return types.SimpleNamespace(bid=self.bid, ask=round(self.bid + self.spread, 2), last=self.bid,
+                                     time=int(self.clock.now()), time_msc=self.msc, volume=1)
+
+    def symbol_info(self, symbol):
+        return types.SimpleNamespace(name=symbol, point=0.01, digits=2, trade_stops_level=10, stops_level=10,
+                                     volume_min=0.01, volume_max=100.0, volume_step=0.01, trade_mode=4,
+                                     visible=True, spread=int(self.spread / 0.01))
+
+    def order_send(self, request):
+        if self.hook:
+            self.hook(request)
+        self.next_ticket += 1
+        ticket = self.next_ticket
+        action = request.get('action')
+        price = request.get('price', self.bid)
+        volume = request.get('volume', 0.0)
+        deal = 0
+        now = int(self.clock.now())
+        if action == 1 and request.get('position'):
+            pos = self.positions.pop(request['position'], None)
+            if pos is not None:
+                deal = ticket
+                self.deals.append(TradeDeal(ticket, ticket, now, request['type'], 1, pos.magic, pos.ticket,
+                                            volume, price, 0.0, 0.0, 0.0, 0.0, pos.symbol, request.get('comment', '')))
+        elif action == 1:
+            deal = ticket
+            self.positions[ticket] = TradePosition(ticket, now, request['type'], request.get('magic', 0), volume,
+                                                   price, request.get('sl', 0.0), request.get('tp', 0.0), price, 0.0,
+                                                   request['symbol'], request.get('comment', ''), ticket)
+            self.deals.append(TradeDeal(ticket, ticket, now, request['type'], 0, request.get('magic', 0), ticket,
+                                        volume, price, 0.0, 0.0, 0.0, 0.0, request['symbol'], request.get('comment', '')))
+        elif action == 5:
+            self.orders[ticket] = TradeOrder(ticket, now, request['type'], request.get('magic', 0), volume, volume,
+                                             price, request.get('sl', 0.0), request.get('tp', 0.0),
+                                             request['symbol'], request.get('comment', ''))
+        elif action == 7 and request.get('order') in self.orders:
+            self.orders[request['order']] = self.orders[request['order']]._replace(
+                price_open=price, sl=request.get('sl', 0.0), tp=request.get('tp', 0.0))
+        elif action == 8:
+            self.orders.pop(request.get('order'), None)
+        elif action == 6 and request.get('position') in self.positions:
+            self.positions[request['position']] = self.positions[request['position']]._replace(
+                sl=request.get('sl', 0.0), tp=request.get('tp', 0.0))
+        return types.SimpleNamespace(retcode=10008 if action == 5 else 10009, deal=deal, order=ticket, volume=volume, price=price,
+                                     bid=self.bid, ask=self.bid + self.spread, comment='Request executed',
+                                     request_id=ticket, retcode_external=0)
+
+def fake_mt5(market, log_call):
+    mt5 = types.ModuleType('MetaTrader5')
+    constants = {
+        'TIMEFRAME_M1': 1, 'TIMEFRAME_M5': 5, 'TIMEFRAME_M15': 15, 'TIMEFRAME_M30': 30,
+        'TIMEFRAME_H1': 16385, 'TIMEFRAME_H4': 16388, 'TIMEFRAME_D1': 16408,
+        'ORDER_TYPE_BUY': 0, 'ORDER_TYPE_SELL': 1, 'ORDER_TYPE_BUY_LIMIT': 2, 'ORDER_TYPE_SELL_LIMIT': 3,
+        'ORDER_TYPE_BUY_STOP': 4, 'ORDER_TYPE_SELL_STOP': 5,
+        'TRADE_ACTION_DEAL': 1, 'TRADE_ACTION_PENDING': 5, 'TRADE_ACTION_SLTP': 6, 'TRADE_ACTION_MODIFY': 7,
+        'TRADE_ACTION_REMOVE': 8, 'TRADE_ACTION_CLOSE_BY': 10,
+        'ORDER_FILLING_FOK': 0, 'ORDER_FILLING_IOC': 1, 'ORDER_FILLING_RETURN': 2, 'ORDER_TIME_GTC': 0,
+        'TRADE_RETCODE_REQUOTE': 10004, 'TRADE_RETCODE_PLACED': 10008, 'TRADE_RETCODE_DONE': 10009, 'TRADE_RETCODE_DONE_PARTIAL': 10010,
+        'TRADE_RETCODE_TIMEOUT': 10012, 'TRADE_RETCODE_PRICE_CHANGED': 10020, 'TRADE_RETCODE_PRICE_OFF': 10021,
+        'TRADE_RETCODE_CONNECTION': 10031, 'TRADE_RETCODE_INVALID_ORDER': 10035,
+        'TRADE_RETCODE_POSITION_CLOSED': 10036,
+        'DEAL_TYPE_BUY': 0, 'DEAL_TYPE_SELL': 1, 'DEAL_ENTRY_IN': 0, 'DEAL_ENTRY_OUT': 1, 'DEAL_ENTRY_INOUT': 2,
+        'DEAL_ENTRY_OUT_BY': 3,
+        'SYMBOL_TRADE_MODE_DISABLED': 0, 'SYMBOL_TRADE_MODE_LONGONLY': 1, 'SYMBOL_TRADE_MODE_SHORTONLY': 2,
+        'SYMBOL_TRADE_MODE_CLOSEONLY': 3, 'SYMBOL_TRADE_MODE_FULL': 4,
+    }
+    for name, value in constants.items():
+        setattr(mt5, name, value)
+
+    def symbol_filter(items, symbol=None, ticket=None, **kwargs):
+        return tuple(i for i in items if (symbol is None or i.symbol == symbol) and (ticket is None or i.ticket == ticket))
+
+    functions = {
+        'initialize': lambda *a, **k: True,
+        'login': lambda *a, **k: True,
+        'shutdown': lambda: None,
+        'last_error': lambda: (1, 'Success'),
+        'symbol_select': lambda symbol, enable=True: True,
+        'symbol_info': market.symbol_info,
+        'symbol_info_tick': market.tick,
+        'copy_rates_from_pos': lambda symbol, timeframe, start, count: market.rates(timeframe, start, count),
+        'positions_get': lambda **k: symbol_filter(market.positions.values(), **k),
+        'positions_total': lambda: len(market.positions),
+        'orders_total': lambda: len(market.orders),
+        'orders_get': lambda **k: symbol_filter(market.orders.values(), **k),
+        'history_deals_get': lambda *a, **k: tuple(market.deals),
+        'account_info': lambda: types.SimpleNamespace(balance=10000.0, equity=10000.0, margin_free=10000.0,
+                                                      login=1, leverage=100),
+        'order_send': market.order_send,
+    }
+    for name, fn in functions.items():
+        setattr(mt5, name, log_call(name, fn))
+    return mt5
+
+# --- WAKTU VIRTUAL ---
+class Clock:
+    def __init__(self):
+        self.offset = 1_700_000_000.0 - time.perf_counter()
+
+    def now(self):
+        return time.perf_counter() + self.offset
+
+class VirtualTime:
+    # Pengganti modul `time` di dalam modul bot: sleep virtual, time/monotonic ikut jam virtual
+    def __init__(self, clock, on_sleep):
+        self.clock = clock
+        self.on_sleep = on_sleep
+
+    def sleep(self, seconds):
+        self.on_sleep(seconds)
+
+    def time(self):
+        return self.clock.now()
+
+    def monotonic(self):
+        return self.clock.now()
+
+    def __getattr__(self, name):
+        return getattr(time, name)
+
+def virtual_datetime(clock):
+    class VirtualDatetime(_dt.datetime):
+        @classmethod
+        def now(cls, tz=None):
+            clock.offset += SPIN_STEP
+            return cls.fromtimestamp(clock.now(), tz)
+    return VirtualDatetime
+
+# --- HARNESS (di dalam subprocess bot) ---
+class Harness:
+    def __init__(self, scenario, samples, seed):
+        self.scenario = scenario
+        self.target = samples
+        self.rng = random.Random(seed)
+        self.clock = Clock()
+        self.market = Market(self.clock)
+        self.market.hook = self.on_order
+        self.main_thread = threading.get_ident()
+        self.results = []
+        self.missed = 0
+        self.spurious = 0
+        self.injected = False
+        self.active = False
+        self.sent = False
+        self.responding = False  # siklus bangun yang sudah mengirim order sampel
+        self.waited = 0
+        self.quiet_left = 1
+        self.calls = []
+        self.t_wake = 0.0
+        self.v_inject = 0.0
+
+    def log_call(self, name, fn):
+        def wrapper(*args, **kwargs):
+            if not self.active or self.sent or threading.get_ident() != self.main_thread:
+                return fn(*args, **kwargs)
+            start = time.perf_counter()
+            result = fn(*args, **kwargs)
+            self.calls.append((name, start, time.perf_counter()))
+            return result
+        return wrapper
+
+    def on_order(self, request):
+        # Hanya order entry (DEAL tanpa position, atau PENDING) yang dihitung sebagai respon
+        if request.get('position') or request.get('action') not in (1, 5):
+            return
+        if self.responding:
+            return
+        if not self.active or self.sent:
+            if self.injected:
+                self.spurious += 1
+            return
+        now = time.perf_counter()
+        self.sent = True
+        self.responding = True
+        calls = [c for c in self.calls if c[0] != 'order_send']
+        first = calls[0][1] if calls else now
+        data = [c[2] for c in calls if c[0] == 'copy_rates_from_pos']
+        data_end = max(data) if data else first
+        self.results.append({
+            'virtual_ms': (self.clock.now() - self.v_inject) * 1000,
+            'compute_ms': (now - self.t_wake) * 1000,
+            'wake': (first - self.t_wake) * 1000,
+            'data_fetch': (data_end - first) * 1000,
+            'decision': (now - data_end) * 1000,
+        })
+
+    def on_sleep(self, seconds):
+        if threading.get_ident() != self.main_thread:
+            time.sleep(min(seconds, 0.001))
+            return
+        v0 = self.clock.now()
+        self.responding = False
+        if self.active:
+            if self.sent:
+                self.active = False
+                self.quiet_left = 1
+                self.market.quiet()
+            else:
+                self.waited += 1
+                if self.waited > MAX_WAIT_CYCLES:
+                    self.missed += 1
+                    self.active = False
+                    self.quiet_left = 1
+                    self.market.quiet()
+        if len(self.results) + self.missed >= self.target:
+            raise StopBench()
+        self.clock.offset += seconds
+        if not self.active:
+            if self.quiet_left > 0:
+                self.quiet_left -= 1
+            else:
+                # Pergerakan terjadi di titik acak selama bot tidur
+                self.market.inject(self.scenario)
+                self.injected = True
+                self.active = True
+                self.sent = False
+                self.waited = 0
+                self.calls = []
+                self.v_inject = v0 + self.rng.random() * seconds
+        self.t_wake = time.perf_counter()
+
+def run_child(name, samples, seed):
+    directory, module, entry, scenario, patch_datetime = BOTS[name]
+    harness = Harness(scenario, samples, seed)
+    sys.modules['MetaTrader5'] = fake_mt5(harness.market, harness.log_call)
+    sys.path.insert(0, os.path.join(ROOT, directory))
+    real_stdout = sys.stdout
+    sys.stdout = io.StringIO() if os.name == 'nt' else open(os.devnull, 'w')
+    status = 'ok'
+    try:
+        mod = __import__(module)
+        vtime = VirtualTime(harness.clock, harness.on_sleep)
+        mod.time = vtime
+        if 'position_book' in sys.modules:
+            sys.modules['position_book'].time = vtime
+        if patch_datetime:
+            mod.datetime = virtual_datetime(harness.clock)
+        if hasattr(mod, 'STATUS_PORT'):
+            mod.STATUS_PORT = None
+        for key, value in OVERRIDES.get(name, {}).items():
+            setattr(mod, key, value)
+        if entry == 'scan_batch':
+            # Sama dengan loop utama yahmin: korelasi awal sekali, lalu scan semua simbol per siklus
+            mod.isi_awal_korelasi()
+            while True:
+                mod.scan_batch(mod.SYMBOLS)
+                vtime.sleep(YAHMIN_SLEEP)
+        else:
+            getattr(mod, entry)()
+    except StopBench:
+        pass
+    except Exception as e:
+        status = f'{type(e).__name__}: {e}'
+    finally:
+        mod = sys.modules.get(module)
+        if status == 'ok' and mod is not None and hasattr(mod, 'disconnect'):
+            try:
+                mod.disconnect()
+            except Exception:
+                pass
+        sys.stdout = real_stdout
+    print(json.dumps({'bot': name, 'status': status, 'samples': harness.results,
+                      'missed': harness.missed, 'spurious': harness.spurious}))
+    sys.stdout.flush()
+    # Thread daemon bot (stop manager, writer, dsb.) tidak perlu ditunggu
+    os._exit(0)
+
+# --- LAPORAN ---
+def percentiles(values):
+    if not values:
+        return '-'
+    p = np.percentile(values, [50, 90, 99])
+    return ' / '.join(f'{v:.2f}' for v in p)
+
+def report(results):
+    print(f"{'bot':<15} {'n':>5} {'miss':>5} {'spur':>5}  {'virtual detik p50/p90/p99':<28} "
+          f"{'compute ms p50/p90/p99':<26} " + ' '.join(f'{s + " p50":>15}' for s in STAGES))
+    warnings = []
+    for r in results:
+        if r['status'] != 'ok' and not r['samples']:
+            print(f"{r['bot']:<15} dilewati: {r['status']}")
+            continue
+        s = r['samples']
+        virtual = percentiles([x['virtual_ms'] / 1000 for x in s])
+        compute = percentiles([x['compute_ms'] for x in s])
+        stages = ' '.join(f"{np.median([x[st] for x in s]):>15.3f}" if s else f"{'-':>15}" for st in STAGES)
+        print(f"{r['bot']:<15} {len(s):>5} {r['missed']:>5} {r['spurious']:>5}  {virtual:<28} {compute:<26} {stages}")
+        injected = len(s) + r['missed']
+        if r['missed'] or r['spurious']:
+            warnings.append(f"{r['bot']}: {r['missed']}/{injected} injeksi tanpa order, {r['spurious']} order "
+                            f"tanpa injeksi -> pencocokan sinyal-order tidak andal, latency hanya dari {len(s)} sampel")
+    for line in warnings:
+        print(f'PERINGATAN {line}')
+
+def run_parent(names, samples, seed, timeout):
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for name in names:
+            # cwd sementara: log, journal dan file statistik bot tidak mengotori repo
+            cwd = os.path.join(workdir, name)
+            os.makedirs(cwd)
+            try:
+                proc = subprocess.run([sys.executable, os.path.abspath(__file__), '--child', name,
+                                       '--samples', str(samples), '--seed', str(seed)],
+                                      cwd=cwd, capture_output=True, text=True, timeout=timeout)
+                lines = [l for l in proc.stdout.splitlines() if l.startswith('{')]
+                if lines:
+                    results.append(json.loads(lines[-1]))
+                else:
+                    error = (proc.stderr.strip().splitlines() or ['tanpa output'])[-1]
+                    results.append({'bot': name, 'status': error, 'samples': [], 'missed': 0, 'spurious': 0})
+            except subprocess.TimeoutExpired:
+                results.append({'bot': name, 'status': f'timeout {timeout} detik', 'samples': [],
+                                'missed': 0, 'spurious': 0})
+    return results
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark latency tick-ke-order loop bot dengan pasar lokal')
+    parser.add_argument('bots', nargs='*', default=list(BOTS), help=f"pilihan: {', '.join(BOTS)}")
+    parser.add_argument('--samples', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--timeout', type=float, default=300)
+    parser.add_argument('--json', help='simpan hasil mentah ke file ini')
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child, args.samples, args.seed)
+    unknown = [b for b in args.bots if b not in BOTS]
+    if unknown:
+        parser.error(f"bot tidak dikenal: {', '.join(unknown)}")
+    start = time.perf_counter()
+    results = run_parent(args.bots, args.samples, args.seed, args.timeout)
+    report(results)
+    print(f'\nSelesai dalam {time.perf_counter() - start:.1f} detik')
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f)
@@ -0,0 +1,229 @@
+import argparse
+import time
+import numpy as np
+import pandas as pd
+
+# Simulasi Monte Carlo (block bootstrap) untuk strategi tanpa stop loss:
+# - plekendu_hytam: 1 posisi, arah dari RSI midline, TP tetap dalam IDR, sl 0.0
+# - damoes_skeleton: maks 4 buy + 4 sell, entry dari fractal, TP tetap dalam IDR
+# Semua path disimulasikan bersamaan sebagai array NumPy (paths x slot posisi).
+
+# --- CONFIG ---
+TP_RUPIAH = 5000
+USD_IDR_RATE = 16000
+RSI_PERIOD = 14
+ENTRY_INTERVAL_BARS = 5
+CONTRACT_SIZE = 100
+LEVERAGE = 200
+MARGIN_CALL_LEVEL = 1.0  # equity / margin
+BALANCE = 1000.0
+SPREAD = 0.20
+
+STRATEGIES = {
+    'plekendu': {'max_buy': 1, 'max_sell': 1, 'max_total': 1, 'lot': 0.01},
+    'damoes': {'max_buy': 4, 'max_sell': 4, 'max_total': 8, 'lot': 0.03},
+}
+
+# --- DATA ---
+def load_closes(path):
+    if path.endswith('.npy'):
+        return np.load(path).astype(np.float64)
+    # Export CSV MT5: <DATE> <TIME> <OPEN> <HIGH> <LOW> <CLOSE> ... (tab separated)
+    df = pd.read_csv(path, sep=None, engine='python')
+    df.columns = [c.strip('<>').lower() for c in df.columns]
+    return df['close'].to_numpy(dtype=np.float64)
+
+# Sama dengan calculate_tp_distance di plekendu_hytam/bot.py
+def calculate_tp_distance(lot):
+    usd_target = TP_RUPIAH / USD_IDR_RATE
+    pip_value = 1.0 * lot
+    pip_target = usd_target / pip_value
+    return round(pip_target * 0.01, 2)
+
+# --- BLOCK BOOTSTRAP ---
+# Batas block disinkronkan antar path: tiap `block` bar semua path mengambil
+# titik awal baru sekaligus, lalu return per bar cukup dibaca dari satu baris matriks.
+class BlockSampler:
+    def __init__(self, log_returns, n_paths, block, rng):
+        self.returns = log_returns
+        self.n_paths = n_paths
+        self.block = block
+        self.rng = rng
+        self.max_start = len(log_returns) - block
+        if self.max_start <= 0:
+            raise ValueError('Data historis lebih pendek dari ukuran block')
+        self.offsets = np.arange(block)[:, None]
+        self.pos = block
+        self.current = None
+
+    def step(self):
+        if self.pos == self.block:
+            starts = self.rng.integers(0, self.max_start, self.n_paths)
+            self.current = self.returns[starts[None, :] + self.offsets]
+            self.pos = 0
+        r = self.current[self.pos]
+        self.pos += 1
+        return r
+
+# --- SIMULATION ---
+def simulate(closes, strategy='plekendu', n_paths=20000, horizon=7200, block=60,
+             seed=None, balance=BALANCE, leverage=LEVERAGE, spread=SPREAD):
+    rules = STRATEGIES[strategy]
+    lot = rules['lot']
+    slots = rules['max_total']
+    value = lot * CONTRACT_SIZE
+    exit_distance = calculate_tp_distance(lot) + spread
+    rng = np.random.default_rng(seed)
+
+    log_returns = np.diff(np.log(closes))
+    sampler = BlockSampler(log_returns, n_paths, block, rng)
+    rows = np.arange(n_paths)
+
+    price = np.full(n_paths, closes[-1])
+    alive = np.ones(n_paths, dtype=bool)
+    realized = np.zeros(n_paths)
+
+    # Slot posisi (slot x path, supaya reduksi antar slot tetap kontigu) plus
+    # agregat per path supaya floating PnL cukup O(paths) per bar
+    entry = np.zeros((slots, n_paths))
+    side = np.zeros((slots, n_paths))  # +1 buy, -1 sell, 0 kosong
+    n_buy = np.zeros(n_paths, dtype=np.int64)
+    n_sell = np.zeros(n_paths, dtype=np.int64)
+    net_side = np.zeros(n_paths)
+    net_entry = np.zeros(n_paths)
+    buy_target = np.full(n_paths, np.inf)    # TP buy terdekat
+    sell_target = np.full(n_paths, -np.inf)  # TP sell terdekat
+
+    # Warm up RSI Wilder (seperti ta.RSIIndicator) dari data historis terakhir
+    delta = np.diff(closes[-(RSI_PERIOD * 5):])
+    avg_gain = np.full(n_paths, np.clip(delta, 0, None)[-RSI_PERIOD:].mean())
+    avg_loss = np.full(n_paths, np.clip(-delta, 0, None)[-RSI_PERIOD:].mean())
+
+    # Jendela fractal 5 bar (2 kiri, 2 kanan) pakai close, disimpan sebagai ring
+    window = np.repeat(closes[-5:, None], n_paths, axis=1)
+
+    peak = np.full(n_paths, balance)
+    max_dd = np.zeros(n_paths)
+    max_float_dd = np.zeros(n_paths)
+    trough_bar = np.zeros(n_paths, dtype=np.int64)
+    recovered_bar = np.full(n_paths, -1, dtype=np.int64)
+    margin_call = np.zeros(n_paths, dtype=bool)
+
+    for t in range(horizon):
+        r = sampler.step()
+        r[~alive] = 0.0
+        diff = price * np.expm1(r)
+        price += diff
+
+        if strategy == 'plekendu':
+            avg_gain += (np.maximum(diff, 0) - avg_gain) / RSI_PERIOD
+            avg_loss += (np.maximum(-diff, 0) - avg_loss) / RSI_PERIOD
+        else:
+            window[t % 5] = price
+
+        # Take profit: hanya path yang melewati target terdekat yang diperiksa per slot
+        hit_rows = np.flatnonzero(((price >= buy_target) | (price <= sell_target)) & alive)
+        if hit_rows.size:
+            s = side[:, hit_rows]
+            e = entry[:, hit_rows]
+            hit = (s != 0) & ((price[hit_rows] - e) * s >= exit_distance)
+            closed = s * hit
+            realized[hit_rows] += hit.sum(axis=0) * (exit_distance - spread) * value
+            n_buy[hit_rows] -= (closed > 0).sum(axis=0)
+            n_sell[hit_rows] -= (closed < 0).sum(axis=0)
+            net_side[hit_rows] -= closed.sum(axis=0)
+            net_entry[hit_rows] -= (closed * e).sum(axis=0)
+            s -= closed
+            side[:, hit_rows] = s
+            buy_target[hit_rows] = np.where(s > 0, e + exit_distance, np.inf).min(axis=0)
+            sell_target[hit_rows] = np.where(s < 0, e - exit_distance, -np.inf).max(axis=0)
+
+        if t % ENTRY_INTERVAL_BARS == 0:
+            if strategy == 'plekendu':
+                rsi = 100 - 100 / (1 + avg_gain / np.maximum(avg_loss, 1e-12))
+                want = np.sign(rsi - 50)
+                want[rsi < 30] = 1.0
+                want[rsi > 70] = -1.0
+            else:
+                mid = window[(t - 2) % 5]
+                want = (mid == window.min(axis=0)) * 1.0 - (mid == window.max(axis=0))
+            room = ((want > 0) & (n_buy < rules['max_buy'])) | ((want < 0) & (n_sell < rules['max_sell']))
+            room &= (n_buy + n_sell < slots) & alive
+            p = rows[room]
+            if p.size:
+                w = want[p]
+                s = np.argmax(side[:, p] == 0, axis=0)
+                side[s, p] = w
+                entry[s, p] = price[p]
+                n_buy[p] += w > 0
+                n_sell[p] += w < 0
+                net_side[p] += w
+                net_entry[p] += w * price[p]
+                buy_target[p] = np.where(w > 0, np.minimum(buy_target[p], price[p] + exit_distance), buy_target[p])
+                sell_target[p] = np.where(w < 0, np.maximum(sell_target[p], price[p] - exit_distance), sell_target[p])
+
+        n_open = n_buy + n_sell
+        floating = (price * net_side - net_entry - n_open * spread) * value
+        equity = balance + realized + floating
+
+        margin = n_open * value * price / leverage
+        called = alive & (n_open > 0) & (equity < margin * MARGIN_CALL_LEVEL)
+        if called.any():
+            margin_call |= called
+            alive &= ~called
+
+        np.maximum(max_float_dd, -floating, out=max_float_dd)
+        dd = peak - equity
+        deeper = dd > max_dd
+        if deeper.any():
+            max_dd[deeper] = dd[deeper]
+            trough_bar[deeper] = t
+            recovered_bar[deeper] = -1
+        back = (equity >= peak) & (recovered_bar < 0) & (max_dd > 0)
+        recovered_bar[back] = t
+        np.maximum(peak, equity, out=peak)
+
+    recovery = np.where(recovered_bar >= 0, recovered_bar - trough_bar, np.nan)
+    return {
+        'max_float_dd': max_float_dd,
+        'max_dd': max_dd,
+        'margin_call': margin_call,
+        'recovery_bars': recovery,
+        'final_equity': equity,
+    }
+
+# --- REPORT ---
+def report(result, balance=BALANCE):
+    q = [50, 90, 95, 99]
+    fdd = np.percentile(result['max_float_dd'], q)
+    dd = np.percentile(result['max_dd'], q)
+    rec = result['recovery_bars']
+    unrecovered = np.isnan(rec).mean() * 100
+    print('Persentil      ' + ''.join(f'{f"p{x}":>12}' for x in q))
+    print('Max float DD $ ' + ''.join(f'{v:12.2f}' for v in fdd))
+    print('Max float DD % ' + ''.join(f'{v / balance * 100:12.2f}' for v in fdd))
+    print('Max equity DD $' + ''.join(f'{v:12.2f}' for v in dd))
+    if np.isfinite(rec).any():
+        print('Recovery (bar) ' + ''.join(f'{v:12.0f}' for v in np.nanpercentile(rec, q)))
+    print(f"Probabilitas margin call: {result['margin_call'].mean() * 100:.2f}%")
+    print(f'Path tidak pulih dari DD terdalam: {unrecovered:.2f}%')
+    print(f"Median equity akhir: {np.median(result['final_equity']):.2f}")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Monte Carlo drawdown strategi tanpa stop loss')
+    parser.add_argument('data', help='CSV export MT5 atau file .npy berisi harga close')
+    parser.add_argument('--strategy', choices=list(STRATEGIES), default='plekendu')
+    parser.add_argument('--paths', type=int, default=20000)
+    parser.add_argument('--horizon', type=int, default=7200, help='jumlah bar M1 per path')
+    parser.add_argument('--block', type=int, default=60, help='panjang block bootstrap (bar)')
+    parser.add_argument('--balance', type=float, default=BALANCE)
+    parser.add_argument('--leverage', type=float, default=LEVERAGE)
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    closes = load_closes(args.data)
+    start = time.perf_counter()
+    result = simulate(closes, args.strategy, args.paths, args.horizon, args.block,
+                      args.seed, args.balance, args.leverage)
+    print(f'{args.paths} path x {args.horizon} bar ({args.strategy}) selesai dalam {time.perf_counter() - start:.1f} detik')
+    report(result, args.balance)
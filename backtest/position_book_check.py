@@ -0,0 +1,141 @@
+import argparse
+import os
+import sys
+import threading
+import time
+
+# Cek PositionBook terhadap terminal palsu dari latency_bench (tanpa MT5 asli):
+#   pending_fill : pending kita dipasang (on_result PLACED), terisi, lalu update() -> posisi
+#                  masuk buku dengan SL/TP dari order dan pending hilang tanpa menunggu reconcile
+#   concurrent   : update() dari dua thread (loop utama + StopManager) selagi deal baru masuk ->
+#                  buku tetap sama dengan terminal, tidak ada deal yang diterapkan dua kali
+# Exit code 1 jika ada cek yang gagal.
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'shared'))
+import latency_bench as lb
+
+market = lb.Market(lb.Clock())
+# Terminal palsu tidak thread-safe: setiap panggilan API diserialkan (terminal asli juga begitu)
+market_lock = threading.RLock()
+
+def locked(name, fn):
+    def call(*args, **kwargs):
+        with market_lock:
+            return fn(*args, **kwargs)
+    return call
+
+mt5 = lb.fake_mt5(market, locked)
+sys.modules['MetaTrader5'] = mt5
+import position_book
+
+SYMBOL = 'XAUUSDm'
+MAGIC = 123456
+
+def new_book():
+    with market_lock:
+        market.positions.clear()
+        market.orders.clear()
+        market.deals.clear()
+    book = position_book.PositionBook(SYMBOL, MAGIC)
+    book.start()
+    return book
+
+def send(book, request):
+    request = dict(request, symbol=SYMBOL, magic=MAGIC)
+    result = mt5.order_send(request)
+    if book:
+        book.on_result(request, result)
+    return result
+
+def check_pending_fill():
+    book = new_book()
+    result = send(book, {'action': mt5.TRADE_ACTION_PENDING, 'type': mt5.ORDER_TYPE_BUY_LIMIT,
+                         'volume': 0.02, 'price': 1990.0, 'sl': 1985.0, 'tp': 2000.0})
+    book.update()
+    errors = []
+    if [o['ticket'] for o in book.pending()] != [result.order]:
+        errors.append(f'pending tidak tercatat: {book.pending()}')
+    market.fill(result.order)
+    reconciled = book._last_reconcile
+    book.update()
+    positions = book.snapshot()
+    if book._last_reconcile != reconciled:
+        errors.append('posisi baru masuk lewat reconcile, bukan dari deal')
+    if len(positions) != 1 or positions[0]['ticket'] != result.order:
+        errors.append(f'posisi hasil pending tidak ada di buku: {positions}')
+    elif (positions[0]['sl'], positions[0]['tp'], positions[0]['volume']) != (1985.0, 2000.0, 0.02):
+        errors.append(f'SL/TP/volume posisi salah: {positions[0]}')
+    if book.pending():
+        errors.append(f'pending yang sudah terisi masih di buku: {book.pending()}')
+    if book.count(mt5.ORDER_TYPE_BUY, SYMBOL) != 1:
+        errors.append(f'count BUY = {book.count(mt5.ORDER_TYPE_BUY, SYMBOL)}')
+    drift = book.reconcile()
+    if drift:
+        errors.append(f'drift setelah sync: {drift}')
+    return errors
+
+def check_concurrent(rounds):
+    book = new_book()
+    stop = threading.Event()
+    done = [0, 0]
+
+    def worker(n):
+        while not stop.is_set():
+            book.update()
+            done[n] += 1
+
+    # Tiap perubahan ditunggu sampai kedua thread menyelesaikan update() penuh sesudahnya (keduanya
+    # tetap saling balapan): perubahan yang tidak mengubah jumlah posisi di antara dua cek hanya
+    # tertangkap reconcile berkala, bukan yang diuji di sini
+    def settle_threads():
+        target = [d + 2 for d in done]
+        while any(d < t for d, t in zip(done, target)):
+            time.sleep(0)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(2)]
+    for t in threads:
+        t.start()
+    try:
+        # Order di luar bot (tanpa on_result): hanya terlihat lewat deal
+        for i in range(rounds):
+            result = send(None, {'action': mt5.TRADE_ACTION_DEAL, 'type': i % 2, 'volume': 0.01, 'price': 2000.0})
+            settle_threads()
+            if i % 3 == 2:
+                with market_lock:
+                    market.settle()
+                settle_threads()
+            elif i % 5 == 4:
+                send(None, {'action': mt5.TRADE_ACTION_DEAL, 'type': 1 - i % 2, 'volume': 0.01, 'price': 2000.0,
+                            'position': result.order})
+                settle_threads()
+    finally:
+        stop.set()
+        for t in threads:
+            t.join()
+    book.update()
+    errors = []
+    if book.drift_total:
+        errors.append(f'{book.drift_total} drift dikoreksi reconcile selama update bersamaan')
+    drift = book.reconcile()
+    if drift:
+        errors.append(f'buku beda dengan terminal: {drift}')
+    if abs(book.volume(symbol=SYMBOL) - sum(p.volume for p in market.positions.values())) > 1e-9:
+        errors.append(f'volume buku {book.volume(symbol=SYMBOL)}')
+    return errors
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Cek PositionBook dengan terminal palsu')
+    parser.add_argument('--rounds', type=int, default=200, help='order pada cek concurrent')
+    args = parser.parse_args()
+
+    # Cek jumlah posisi/order di setiap update, pengaman berkala tidak ikut campur
+    position_book.DEALS_INTERVAL = 0.0
+    position_book.RECONCILE_INTERVAL = 1e9
+    failed = 0
+    for name, check in (('pending_fill', check_pending_fill), ('concurrent', lambda: check_concurrent(args.rounds))):
+        errors = check()
+        failed += bool(errors)
+        print(f"{name:14} {'OK' if not errors else 'GAGAL'}")
+        for error in errors:
+            print(f'  {error}')
+    sys.exit(1 if failed else 0)
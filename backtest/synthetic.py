@@ -0,0 +1,207 @@
+import argparse
+import time
+from datetime import datetime, timezone
+import numpy as np
+import pandas as pd
+
+# Generator data pasar sintetis untuk stress test: mid price GBM + lompatan (Poisson),
+# volatilitas/drift berganti regime (rantai Markov, durasi eksponensial), spread tergantung
+# sesi (jam UTC) yang melebar di regime stres dan sesaat setelah lompatan.
+# Semua dibuat per blok sebagai array NumPy; state (harga, regime, waktu) dibawa antar blok,
+# jadi hasil untuk seed dan ukuran blok yang sama selalu identik.
+# Output: tick berformat copy_ticks_range (.npy, dibaca bar_builder / replay) dan bar berformat
+# copy_rates_from_pos / dataset history.py (dibaca history.load, monte_carlo, backtest lain).
+
+SECONDS_PER_YEAR = 365 * 24 * 3600
+BLOCK = 1_000_000
+TICK_DTYPE = np.dtype([('time', '<i8'), ('bid', '<f8'), ('ask', '<f8'), ('last', '<f8'), ('volume', '<u8'),
+                       ('time_msc', '<i8'), ('flags', '<u4'), ('volume_real', '<f8')])
+TIMEFRAMES = {'M1': 60, 'M5': 300, 'M15': 900, 'M30': 1800, 'H1': 3600, 'H4': 14400, 'D1': 86400}
+TICK_FLAG_BID_ASK = 6  # TICK_FLAG_BID | TICK_FLAG_ASK
+
+# Spread dasar (point) per jam UTC: Asia lebar, London/NY sempit, rollover paling lebar
+SESSION_SPREAD = np.array([35, 30, 28, 26, 26, 25, 24, 22, 18, 16, 16, 16,
+                           16, 15, 14, 14, 15, 16, 18, 20, 22, 26, 45, 40], dtype=np.float64)
+
+PRESETS = {
+    # regime: (volatilitas tahunan, drift tahunan, rata-rata durasi detik, faktor spread)
+    'default': {
+        'regimes': [(0.12, 0.0, 6 * 3600, 1.0), (0.25, 0.0, 2 * 3600, 1.5), (0.60, 0.0, 1800, 3.0)],
+        'jumps_per_day': 1.0, 'jump_mean': 0.0, 'jump_std': 0.004,
+    },
+    'trend': {
+        # Trend panjang searah: musuh scalper tanpa stop loss
+        'regimes': [(0.15, 1.5, 12 * 3600, 1.0), (0.30, 3.0, 3 * 3600, 1.5)],
+        'jumps_per_day': 0.5, 'jump_mean': 0.001, 'jump_std': 0.003,
+    },
+    'crash': {
+        'regimes': [(0.15, 0.0, 4 * 3600, 1.0), (0.90, -4.0, 1800, 5.0)],
+        'jumps_per_day': 4.0, 'jump_mean': -0.004, 'jump_std': 0.008,
+    },
+}
+
+class SyntheticMarket:
+    def __init__(self, seed=1, preset='default', start=None, price=2000.0, point=0.01, digits=2,
+                 tick_interval=0.5, blowout_seconds=120, blowout_factor=4.0, **overrides):
+        params = dict(PRESETS[preset], **overrides)
+        self.rng = np.random.default_rng(seed)
+        regimes = np.array(params['regimes'], dtype=np.float64)
+        self.vol, self.drift, self.duration, self.spread_factor = regimes.T
+        self.jump_rate = params['jumps_per_day'] / 86400
+        self.jump_mean = params['jump_mean']
+        self.jump_std = params['jump_std']
+        self.point = point
+        self.digits = digits
+        self.tick_interval = tick_interval
+        self.blowout_seconds = blowout_seconds
+        self.blowout_factor = blowout_factor
+        start = start or datetime(2024, 1, 1, tzinfo=timezone.utc)
+        # State antar blok
+        self.log_price = np.log(price)
+        self.msc = int(start.timestamp() * 1000)
+        self.regime = 0
+        self.regime_left = self.rng.exponential(self.duration[0])
+        self.last_jump = -np.inf
+
+    # --- REGIME ---
+    def _regimes(self, dt):
+        # Regime per tick: pergantian saat sisa durasi habis, regime baru dipilih acak (selain yang aktif)
+        out = np.empty(len(dt), np.int64)
+        elapsed = np.cumsum(dt)
+        pos, offset = 0, 0.0
+        while pos < len(dt):
+            end = np.searchsorted(elapsed, offset + self.regime_left, side='right')
+            out[pos:end] = self.regime
+            if end >= len(dt):
+                self.regime_left -= elapsed[-1] - offset
+                break
+            offset += self.regime_left
+            k = len(self.vol)
+            if k > 1:
+                self.regime = (self.regime + self.rng.integers(1, k)) % k
+            self.regime_left = self.rng.exponential(self.duration[self.regime])
+            pos = end
+        return out
+
+    # --- TICK ---
+    def ticks(self, n):
+        rng = self.rng
+        # Jeda antar tick eksponensial (ms, minimal 1)
+        gaps = np.maximum(rng.exponential(self.tick_interval * 1000, n).astype(np.int64), 1)
+        msc = self.msc + np.cumsum(gaps)
+        dt = gaps / 1000.0
+        regime = self._regimes(dt)
+        vol = self.vol[regime]
+        years = dt / SECONDS_PER_YEAR
+        steps = (self.drift[regime] - 0.5 * vol ** 2) * years + vol * np.sqrt(years) * rng.standard_normal(n)
+        jumps = rng.random(n) < self.jump_rate * dt
+        n_jumps = int(jumps.sum())
+        if n_jumps:
+            steps[jumps] += rng.normal(self.jump_mean, self.jump_std, n_jumps)
+        log_price = self.log_price + np.cumsum(steps)
+        mid = np.exp(log_price)
+
+        # Spread: sesi x regime x blowout setelah lompatan x noise
+        hour = (msc // 3_600_000) % 24
+        spread = SESSION_SPREAD[hour] * self.spread_factor[regime] * rng.lognormal(0.0, 0.15, n)
+        jump_times = np.concatenate(([self.last_jump], msc[jumps]))
+        since_jump = msc - jump_times[np.searchsorted(msc[jumps], msc, side='right')]
+        spread[since_jump < self.blowout_seconds * 1000] *= self.blowout_factor
+        spread = np.maximum(np.round(spread), 1)
+
+        out = np.zeros(n, TICK_DTYPE)
+        out['time_msc'] = msc
+        out['time'] = msc // 1000
+        out['bid'] = np.round(mid - spread * self.point / 2, self.digits)
+        out['ask'] = np.round(out['bid'] + spread * self.point, self.digits)
+        out['flags'] = TICK_FLAG_BID_ASK
+        out['volume'] = 1
+        self.log_price = log_price[-1]
+        self.msc = int(msc[-1])
+        if n_jumps:
+            self.last_jump = msc[jumps][-1]
+        return out
+
+    def stream(self, total, block=BLOCK):
+        while total > 0:
+            n = min(block, total)
+            total -= n
+            yield self.ticks(n)
+
+# --- BAR DARI TICK (vektor) ---
+def ticks_to_bars(ticks, seconds, point=0.01):
+    # Sama dengan bar terminal: harga bid, spread minimum dalam bar, tanpa bar kosong
+    bucket = ticks['time'] // seconds
+    starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+    bid = ticks['bid']
+    spread = np.round((ticks['ask'] - bid) / point).astype(np.int32)
+    out = np.zeros(len(starts), np.dtype([('time', '<i8'), ('open', '<f8'), ('high', '<f8'), ('low', '<f8'),
+                                          ('close', '<f8'), ('tick_volume', '<u8'), ('spread', '<i4'),
+                                          ('real_volume', '<u8')]))
+    out['time'] = bucket[starts] * seconds
+    out['open'] = bid[starts]
+    out['high'] = np.maximum.reduceat(bid, starts)
+    out['low'] = np.minimum.reduceat(bid, starts)
+    out['close'] = bid[np.r_[starts[1:], len(bid)] - 1]
+    out['tick_volume'] = np.diff(np.r_[starts, len(bid)])
+    out['spread'] = np.minimum.reduceat(spread, starts)
+    return out
+
+def merge_bars(previous, bars):
+    # Bar terakhir blok sebelumnya bisa berlanjut di blok berikutnya
+    if previous is None or len(previous) == 0:
+        return bars
+    if len(bars) and bars['time'][0] == previous['time'][-1]:
+        a, b = previous[-1].copy(), bars[0]
+        a['high'] = max(a['high'], b['high'])
+        a['low'] = min(a['low'], b['low'])
+        a['close'] = b['close']
+        a['tick_volume'] += b['tick_volume']
+        a['spread'] = min(a['spread'], b['spread'])
+        return np.concatenate((previous[:-1], [a], bars[1:]))
+    return np.concatenate((previous, bars))
+
+def generate(total, tfs=('M1',), seed=1, preset='default', keep_ticks=True, block=BLOCK, **kwargs):
+    market = SyntheticMarket(seed, preset, **kwargs)
+    ticks = []
+    bars = {tf: None for tf in tfs}
+    for chunk in market.stream(total, block):
+        if keep_ticks:
+            ticks.append(chunk)
+        for tf in tfs:
+            bars[tf] = merge_bars(bars[tf], ticks_to_bars(chunk, TIMEFRAMES[tf], market.point))
+    return (np.concatenate(ticks) if keep_ticks else None), bars
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Data pasar sintetis (GBM + lompatan + regime + spread sesi)')
+    parser.add_argument('--ticks', type=int, default=5_000_000)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--preset', choices=list(PRESETS), default='default')
+    parser.add_argument('--price', type=float, default=2000.0)
+    parser.add_argument('--start', default='2024-01-01')
+    parser.add_argument('--tf', nargs='+', default=['M1', 'M15', 'H1', 'H4'], choices=list(TIMEFRAMES))
+    parser.add_argument('--tick-out', help='simpan tick ke .npy (format copy_ticks_range)')
+    parser.add_argument('--closes-out', help='simpan close M1 ke .npy (input monte_carlo.py)')
+    parser.add_argument('--symbol', default='SYNTH', help='nama simbol di dataset history')
+    parser.add_argument('--root', help='tulis bar ke dataset history.py di root ini')
+    args = parser.parse_args()
+
+    start_time = datetime.fromisoformat(args.start).replace(tzinfo=timezone.utc)
+    started = time.perf_counter()
+    ticks, bars = generate(args.ticks, args.tf, args.seed, args.preset, keep_ticks=bool(args.tick_out),
+                           price=args.price, start=start_time)
+    elapsed = time.perf_counter() - started
+    print(f'{args.ticks:,} tick dalam {elapsed:.2f} detik ({args.ticks / elapsed:,.0f} tick/detik)')
+    for tf, b in bars.items():
+        print(f"{tf}: {len(b)} bar, close {b['close'][0]:.2f} -> {b['close'][-1]:.2f}, "
+              f"low {b['low'].min():.2f}, high {b['high'].max():.2f}, spread max {b['spread'].max()}")
+    if args.tick_out:
+        np.save(args.tick_out, ticks)
+    if args.closes_out:
+        first = 'M1' if 'M1' in bars else args.tf[0]
+        np.save(args.closes_out, bars[first]['close'])
+    if args.root:
+        from history import write_frame
+        for tf, b in bars.items():
+            n = write_frame(args.root, args.symbol, tf, pd.DataFrame(b))
+            print(f'{args.symbol} {tf}: {n} bar ditulis ke {args.root}')
@@ -0,0 +1,606 @@
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timezone
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'yahmin_demand'))
+from batch_signals import compute_signals
+
+# Turnamen strategi satu pass: dataset dimuat sekali, indikator dihitung sekali sebagai array
+# penuh dan dibagi antar strategi (cache per nama, mis. 'fractal(2)@M15' dipakai bot, botv2
+# dan botv3), lalu semua strategi melangkah bersama bar M1 yang sama.
+# Tiap strategi meniru aturan bot aslinya (entry, SL/TP, stop manager, batas posisi);
+# keputusan memakai bar timeframe besar yang sudah selesai + harga M1 saat itu (tanpa look-ahead).
+# Exit SL/TP dicek dari high/low M1; jika keduanya kena di bar yang sama, SL dianggap duluan.
+# Limit yang terisi di sebuah bar baru dicek SL/TP-nya mulai bar berikutnya: urutan harga di
+# dalam bar M1 tidak diketahui, jadi low/high yang mengisi limit tidak dipakai juga untuk exit.
+
+BALANCE = 1000.0
+PRIMARY = 'XAUUSDm'
+TIMEFRAMES = {'M1': 60, 'M15': 900, 'H1': 3600, 'H4': 14400}
+# simbol: (point, contract size, spread default dalam point)
+SPECS = {
+    'XAUUSDm': (0.01, 100, 20),
+    'EURUSDm': (0.00001, 100000, 10),
+    'USDJPYm': (0.001, 100000, 12),
+    'EURJPYm': (0.001, 100000, 18),
+    'GBPJPYm': (0.001, 100000, 25),
+}
+STOPS_LEVEL = 10  # point
+USDJPY_FALLBACK = 150.0
+
+# --- DATA ---
+def _arrays(df):
+    times = df['time'].to_numpy()
+    if np.issubdtype(times.dtype, np.datetime64):
+        times = times.astype('datetime64[s]').astype(np.int64)
+    out = {'time': times.astype(np.int64)}
+    for name in ('open', 'high', 'low', 'close', 'spread'):
+        out[name] = df[name].to_numpy(dtype=np.float64)
+    return out
+
+def load_history(symbols, start, end, root):
+    from history import load
+    data = {}
+    for symbol in symbols:
+        for tf in TIMEFRAMES:
+            df = load(symbol, tf, start, end, root)
+            if len(df) == 0:
+                raise ValueError(f'Data {symbol} {tf} kosong di {root}')
+            data[(symbol, tf)] = _arrays(df)
+    return data
+
+def load_synthetic(ticks, seed, preset):
+    from synthetic import generate
+    _, bars = generate(ticks, tuple(TIMEFRAMES), seed, preset, keep_ticks=False)
+    return {(PRIMARY, tf): _arrays(pd.DataFrame(b)) for tf, b in bars.items()}
+
+# --- INDIKATOR BERSAMA ---
+def ema(close, span, adjust=True):
+    return pd.Series(close).ewm(span=span, adjust=adjust).mean().to_numpy()
+
+def rsi_rolling(close, period):
+    # Sama dengan calculate_rsi di bot.py / botv2.py
+    delta = pd.Series(close).diff()
+    gain = delta.where(delta > 0, 0.0).rolling(period).mean()
+    loss = (-delta.where(delta < 0, 0.0)).rolling(period).mean()
+    return (100 - 100 / (1 + gain / loss)).to_numpy()
+
+def rsi_ewm(close, period, adjust=True):
+    # adjust=True: calculate_rsi botv3, adjust=False: ta.RSIIndicator (plekendu)
+    delta = pd.Series(close).diff()
+    gain = delta.where(delta > 0, 0.0).ewm(com=period - 1, min_periods=period, adjust=adjust).mean()
+    loss = (-delta.where(delta < 0, 0.0)).ewm(com=period - 1, min_periods=period, adjust=adjust).mean()
+    return (100 - 100 / (1 + gain / loss)).to_numpy()
+
+def atr_ewm(high, low, close, period):
+    prev = np.r_[np.nan, close[:-1]]
+    tr = np.fmax(high - low, np.fmax(np.abs(high - prev), np.abs(low - prev)))
+    return pd.Series(tr).ewm(com=period - 1, min_periods=period).mean().to_numpy()
+
+def fractals(high, low, window, lookback):
+    # Swing terakhir per bar j (bar selesai), seperti detect_fractal pada `lookback` bar terakhir:
+    # fractal di bar i baru terkonfirmasi di bar i + window
+    n = len(high)
+    size = 2 * window + 1
+    is_high = np.zeros(n, bool)
+    is_low = np.zeros(n, bool)
+    if n >= size:
+        is_high[window:n - window] = high[window:n - window] == sliding_window_view(high, size).max(axis=1)
+        is_low[window:n - window] = low[window:n - window] == sliding_window_view(low, size).min(axis=1)
+    idx = np.arange(n)
+    out = []
+    for flags, values in ((is_high, high), (is_low, low)):
+        last = np.maximum.accumulate(np.where(flags, idx, -1))
+        confirmed = np.full(n, -1)
+        confirmed[window:] = last[:n - window]
+        valid = confirmed >= idx - lookback + 1 + window
+        out.append(np.where(valid, values[np.maximum(confirmed, 0)], np.nan))
+    return out
+
+def yahmin_signals(o, h, l, c, bars=100, rsi_bars=50, chunk=5000):
+    # compute_signals yang sama dengan bot live, dijalankan untuk semua jendela 100 bar sekaligus
+    n = len(c)
+    keys = ('signal', 'atr', 'fibo', 'fib_50', 'fib_618')
+    out = {k: np.full(n, np.nan) for k in keys}
+    if n < bars:
+        return out
+    views = [sliding_window_view(x, bars) for x in (o, h, l, c)]
+    for lo in range(0, len(views[0]), chunk):
+        ohlc = np.stack([v[lo:lo + chunk] for v in views])
+        result = compute_signals(ohlc, rsi_bars=rsi_bars)
+        for k in keys:
+            out[k][bars - 1 + lo:bars - 1 + lo + ohlc.shape[1]] = result[k]
+    return out
+
+class SharedIndicators:
+    def __init__(self, data):
+        self.data = data
+        self.cache = {}
+        self.consumers = {}
+        self.compute_ms = 0.0
+
+    def get(self, name, symbol, tf, fn, consumer):
+        key = f'{name}@{tf}' if symbol == PRIMARY else f'{name}@{symbol}:{tf}'
+        self.consumers.setdefault(key, set()).add(consumer)
+        if key not in self.cache:
+            start = time.perf_counter()
+            self.cache[key] = fn(self.data[(symbol, tf)])
+            self.compute_ms += (time.perf_counter() - start) * 1000
+        return self.cache[key]
+
+    def shared(self):
+        return {k: sorted(v) for k, v in self.consumers.items() if len(v) > 1}
+
+# --- AKUN ---
+class Account:
+    def __init__(self, balance=BALANCE):
+        self.start = balance
+        self.balance = balance
+        self.positions = []
+        self.pending = []
+        self.trades = []
+        self.peak = balance
+        self.max_dd = 0.0
+        self.exposed = 0
+        self.bars = 0
+        self.day = None
+        self.day_pnl = 0.0
+
+    def open(self, symbol, side, volume, price, sl, tp, i):
+        self.positions.append({'symbol': symbol, 'side': side, 'volume': volume, 'price_open': price,
+                               'sl': sl, 'tp': tp, 'opened': i, 'initial': volume, 'partial': False})
+
+    def close(self, pos, price, volume=None, usdjpy=USDJPY_FALLBACK):
+        volume = pos['volume'] if volume is None else volume
+        point, contract, _ = SPECS.get(pos['symbol'], SPECS[PRIMARY])
+        pnl = (price - pos['price_open']) * pos['side'] * volume * contract
+        if pos['symbol'].endswith('JPYm'):
+            pnl /= usdjpy
+        self.balance += pnl
+        self.day_pnl += pnl
+        pos['volume'] = round(pos['volume'] - volume, 8)
+        if pos['volume'] <= 1e-9:
+            self.positions.remove(pos)
+        self.trades.append(pnl)
+
+    def flatten(self, quotes, usdjpy):
+        for pos in list(self.positions):
+            bid, spread = quotes[pos['symbol']][2], quotes[pos['symbol']][3]
+            self.close(pos, bid if pos['side'] > 0 else bid + spread, usdjpy=usdjpy)
+        self.pending = []
+
+    def exits(self, quotes, usdjpy, i):
+        for pos in list(self.positions):
+            if pos['opened'] == i:
+                continue
+            high, low, _, spread = quotes[pos['symbol']]
+            sl, tp = pos['sl'], pos['tp']
+            if pos['side'] > 0:
+                if sl and low <= sl:
+                    self.close(pos, sl, usdjpy=usdjpy)
+                elif tp and high >= tp:
+                    self.close(pos, tp, usdjpy=usdjpy)
+            else:
+                if sl and high + spread >= sl:
+                    self.close(pos, sl, usdjpy=usdjpy)
+                elif tp and low + spread <= tp:
+                    self.close(pos, tp, usdjpy=usdjpy)
+
+    def fill_pending(self, quotes, i):
+        for order in list(self.pending):
+            high, low, _, spread = quotes[order['symbol']]
+            if (order['side'] > 0 and low + spread <= order['price']) or (order['side'] < 0 and high >= order['price']):
+                self.pending.remove(order)
+                self.open(order['symbol'], order['side'], order['volume'], order['price'], order['sl'], order['tp'], i)
+
+    def mark(self, quotes, day, usdjpy):
+        if day != self.day:
+            self.day = day
+            self.day_pnl = 0.0
+        equity = self.balance
+        for pos in self.positions:
+            bid, spread = quotes[pos['symbol']][2], quotes[pos['symbol']][3]
+            point, contract, _ = SPECS.get(pos['symbol'], SPECS[PRIMARY])
+            exit_price = bid if pos['side'] > 0 else bid + spread
+            pnl = (exit_price - pos['price_open']) * pos['side'] * pos['volume'] * contract
+            equity += pnl / usdjpy if pos['symbol'].endswith('JPYm') else pnl
+        self.peak = max(self.peak, equity)
+        self.max_dd = max(self.max_dd, (self.peak - equity) / self.peak)
+        self.bars += 1
+        self.exposed += bool(self.positions)
+        return equity
+
+# --- STOP MANAGER (aturan StopManager.on_tick, dievaluasi di close M1) ---
+def manage_stops(account, quotes, point, be_trigger, be_offset, trail_start, trail_distance,
+                 partial_trigger, partial_ratio, base_lot, usdjpy):
+    for pos in list(account.positions):
+        _, _, bid, spread = quotes[pos['symbol']]
+        is_buy = pos['side'] > 0
+        profit_point = (bid - pos['price_open']) / point if is_buy else (pos['price_open'] - bid - spread) / point
+        # Partial close sekali per posisi, sama dengan StopManager
+        if profit_point > partial_trigger and not pos['partial'] and pos['volume'] >= base_lot * 2:
+            volume = round(pos['volume'] * partial_ratio, 2)
+            account.close(pos, bid if is_buy else bid + spread, volume, usdjpy)
+            pos['partial'] = True
+        new_sl = None
+        if profit_point > be_trigger:
+            new_sl = pos['price_open'] + be_offset * point * (1 if is_buy else -1)
+        if profit_point > trail_start:
+            trail = bid - trail_distance if is_buy else bid + spread + trail_distance
+            if new_sl is None or (trail > new_sl if is_buy else trail < new_sl):
+                new_sl = trail
+        if new_sl is None:
+            continue
+        sl = pos['sl']
+        step = 10 * point
+        if sl == 0 or (is_buy and new_sl >= sl + step) or (not is_buy and new_sl <= sl - step):
+            pos['sl'] = new_sl
+
+# --- STRATEGI ---
+class Strategy:
+    name = ''
+
+    def __init__(self, market):
+        self.market = market
+        self.account = Account()
+        self.step_ms = 0.0
+
+    def prepare(self, shared):
+        pass
+
+    def step(self, i, quotes):
+        pass
+
+class Plekendu(Strategy):
+    # plekendu_hytam/bot.py: tiap 5 menit tanpa posisi, arah dari RSI(14) M1 (ta), TP tetap IDR, tanpa SL
+    name = 'plekendu'
+    LOT = 0.01
+    INTERVAL = 5
+
+    def prepare(self, shared):
+        self.rsi = shared.get('rsi_ta(14)', PRIMARY, 'M1', lambda d: rsi_ewm(d['close'], 14, adjust=False), self.name)
+        self.tp = round(5000 / 16000 / (1.0 * self.LOT) * 0.01, 2)
+        self.next_entry = 0
+
+    def step(self, i, quotes):
+        if i < self.next_entry:
+            return
+        self.next_entry = i + self.INTERVAL
+        if self.account.positions or np.isnan(self.rsi[i]):
+            return
+        rsi = self.rsi[i]
+        side = 1 if rsi < 30 or (50 < rsi <= 70) else -1 if rsi > 70 or rsi < 50 else 0
+        if side:
+            _, _, bid, spread = quotes[PRIMARY]
+            price = bid + spread if side > 0 else bid
+            self.account.open(PRIMARY, side, self.LOT, price, 0.0, round(price + side * self.tp, 2), i)
+
+class DonovanBot(Strategy):
+    # donovan_watkins/bot.py: trend EMA50/200 H1, fractal + Fibonacci M15, entry Fibo atau RSI, 1 posisi
+    name = 'donovan_bot'
+    LOT = 0.01
+    stop_rules = False
+
+    def prepare(self, shared):
+        c = lambda d: d['close']
+        self.ema50 = shared.get('ema(close,50)', PRIMARY, 'H1', lambda d: ema(c(d), 50), self.name)
+        self.ema200 = shared.get('ema(close,200)', PRIMARY, 'H1', lambda d: ema(c(d), 200), self.name)
+        self.rsi = shared.get('rsi_rolling(14)', PRIMARY, 'M15', lambda d: rsi_rolling(c(d), 14), self.name)
+        self.swing_high, self.swing_low = shared.get(
+            'fractal(2,100)', PRIMARY, 'M15', lambda d: fractals(d['high'], d['low'], 2, 100), self.name)
+        self.point = SPECS[PRIMARY][0]
+
+    def signal(self, i):
+        h = self.market.index['H1'][i]
+        m = self.market.index['M15'][i]
+        if h < 5 or m < 0 or np.isnan(self.swing_high[m]) or np.isnan(self.swing_low[m]):
+            return None
+        trend = 1 if self.ema50[h] > self.ema200[h] else -1
+        strong = abs(self.ema50[h] - self.ema50[h - 5]) > 1.0
+        high, low = self.swing_high[m], self.swing_low[m]
+        fib_100, fib_0 = (low, high) if trend > 0 else (high, low)
+        entry = fib_100 + (fib_0 - fib_100) * (0.618 if strong else 0.382)
+        return trend, round(entry, 2), round(fib_100, 2), round(fib_0, 2), self.rsi[m]
+
+    def step(self, i, quotes):
+        if self.stop_rules:
+            manage_stops(self.account, quotes, self.point, 100, 20, 150, 50 * self.point, 200, 0.5,
+                         self.LOT, self.market.usdjpy(i))
+        if self.account.positions:
+            return
+        sig = self.signal(i)
+        if sig is None:
+            return
+        trend, entry, sl, tp, rsi = sig
+        _, _, bid, spread = quotes[PRIMARY]
+        price = bid + spread if trend > 0 else bid
+        by_fibo = price <= entry if trend > 0 else price >= entry
+        by_rsi = rsi < 30 if trend > 0 else rsi > 70
+        if not (by_fibo or by_rsi):
+            return
+        min_stop = STOPS_LEVEL * self.point
+        if self.stop_rules:
+            # botv2: SL/TP digeser minimal min_distance
+            sl = min(sl, price - min_stop) if trend > 0 else max(sl, price + min_stop)
+            tp = max(tp, price + min_stop) if trend > 0 else min(tp, price - min_stop)
+        elif trend > 0:
+            sl = price - min_stop if price - sl < min_stop else sl
+            tp = price + min_stop if tp - price < min_stop else tp
+        else:
+            sl = price + min_stop if sl - price < min_stop else sl
+            tp = price - min_stop if price - tp < min_stop else tp
+        self.account.open(PRIMARY, trend, self.LOT, price, round(sl, 2), round(tp, 2), i)
+
+class DonovanBotV2(DonovanBot):
+    # botv2: entry sama dengan bot + break-even, trailing dan partial close dari StopManager
+    name = 'donovan_botv2'
+    stop_rules = True
+
+class DonovanBotV3(Strategy):
+    # botv3: H1 = H4, entry_signal (konfirmasi candle lalu RSI atau Fibo), SL/TP & lot dari ATR,
+    # maks 3 posisi, stop manager dengan trailing ATR, berhenti 1 jam jika drawdown harian > 5%.
+    # ENTRY_MODE sama dengan konstanta botv3: 'market' (default live) atau 'limit' (pending di level
+    # Fibonacci, fallback ke market jika harga sudah melewati level)
+    name = 'donovan_botv3'
+    ENTRY_MODE = 'market'
+    BASE_LOT = 0.01
+    MAX_OPEN = 3
+    MAX_DRAWDOWN = 5.0
+    PAUSE = 60
+
+    def prepare(self, shared):
+        c = lambda d: d['close']
+        self.ema50 = shared.get('ema_nadj(close,50)', PRIMARY, 'H1', lambda d: ema(c(d), 50, False), self.name)
+        self.ema200 = shared.get('ema_nadj(close,200)', PRIMARY, 'H1', lambda d: ema(c(d), 200, False), self.name)
+        self.h4_50 = shared.get('ema_nadj(close,50)', PRIMARY, 'H4', lambda d: ema(c(d), 50, False), self.name)
+        self.h4_200 = shared.get('ema_nadj(close,200)', PRIMARY, 'H4', lambda d: ema(c(d), 200, False), self.name)
+        self.rsi = shared.get('rsi_ewm(14)', PRIMARY, 'M15', lambda d: rsi_ewm(c(d), 14), self.name)
+        self.atr = shared.get('atr_ewm(14)', PRIMARY, 'M15', lambda d: atr_ewm(d['high'], d['low'], c(d), 14), self.name)
+        self.swing_high, self.swing_low = shared.get(
+            'fractal(2,100)', PRIMARY, 'M15', lambda d: fractals(d['high'], d['low'], 2, 100), self.name)
+        self.point = SPECS[PRIMARY][0]
+        self.paused_until = 0
+
+    def sl_tp(self, price, trend, atr, min_distance):
+        if trend > 0:
+            return round(max(price - atr * 1.5, price - min_distance), 2), round(price + atr * 2, 2)
+        return round(min(price + atr * 1.5, price + min_distance), 2), round(price - atr * 2, 2)
+
+    def step(self, i, quotes):
+        account = self.account
+        usdjpy = self.market.usdjpy(i)
+        if i < self.paused_until:
+            return
+        if abs(account.day_pnl) / account.start * 100 > self.MAX_DRAWDOWN:
+            account.flatten(quotes, usdjpy)
+            self.paused_until = i + self.PAUSE
+            return
+        h = self.market.index['H1'][i]
+        h4 = self.market.index['H4'][i]
+        m = self.market.index['M15'][i]
+        if h < 5 or h4 < 0 or m < 0:
+            return
+        atr = self.atr[m]
+        manage_stops(account, quotes, self.point, 100, 20, 150, atr, 200, 0.5, self.BASE_LOT, usdjpy)
+        if np.isnan(self.swing_high[m]) or np.isnan(self.swing_low[m]) or np.isnan(atr):
+            account.pending = []
+            return
+        if len(account.positions) >= self.MAX_OPEN:
+            account.pending = []
+            return
+        trend = 1 if self.ema50[h] > self.ema200[h] else -1
+        if trend != (1 if self.h4_50[h4] > self.h4_200[h4] else -1):
+            account.pending = []
+            return
+        strong = abs(self.ema50[h] - self.ema50[h - 5]) > 1.0
+        high, low = self.swing_high[m], self.swing_low[m]
+        fib_100, fib_0 = (low, high) if trend > 0 else (high, low)
+        entry = round(fib_100 + (fib_0 - fib_100) * (0.618 if strong else 0.382), 2)
+        lot = max(self.BASE_LOT, round(account.start * 0.01 / (atr * 10), 2)) if atr else self.BASE_LOT
+        min_distance = STOPS_LEVEL * self.point
+        _, _, bid, spread = quotes[PRIMARY]
+        ask = bid + spread
+        # Konfirmasi candle entry_signal: close M15 berjalan (= bid) di atas/bawah level entry
+        confirmed = bid > entry if trend > 0 else bid < entry
+        if self.ENTRY_MODE == 'limit':
+            # entry_signal dinilai di harga fill limit: Fibo selalu lolos, tinggal konfirmasi candle
+            if not confirmed:
+                account.pending = []
+                return
+            # Limit valid jika harga belum melewati level (sama dengan LimitEntry.sync)
+            if (trend > 0 and entry < ask - min_distance) or (trend < 0 and entry > bid + min_distance):
+                sl, tp = self.sl_tp(entry, trend, atr, min_distance)
+                account.pending = [{'symbol': PRIMARY, 'side': trend, 'volume': lot, 'price': entry, 'sl': sl, 'tp': tp}]
+                return
+            account.pending = []
+        price = ask if trend > 0 else bid
+        by_fibo = price <= entry if trend > 0 else price >= entry
+        by_rsi = self.rsi[m] < 30 if trend > 0 else self.rsi[m] > 70
+        if confirmed and (by_fibo or by_rsi):
+            sl, tp = self.sl_tp(price, trend, atr, min_distance)
+            if abs(price - sl) >= min_distance and abs(tp - price) >= min_distance:
+                account.open(PRIMARY, trend, lot, price, sl, tp, i)
+
+class Yahmin(Strategy):
+    # yahmin_demand/bot.py: tiap candle M15 baru per simbol, sinyal HA / RSI(7) / Fibonacci dari
+    # compute_signals, SL 1 ATR, TP 1.5 ATR. Correlation guard disederhanakan: net lot per simbol
+    # dibatasi MAX_CORRELATED_LOTS.
+    name = 'yahmin'
+    LOT = 0.01
+    MAX_CORRELATED_LOTS = 0.03
+
+    def prepare(self, shared):
+        self.signals = {}
+        self.last_bar = {}
+        for symbol in self.market.symbols:
+            self.signals[symbol] = shared.get(
+                'yahmin_signals(100,50)', symbol, 'M15',
+                lambda d: yahmin_signals(d['open'], d['high'], d['low'], d['close']), self.name)
+            self.last_bar[symbol] = -1
+
+    def step(self, i, quotes):
+        for symbol in self.market.symbols:
+            m = self.market.index_of(symbol, 'M15', i)
+            if m == self.last_bar[symbol] or m < 0:
+                continue
+            self.last_bar[symbol] = m
+            sig = self.signals[symbol]
+            side = sig['signal'][m]
+            if np.isnan(side) or side == 0:
+                continue
+            side = int(side)
+            point = SPECS.get(symbol, SPECS[PRIMARY])[0]
+            _, _, bid, spread = quotes[symbol]
+            price = bid + spread if side > 0 else bid
+            atr = sig['atr'][m]
+            sl, tp = price - side * atr, price + side * atr * 1.5
+            if abs(price - sl) < STOPS_LEVEL * point or abs(price - tp) < STOPS_LEVEL * point:
+                continue
+            net = sum(p['volume'] * p['side'] for p in self.account.positions if p['symbol'] == symbol)
+            if abs(net + side * self.LOT) > self.MAX_CORRELATED_LOTS + 1e-9:
+                continue
+            self.account.open(symbol, side, self.LOT, price, sl, tp, i)
+
+class DonovanBotV3Limit(DonovanBotV3):
+    # botv3 dengan ENTRY_MODE = 'limit'
+    name = 'donovan_botv3_limit'
+    ENTRY_MODE = 'limit'
+
+STRATEGIES = {cls.name: cls for cls in (Plekendu, DonovanBot, DonovanBotV2, DonovanBotV3, DonovanBotV3Limit,
+                                        Yahmin)}
+
+# --- PASAR (timeline M1 simbol utama) ---
+class Market:
+    def __init__(self, data):
+        self.data = data
+        self.symbols = sorted({s for s, _ in data}, key=lambda s: s != PRIMARY)
+        clock = data[(PRIMARY, 'M1')]
+        self.time = clock['time']
+        close_time = self.time + TIMEFRAMES['M1']
+        # Indeks bar terakhir yang sudah selesai per timeframe / simbol untuk tiap bar M1
+        self.indexes = {}
+        for (symbol, tf), bars in data.items():
+            if tf == 'M1' and symbol == PRIMARY:
+                self.indexes[(symbol, tf)] = np.arange(len(self.time))
+                continue
+            ends = bars['time'] + TIMEFRAMES[tf]
+            self.indexes[(symbol, tf)] = np.searchsorted(ends, close_time, side='right') - 1
+        self.index = {tf: self.indexes[(PRIMARY, tf)] for tf in TIMEFRAMES}
+        self.quote_arrays = {}
+        for symbol in self.symbols:
+            bars = data[(symbol, 'M1')]
+            point, _, default_spread = SPECS.get(symbol, SPECS[PRIMARY])
+            spread = np.where(bars['spread'] > 0, bars['spread'], default_spread) * point
+            self.quote_arrays[symbol] = (bars['high'].tolist(), bars['low'].tolist(), bars['close'].tolist(),
+                                         spread.tolist(), self.indexes[(symbol, 'M1')].tolist())
+        usd = data.get(('USDJPYm', 'M1'))
+        self._usdjpy = usd['close'][np.maximum(self.indexes[('USDJPYm', 'M1')], 0)] if usd else None
+        self.days = (self.time // 86400).tolist()
+
+    def index_of(self, symbol, tf, i):
+        return self.indexes[(symbol, tf)][i]
+
+    def usdjpy(self, i):
+        return USDJPY_FALLBACK if self._usdjpy is None else self._usdjpy[i]
+
+    def quotes(self, i):
+        out = {}
+        for symbol, (high, low, close, spread, index) in self.quote_arrays.items():
+            j = index[i]
+            if j >= 0:
+                out[symbol] = (high[j], low[j], close[j], spread[j])
+        return out
+
+# --- TURNAMEN ---
+def run(data, names=None):
+    started = time.perf_counter()
+    market = Market(data)
+    shared = SharedIndicators(data)
+    strategies = [STRATEGIES[name](market) for name in (names or STRATEGIES)]
+    for strategy in strategies:
+        strategy.prepare(shared)
+    prepared = time.perf_counter()
+
+    n = len(market.time)
+    for i in range(n):
+        quotes = market.quotes(i)
+        if PRIMARY not in quotes:
+            continue
+        usdjpy = market.usdjpy(i)
+        day = market.days[i]
+        for strategy in strategies:
+            t0 = time.perf_counter()
+            account = strategy.account
+            account.fill_pending(quotes, i)
+            account.exits(quotes, usdjpy, i)
+            strategy.step(i, quotes)
+            account.mark(quotes, day, usdjpy)
+            strategy.step_ms += (time.perf_counter() - t0) * 1000
+    finished = time.perf_counter()
+
+    rows = []
+    for strategy in strategies:
+        account = strategy.account
+        # Posisi yang masih terbuka dinilai di harga terakhir
+        equity = account.mark(market.quotes(n - 1), market.days[-1], market.usdjpy(n - 1))
+        wins = sum(1 for p in account.trades if p > 0)
+        rows.append({
+            'strategy': strategy.name,
+            'return_pct': (equity / account.start - 1) * 100,
+            'max_dd_pct': account.max_dd * 100,
+            'trades': len(account.trades),
+            'win_pct': wins / len(account.trades) * 100 if account.trades else 0.0,
+            'exposure_pct': account.exposed / max(account.bars, 1) * 100,
+            'open_end': len(account.positions),
+            'step_ms': strategy.step_ms,
+        })
+    timing = {
+        'bars': n,
+        'indicators_ms': shared.compute_ms,
+        'prepare_ms': (prepared - started) * 1000,
+        'loop_ms': (finished - prepared) * 1000,
+        'shared': shared.shared(),
+        'cached': len(shared.cache),
+    }
+    return rows, timing
+
+def report(rows, timing):
+    print(f"{'strategi':<20} {'return %':>9} {'max DD %':>9} {'trade':>7} {'win %':>7} {'exposure %':>11} "
+          f"{'terbuka':>8} {'step ms':>9}")
+    for r in rows:
+        print(f"{r['strategy']:<20} {r['return_pct']:>9.2f} {r['max_dd_pct']:>9.2f} {r['trades']:>7} "
+              f"{r['win_pct']:>7.1f} {r['exposure_pct']:>11.1f} {r['open_end']:>8} {r['step_ms']:>9.0f}")
+    print(f"\n{timing['bars']} bar M1 | {timing['cached']} indikator dihitung sekali "
+          f"({timing['indicators_ms']:.0f} ms) | loop {timing['loop_ms']:.0f} ms")
+    for key, users in timing['shared'].items():
+        print(f"  {key} dipakai bersama: {', '.join(users)}")
+
+def _parse_date(text):
+    return datetime.fromisoformat(text).replace(tzinfo=timezone.utc)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Turnamen strategi satu pass atas data yang sama')
+    parser.add_argument('--strategies', nargs='+', choices=list(STRATEGIES), default=list(STRATEGIES))
+    parser.add_argument('--root', default='data/history', help='dataset history.py')
+    parser.add_argument('--symbols', nargs='+', default=[PRIMARY], help=f'simbol pertama harus {PRIMARY}')
+    parser.add_argument('--start', help='mis. 2024-01-01')
+    parser.add_argument('--end')
+    parser.add_argument('--synthetic', type=int, help='pakai N tick sintetis (synthetic.py), bukan dataset')
+    parser.add_argument('--preset', default='default')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    load_start = time.perf_counter()
+    if args.synthetic:
+        data = load_synthetic(args.synthetic, args.seed, args.preset)
+    else:
+        if not args.start or not args.end:
+            parser.error('--start dan --end wajib untuk dataset history')
+        data = load_history(args.symbols, _parse_date(args.start), _parse_date(args.end), args.root)
+    print(f'Data dimuat sekali: {(time.perf_counter() - load_start) * 1000:.0f} ms')
+    rows, timing = run(data, args.strategies)
+    report(rows, timing)
@@ -0,0 +1,164 @@
+import argparse
+import time
+import MetaTrader5 as mt5
+
+# Filter spread adaptif: spread per simbol dipantau dari symbol_info_tick, quantile
+# berjalan (median, p90, p99) diestimasi dengan algoritma P² (Jain & Chlamtac) yang hanya
+# menyimpan 5 marker per quantile, jadi memori konstan dan O(1) per tick.
+# "Recent": estimator diganti tiap WINDOW tick, quantile diambil dari window aktif
+# (atau window sebelumnya selama window aktif belum cukup terisi).
+
+QUANTILES = (0.5, 0.9, 0.99)
+WINDOW = 2000           # tick per window
+MIN_TICKS = 50          # sebelum ini entry ditahan
+ENTRY_PERCENTILE = 0.5  # entry hanya jika spread <= quantile ini
+MAX_SPREAD = 60         # batas keras (point), tetap berlaku walau statistik longgar
+
+class P2Quantile:
+    def __init__(self, p):
+        self.p = p
+        self.count = 0
+        self.q = []
+        self.n = [0, 1, 2, 3, 4]
+        self.np = [0.0, 2 * p, 4 * p, 2 + 2 * p, 4.0]
+        self.dn = [0.0, p / 2, p, (1 + p) / 2, 1.0]
+
+    def add(self, x):
+        self.count += 1
+        q = self.q
+        if self.count <= 5:
+            q.append(x)
+            q.sort()
+            return
+        n = self.n
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = 0
+            while x >= q[k + 1]:
+                k += 1
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self.np[i] += self.dn[i]
+        for i in (1, 2, 3):
+            d = self.np[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                d = 1 if d > 0 else -1
+                # Interpolasi parabolik, fallback linear jika keluar urutan marker
+                qp = q[i] + d / (n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+                    + (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1]))
+                if not q[i - 1] < qp < q[i + 1]:
+                    qp = q[i] + d * (q[i + d] - q[i]) / (n[i + d] - n[i])
+                q[i] = qp
+                n[i] += d
+
+    def value(self):
+        if not self.q:
+            return None
+        if self.count < 5:
+            return self.q[min(int(self.p * len(self.q)), len(self.q) - 1)]
+        return self.q[2]
+
+class SpreadMonitor:
+    def __init__(self, quantiles=QUANTILES, window=WINDOW):
+        self.quantiles = quantiles
+        self.window = window
+        self.active = {p: P2Quantile(p) for p in quantiles}
+        self.previous = None
+        self.in_window = 0
+        self.total = 0
+        self.last = None
+
+    def add(self, spread):
+        if self.in_window >= self.window:
+            self.previous = self.active
+            self.active = {p: P2Quantile(p) for p in self.quantiles}
+            self.in_window = 0
+        for estimator in self.active.values():
+            estimator.add(spread)
+        self.in_window += 1
+        self.total += 1
+        self.last = spread
+
+    def quantile(self, p):
+        if self.previous is not None and self.in_window < self.window // 2:
+            return self.previous[p].value()
+        return self.active[p].value()
+
+    def stats(self):
+        return {
+            'last': self.last,
+            'median': self.quantile(0.5),
+            'p90': self.quantile(0.9),
+            'p99': self.quantile(0.99),
+            'ticks': self.total,
+        }
+
+class SpreadFilter:
+    def __init__(self, symbols, percentile=ENTRY_PERCENTILE, max_spread=MAX_SPREAD, window=WINDOW):
+        quantiles = tuple(sorted(set(QUANTILES) | {percentile}))
+        self.symbols = list(symbols)
+        self.percentile = percentile
+        self.max_spread = max_spread
+        self.monitors = {s: SpreadMonitor(quantiles, window) for s in self.symbols}
+        self.points = {}
+        self.last_msc = {s: 0 for s in self.symbols}
+
+    def on_tick(self, symbol, tick):
+        if tick.time_msc == self.last_msc[symbol]:
+            return None
+        self.last_msc[symbol] = tick.time_msc
+        point = self.points.get(symbol)
+        if point is None:
+            info = mt5.symbol_info(symbol)
+            if not info:
+                return None
+            point = self.points[symbol] = info.point
+        spread = round((tick.ask - tick.bid) / point)
+        self.monitors[symbol].add(spread)
+        return spread
+
+    def poll(self):
+        for symbol in self.symbols:
+            tick = mt5.symbol_info_tick(symbol)
+            if tick:
+                self.on_tick(symbol, tick)
+
+    def allows(self, symbol, spread=None):
+        monitor = self.monitors[symbol]
+        spread = monitor.last if spread is None else spread
+        if spread is None or monitor.total < MIN_TICKS or spread > self.max_spread:
+            return False
+        return spread <= monitor.quantile(self.percentile)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Pantau spread per simbol (median / p90 / p99)')
+    parser.add_argument('symbols', nargs='*', default=['XAUUSDm'])
+    parser.add_argument('--interval', type=float, default=0.1)
+    parser.add_argument('--report', type=float, default=10.0, help='detik antar laporan')
+    args = parser.parse_args()
+
+    if not mt5.initialize():
+        print(f'Gagal koneksi MT5: {mt5.last_error()}')
+        quit()
+    spread_filter = SpreadFilter(args.symbols)
+    next_report = time.monotonic() + args.report
+    try:
+        while True:
+            spread_filter.poll()
+            if time.monotonic() >= next_report:
+                next_report += args.report
+                for symbol, monitor in spread_filter.monitors.items():
+                    s = monitor.stats()
+                    status = 'OK' if spread_filter.allows(symbol) else 'TAHAN'
+                    print(f"{symbol}: spread {s['last']} | median {s['median']} | p90 {s['p90']} "
+                          f"| p99 {s['p99']} | {s['ticks']} tick | entry {status}")
+            time.sleep(args.interval)
+    finally:
+        mt5.shutdown()
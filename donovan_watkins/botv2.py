@@ -2,6 +2,12 @@ from datetime import datetime
 import MetaTrader5 as mt5
 import pandas as pd
 import time
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'shared'))
+from stop_manager import StopManager
+from indicator_graph import IndicatorGraph
+import execution_stats
 
 SYMBOL = 'XAUUSDm'
 TIMEFRAME = mt5.TIMEFRAME_M15
@@ -26,6 +32,8 @@ def connect():
     print('Koneksi MT5 berhasil')
 
 def disconnect():
+    stop_manager.stop()
+    execution_stats.stop()
     mt5.shutdown()
     print('Koneksi MT5 ditutup')
 
@@ -52,14 +60,14 @@ def detect_fractal(df):
 
     return swing_high[-1:] if swing_high else None, swing_low[-1:] if swing_low else None
 
-def detect_trend(df):
-    df['ema50'] = df['close'].ewm(span=50).mean()
-    df['ema200'] = df['close'].ewm(span=200).mean()
-    return 'bullish' if df['ema50'].iloc[-1] > df['ema200'].iloc[-1] else 'bearish'
+def detect_trend(graph):
+    ema50 = graph.get('ema(close,50)@H1')
+    ema200 = graph.get('ema(close,200)@H1')
+    return 'bullish' if ema50.iloc[-1] > ema200.iloc[-1] else 'bearish'
 
-def detect_trend_strength(df, threshold=1.0):
-    df['ema50'] = df['close'].ewm(span=50).mean()
-    slope = df['ema50'].iloc[-1] - df['ema50'].iloc[-6]
+def detect_trend_strength(graph, threshold=1.0):
+    ema50 = graph.get('ema(close,50)@H1')
+    slope = ema50.iloc[-1] - ema50.iloc[-6]
     return 'strong' if abs(slope) > threshold else 'normal'
 
 def calculate_rsi(df, period=14):
@@ -72,6 +80,16 @@ def calculate_rsi(df, period=14):
     rsi = 100 - (100 / (1 + rs))
     return rsi
 
+indicators = IndicatorGraph(
+    lambda timeframe, count: get_latest_candle(SYMBOL, timeframe, count),
+    {'M15': (TIMEFRAME, CANDLE_COUNT), 'H1': (TREND_TIMEFRAME, 200)},
+    {
+        'ema': lambda df, source, span: source.ewm(span=span).mean(),
+        'rsi': lambda df, period: calculate_rsi(df, period),
+    },
+)
+indicators.require('ema(close,50)@H1', 'ema(close,200)@H1', 'rsi(14)@M15')
+
 def calculate_fibonacci_level(swing_high, swing_low, trend):
     if trend == 'bullish':
         fib_100 = swing_low
@@ -157,103 +175,45 @@ def auto_open_trade(trend, fib, strength, rsi_value):
         'type_filling': mt5.ORDER_FILLING_IOC,
     }
 
-    result = mt5.order_send(request)
+    result = execution_stats.timed_send(mt5.order_send, request, point)
     if result.retcode != mt5.TRADE_RETCODE_DONE:
         print(f"Gagal open order: {result.retcode} | Detail: {result.comment}")
     else:
         print(f"Order berhasil: {'BUY' if order_type == mt5.ORDER_TYPE_BUY else 'SELL'} @ {price}")
 
-def manage_positions():
-    positions = mt5.positions_get(symbol=SYMBOL)
-    if not positions:
-        return
-
-    tick = mt5.symbol_info_tick(SYMBOL)
-    info = mt5.symbol_info(SYMBOL)
-    point = info.point
-    digits = info.digits
-
-    for pos in positions:
-        price_open = pos.price_open
-        volume = pos.volume
-        ticket = pos.ticket
-        sl = pos.sl
-        pos_type = pos.type
-
-        if pos_type == mt5.ORDER_TYPE_BUY:
-            profit_point = (tick.bid - price_open) / point
-            be_price = round(price_open + BE_OFFSET * point, digits)
-            trail_price = round(tick.bid - TRAIL_STEP * point, digits)
+def on_stop_event(kind, pos, value, result):
+    retcode = result.retcode if result is not None else -1
+    detail = result.comment if result is not None else mt5.last_error()
+    if kind == 'modify_sl':
+        if retcode == mt5.TRADE_RETCODE_DONE:
+            print(f"SL berhasil diubah ke {value}")
         else:
-            profit_point = (price_open - tick.ask) / point
-            be_price = round(price_open - BE_OFFSET * point, digits)
-            trail_price = round(tick.ask + TRAIL_STEP * point, digits)
-
-        if profit_point > PARTIAL_TRIGGER and volume >= LOT * 2:
-            close_partial_position(ticket, volume * PARTIAL_CLOSE_RATIO)
-
-        if profit_point > BE_TRIGGER:
-            modify_sl(ticket, be_price)
-
-        if profit_point > TRAIL_START:
-            modify_sl(ticket, trail_price)
-
-def modify_sl(ticket, new_sl):
-    pos = mt5.positions_get(ticket=ticket)
-    if not pos:
-        return
-    pos = pos[0]
-    result = mt5.order_send({
-        "action": mt5.TRADE_ACTION_SLTP,
-        "position": ticket,
-        "sl": new_sl,
-        "tp": pos.tp,
-        "symbol": pos.symbol,
-        "magic": pos.magic,
-        "comment": "Modify SL",
-    })
-    if result.retcode == mt5.TRADE_RETCODE_DONE:
-        print(f"SL berhasil diubah ke {new_sl}")
+            print(f"Gagal modify SL: {retcode} | {detail}")
     else:
-        print(f"Gagal modify SL: {result.retcode} | {result.comment}")
+        if retcode == mt5.TRADE_RETCODE_DONE:
+            print(f"Partial close berhasil: {value}")
+        else:
+            print(f"Gagal partial close: {retcode} | {detail}")
 
-def close_partial_position(ticket, volume_to_close):
-    pos = mt5.positions_get(ticket=ticket)
-    if not pos:
-        return
-    pos = pos[0]
-    tick = mt5.symbol_info_tick(pos.symbol)
-    price = tick.bid if pos.type == mt5.ORDER_TYPE_BUY else tick.ask
-    request = {
-        "action": mt5.TRADE_ACTION_DEAL,
-        "symbol": pos.symbol,
-        "volume": round(volume_to_close, 2),
-        "type": mt5.ORDER_TYPE_SELL if pos.type == mt5.ORDER_TYPE_BUY else mt5.ORDER_TYPE_BUY,
-        "position": ticket,
-        "price": price,
-        "deviation": DEVIATION,
-        "magic": MAGIC,
-        "comment": "Partial Close",
-        "type_time": mt5.ORDER_TIME_GTC,
-        "type_filling": mt5.ORDER_FILLING_IOC,
-    }
-    result = mt5.order_send(request)
-    if result.retcode == mt5.TRADE_RETCODE_DONE:
-        print(f"Partial close berhasil: {round(volume_to_close, 2)}")
-    else:
-        print(f"Gagal partial close: {result.retcode} | {result.comment}")
+stop_manager = StopManager(SYMBOL, MAGIC, BE_TRIGGER, BE_OFFSET, TRAIL_START, PARTIAL_TRIGGER,
+                           PARTIAL_CLOSE_RATIO, LOT, DEVIATION, trail_points=TRAIL_STEP,
+                           on_event=on_stop_event)
 
 def main_loop():
     connect()
+    execution_stats.start()
+    stop_manager.start()
     while True:
         try:
-            df_trend = get_latest_candle(SYMBOL, TREND_TIMEFRAME, 200)
-            trend = detect_trend(df_trend)
-            strength = detect_trend_strength(df_trend)
+            if not indicators.evaluate():
+                time.sleep(60)
+                continue
+            trend = detect_trend(indicators)
+            strength = detect_trend_strength(indicators)
 
-            df_m15 = get_latest_candle(SYMBOL, TIMEFRAME, CANDLE_COUNT)
-            rsi_series = calculate_rsi(df_m15)
-            rsi_value = rsi_series.iloc[-1]
+            df_m15 = indicators.frame('M15')
+            rsi_value = indicators.get('rsi(14)@M15').iloc[-1]
+            print(indicators.summary())
 
             sh, sl = detect_fractal(df_m15)
             if sh and sl:
@@ -270,8 +230,7 @@ def main_loop():
 
             if not check_open_positions():
                 auto_open_trade(trend, fibo, strength, rsi_value)
-            else:
-                manage_positions()
+                stop_manager.refresh()
 
         except Exception as e:
             print(f"Error: {e}")
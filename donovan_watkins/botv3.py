@@ -3,7 +3,24 @@ import MetaTrader5 as mt5
 import pandas as pd
 import time
 import logging
+import logging.handlers
+import queue
 import numpy as np
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'shared'))
+import journal
+from notifier import Notifier, PrintTransport
+from stop_manager import StopManager
+from indicator_graph import IndicatorGraph
+import profiler
+from bar_store import BarStore
+import execution_stats
+from limit_entry import LimitEntry
+import flatten
+import status_server
+from position_book import PositionBook
+from hot_config import HotConfig
 
 # --- CONFIG ---
 SYMBOL = 'XAUUSDm'
@@ -25,13 +42,39 @@ PARTIAL_CLOSE_RATIO = 0.5
 ATR_PERIOD = 14
 MAX_DRAWDOWN_PERCENT = 5  # Max drawdown per hari (%)
 MAX_OPEN_POSITIONS = 3
+ENTRY_MODE = 'market'  # 'market' = polling harga, 'limit' = pending order di level Fibonacci
 NOTIFY_EMAIL = 'your@email.com'  # Placeholder, implementasi bisa pakai email/Telegram
 
 LOG_FILE = 'auto_trade_log.txt'
+JOURNAL_FILE = 'trade_journal.bin'
+STATUS_PORT = 8765  # endpoint status lokal (127.0.0.1), None = nonaktif
+CONFIG_FILE = 'botv3_config.json'  # override konstanta di atas, dibaca ulang setiap siklus
+
+# Konstanta yang boleh diubah tanpa restart: (tipe, cek, keterangan)
+CONFIG_SCHEMA = {
+    'WINDOW': (int, lambda v: 1 <= v <= 10, '1-10'),
+    'CANDLE_COUNT': (int, lambda v: 50 <= v <= 5000, '50-5000'),
+    'BASE_LOT': (float, lambda v: 0 < v <= 10, '0-10 lot'),
+    'DEVIATION': (int, lambda v: 0 <= v <= 500, '0-500 point'),
+    'BE_TRIGGER': (int, lambda v: v > 0, '> 0'),
+    'BE_OFFSET': (int, lambda v: v >= 0, '>= 0'),
+    'TRAIL_START': (int, lambda v: v > 0, '> 0'),
+    'PARTIAL_TRIGGER': (int, lambda v: v > 0, '> 0'),
+    'PARTIAL_CLOSE_RATIO': (float, lambda v: 0 < v < 1, '0-1'),
+    'ATR_PERIOD': (int, lambda v: 2 <= v <= 200, '2-200'),
+    'MAX_DRAWDOWN_PERCENT': (float, lambda v: 0 < v <= 100, '0-100'),
+    'MAX_OPEN_POSITIONS': (int, lambda v: v >= 0, '>= 0'),
+    'ENTRY_MODE': (str, lambda v: v in ('limit', 'market'), "'limit' atau 'market'"),
+}
 
 # --- SETUP LOGGING ---
-logging.basicConfig(filename=LOG_FILE, level=logging.INFO,
-                    format='%(asctime)s %(levelname)s: %(message)s')
+# File log ditulis oleh QueueListener di thread terpisah, thread trading hanya enqueue
+_log_queue = queue.SimpleQueue()
+_log_file_handler = logging.FileHandler(LOG_FILE)
+_log_file_handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s: %(message)s'))
+_log_listener = logging.handlers.QueueListener(_log_queue, _log_file_handler)
+logging.basicConfig(level=logging.INFO, handlers=[logging.handlers.QueueHandler(_log_queue)])
+_log_listener.start()
 
 # --- CONNECT TO MT5 ---
 def connect():
@@ -41,38 +84,52 @@ def connect():
     logging.info('Koneksi MT5 berhasil')
 
 def disconnect():
+    stop_manager.stop()
     mt5.shutdown()
     logging.info('Koneksi MT5 ditutup')
+    status_server.stop()
+    notifier.stop()
+    execution_stats.stop()
+    journal.stop()
+    _log_listener.stop()
+
+# --- NOTIFICATION ---
+# Transport bisa diganti EmailTransport(NOTIFY_EMAIL, ...) atau TelegramTransport(token, chat_id)
+notifier = Notifier(PrintTransport())
 
-# --- NOTIFICATION (Dummy, bisa diganti dengan email/telegram API) ---
 def send_notification(message):
-    print(f"NOTIFIKASI: {message}")
-    # Implementasi bisa menggunakan API email/telegram
+    notifier.notify(message)
 
 # --- GET DATA ---
+# Bar disimpan di ring buffer per (symbol, timeframe). Yang dikembalikan view read-only dari store
+# (tanpa salinan / DataFrame per siklus); IndicatorGraph menyalinnya hanya saat bar berubah
+bar_stores = {}
+
 def get_latest_candle(symbol, timeframe, count):
-    rates = mt5.copy_rates_from_pos(symbol, timeframe, 0, count)
-    if rates is None or len(rates) == 0:
+    store = bar_stores.get((symbol, timeframe))
+    if store is None or store.capacity < count:
+        store = bar_stores[(symbol, timeframe)] = BarStore([symbol], timeframe, count)
+    if not store.sync(symbol):
         logging.warning(f'Gagal ambil data candles {symbol}')
         return None
-    df = pd.DataFrame(rates)
-    df['time'] = pd.to_datetime(df['time'], unit='s')
-    return df
+    bars = store.window(symbol, count)
+    bars['time'] = bars['time'].view('datetime64[s]')
+    return bars
 
 # --- INDICATORS ---
-def calculate_ema(df, span):
-    return df['close'].ewm(span=span, adjust=False).mean()
+def calculate_ema(source, span):
+    return source.ewm(span=span, adjust=False).mean()
 
-def detect_trend(df):
-    ema50 = calculate_ema(df, 50)
-    ema200 = calculate_ema(df, 200)
+def detect_trend(graph, tf):
+    ema50 = graph.get(f'ema(close,50)@{tf}')
+    ema200 = graph.get(f'ema(close,200)@{tf}')
     if ema50.iloc[-1] > ema200.iloc[-1]:
         return 'bullish'
     else:
         return 'bearish'
 
-def detect_trend_strength(df, threshold=1.0):
-    ema50 = calculate_ema(df, 50)
+def detect_trend_strength(graph, tf, threshold=1.0):
+    ema50 = graph.get(f'ema(close,50)@{tf}')
     slope = ema50.iloc[-1] - ema50.iloc[-6]
     return 'strong' if abs(slope) > threshold else 'normal'
 
@@ -94,8 +151,31 @@ def calculate_atr(df, period=14):
     atr = tr.ewm(com=period-1, min_periods=period).mean()
     return atr
 
+# --- INDICATOR GRAPH ---
+def load_candles(timeframe, count):
+    profiler.stage('data_fetch')
+    df = get_latest_candle(SYMBOL, timeframe, count)
+    profiler.stage('indicators')
+    return df
+
+# Tiap timeframe diambil sekali per siklus dan tiap indikator unik dihitung sekali per bar
+indicators = IndicatorGraph(
+    lambda timeframe, count: load_candles(timeframe, count),
+    {'M15': (TIMEFRAME, CANDLE_COUNT), 'H1': (TREND_TIMEFRAME, 200), 'H4': (HIGHER_TF, 200)},
+    {
+        'ema': lambda df, source, span: calculate_ema(source, span),
+        'rsi': lambda df, period: calculate_rsi(df, period),
+        'atr': lambda df, period: calculate_atr(df, period),
+    },
+)
+indicators.require('ema(close,50)@H1', 'ema(close,200)@H1', 'ema(close,50)@H4', 'ema(close,200)@H4',
+                   'rsi(14)@M15', f'atr({ATR_PERIOD})@M15')
+
 # --- FRACTAL SWING ---
-def detect_fractals(df, window=WINDOW, count=3):
+def detect_fractals(df, window=None, count=3):
+    # WINDOW dibaca saat dipanggil supaya ikut hot config
+    if window is None:
+        window = WINDOW
     highs = df['high']
     lows = df['low']
     swing_highs = []
@@ -135,8 +215,8 @@ def calculate_fibonacci_level(swing_high, swing_low, trend):
 
 # --- POSITION CHECK ---
 def check_open_positions():
-    positions = mt5.positions_get(symbol=SYMBOL)
-    return positions if positions else []
+    book.update()
+    return book.snapshot()
 
 # --- POSITION SIZING BASED ON ATR ---
 def calculate_lot_size(atr, risk_per_trade=0.01, balance=1000):
@@ -154,8 +234,22 @@ def confirm_entry_candle(df, trend, fib_level):
     else:
         return last_close < fib_level
 
+# Filter entry yang sama untuk market dan limit: konfirmasi candle, lalu Fibo atau RSI.
+# price = harga eksekusi (ask/bid untuk market, level order untuk limit).
+# Return 'Fibo' / 'RSI' jika boleh entry, None jika tidak.
+def entry_signal(trend, price, entry_level, rsi_value, df_m15):
+    if not confirm_entry_candle(df_m15, trend, entry_level):
+        logging.info(f'Entry candle tidak konfirmasi level Fibonacci. Close terakhir: {df_m15["close"].iloc[-1]}')
+        return None
+    if (trend == 'bullish' and rsi_value < 30) or (trend == 'bearish' and rsi_value > 70):
+        return 'RSI'
+    if (trend == 'bullish' and price <= entry_level) or (trend == 'bearish' and price >= entry_level):
+        return 'Fibo'
+    logging.info(f'Tidak ada sinyal entry | Price: {price} | RSI: {rsi_value:.2f}')
+    return None
+
 # --- ORDER SEND ---
-def send_order(order_type, volume, price, sl, tp):
+def send_order(order_type, volume, price, sl, tp, point=0.0):
     request = {
         'action': mt5.TRADE_ACTION_DEAL,
         'symbol': SYMBOL,
@@ -170,9 +264,24 @@ def send_order(order_type, volume, price, sl, tp):
         'type_time': mt5.ORDER_TIME_GTC,
         'type_filling': mt5.ORDER_FILLING_IOC,
     }
-    result = mt5.order_send(request)
+    journal.record(journal.EVENT_ORDER, SYMBOL, MAGIC, price=price, volume=volume, value=order_type, text=request['comment'])
+    profiler.stage('order_send')
+    result = execution_stats.timed_send(mt5.order_send, request, point)
+    profiler.stage('entry')
+    record_result(result, SYMBOL)
     return result
 
+# --- JOURNAL ORDER RESULT ---
+def record_result(result, symbol, ticket=0):
+    if result is None:
+        journal.record(journal.EVENT_RESULT, symbol, MAGIC, ticket, text='order_send None')
+        return
+    journal.record(journal.EVENT_RESULT, symbol, MAGIC, ticket or result.order, result.retcode,
+                   result.price, result.volume, text=result.comment)
+    if result.retcode == mt5.TRADE_RETCODE_DONE and result.deal:
+        journal.record(journal.EVENT_FILL, symbol, MAGIC, result.deal, result.retcode,
+                       result.price, result.volume)
+
 # --- DYNAMIC SL/TP BASED ON ATR ---
 def dynamic_sl_tp(price, trend, atr, min_distance, digits):
     sl_dist = atr * 1.5
@@ -205,16 +314,9 @@ def auto_open_trade(trend, fib, strength, rsi_value, df_m15, atr, balance, highe
         return
 
     entry_level = fib['fib_382'] if strength == 'strong' else fib['fib_618']
-    # Konfirmasi candle close di atas/bawah level entry fibonacci
-    if not confirm_entry_candle(df_m15, trend, entry_level):
-        logging.info(f'Entry candle tidak konfirmasi level Fibonacci. Close terakhir: {df_m15["close"].iloc[-1]}')
-        return
-
-    entry_by_fibo = (trend == 'bullish' and price <= entry_level) or (trend == 'bearish' and price >= entry_level)
-    entry_by_rsi = (trend == 'bullish' and rsi_value < 30) or (trend == 'bearish' and rsi_value > 70)
-
-    if not (entry_by_fibo or entry_by_rsi):
-        logging.info(f'Tidak ada sinyal entry | Price: {price} | RSI: {rsi_value:.2f}')
+    # Konfirmasi candle close di atas/bawah level entry fibonacci, lalu sinyal Fibo / RSI
+    signal = entry_signal(trend, price, entry_level, rsi_value, df_m15)
+    if signal is None:
         return
 
     order_type = mt5.ORDER_TYPE_BUY if trend == 'bullish' else mt5.ORDER_TYPE_SELL
@@ -233,10 +335,10 @@ def auto_open_trade(trend, fib, strength, rsi_value, df_m15, atr, balance, highe
         logging.info(f"SL/TP tidak memenuhi syarat minimum. SL: {sl}, TP: {tp}, Min: {min_distance}")
         return
 
-    logging.info(f"[ENTRY] {'RSI' if entry_by_rsi else 'Fibo'} | Trend: {trend.upper()} | Price: {price} | RSI: {rsi_value:.2f} | Lot: {lot}")
+    logging.info(f"[ENTRY] {signal} | Trend: {trend.upper()} | Price: {price} | RSI: {rsi_value:.2f} | Lot: {lot}")
     logging.info(f" SL: {sl} | TP: {tp} | Min Stop (point): {stop_level} ({min_distance})")
 
-    result = send_order(order_type, lot, price, sl, tp)
+    result = send_order(order_type, lot, price, sl, tp, point)
     if result.retcode != mt5.TRADE_RETCODE_DONE:
         logging.error(f"Gagal open order: {result.retcode} | Detail: {result.comment}")
         send_notification(f"Gagal open order: {result.retcode} | {result.comment}")
@@ -244,101 +346,81 @@ def auto_open_trade(trend, fib, strength, rsi_value, df_m15, atr, balance, highe
         logging.info(f"Order berhasil: {'BUY' if order_type == mt5.ORDER_TYPE_BUY else 'SELL'} @ {price}")
         send_notification(f"Order berhasil: {'BUY' if order_type == mt5.ORDER_TYPE_BUY else 'SELL'} @ {price}")
 
-# --- MANAGE POSITIONS ---
-def manage_positions():
-    positions = check_open_positions()
-    if not positions:
+# --- LIMIT ENTRY DI LEVEL FIBONACCI ---
+def on_limit_event(request, result):
+    journal.record(journal.EVENT_ORDER, SYMBOL, MAGIC, request.get('order', 0), price=request.get('price', 0.0),
+                   volume=request.get('volume', 0.0), value=request['action'], text='Fibo limit')
+    record_result(result, SYMBOL, request.get('order', 0))
+    if result is None or result.retcode not in (mt5.TRADE_RETCODE_DONE, mt5.TRADE_RETCODE_PLACED):
+        detail = result.comment if result is not None else mt5.last_error()
+        logging.error(f"Gagal pending order (action {request['action']}): {detail}")
+
+limit_entry = LimitEntry(SYMBOL, MAGIC, on_event=on_limit_event)
+
+def place_limit_entry(trend, fib, strength, rsi_value, df_m15, atr, balance, higher_tf_trend):
+    if trend != higher_tf_trend:
+        logging.info(f"Trend H1 dan H4 tidak searah. Pending order dibatalkan.")
+        limit_entry.cancel()
+        return
+    symbol_info = mt5.symbol_info(SYMBOL)
+    if not symbol_info:
+        logging.warning('Symbol info tidak tersedia')
         return
 
-    tick = mt5.symbol_info_tick(SYMBOL)
-    info = mt5.symbol_info(SYMBOL)
-    point = info.point
-    digits = info.digits
-
-    for pos in positions:
-        price_open = pos.price_open
-        volume = pos.volume
-        ticket = pos.ticket
-        sl = pos.sl
-        pos_type = pos.type
-
-        if pos_type == mt5.ORDER_TYPE_BUY:
-            profit_point = (tick.bid - price_open) / point
-            be_price = round(price_open + BE_OFFSET * point, digits)
-            trail_price = round(tick.bid - TRAIL_START * point, digits)
-        else:
-            profit_point = (price_open - tick.ask) / point
-            be_price = round(price_open - BE_OFFSET * point, digits)
-            trail_price = round(tick.ask + TRAIL_START * point, digits)
-
-        # Partial close jika profit sudah cukup dan volume cukup
-        if profit_point > PARTIAL_TRIGGER and volume >= BASE_LOT * 2:
-            close_partial_position(ticket, volume * PARTIAL_CLOSE_RATIO)
-
-        # Set break-even stop loss
-        if profit_point > BE_TRIGGER and (sl == 0 or (pos_type == mt5.ORDER_TYPE_BUY and sl < be_price) or (pos_type == mt5.ORDER_TYPE_SELL and sl > be_price)):
-            modify_sl(ticket, be_price)
-
-        # Trailing stop dinamis berdasarkan ATR
-        atr = calculate_atr(get_latest_candle(SYMBOL, TIMEFRAME, CANDLE_COUNT), ATR_PERIOD).iloc[-1]
-        if profit_point > TRAIL_START:
-            if pos_type == mt5.ORDER_TYPE_BUY:
-                trail_sl = round(tick.bid - atr, digits)
-            else:
-                trail_sl = round(tick.ask + atr, digits)
-            modify_sl(ticket, trail_sl)
-
-# --- MODIFY SL ---
-def modify_sl(ticket, new_sl):
-    pos = mt5.positions_get(ticket=ticket)
-    if not pos:
-        logging.warning(f'Posisi dengan ticket {ticket} tidak ditemukan saat modify SL')
+    entry_level = fib['fib_382'] if strength == 'strong' else fib['fib_618']
+    # Filter entry yang sama dengan market, dinilai di harga fill limit; gagal = order dibatalkan
+    if entry_signal(trend, entry_level, entry_level, rsi_value, df_m15) is None:
+        limit_entry.cancel()
         return
-    pos = pos[0]
-    result = mt5.order_send({
-        "action": mt5.TRADE_ACTION_SLTP,
-        "position": ticket,
-        "sl": new_sl,
-        "tp": pos.tp,
-        "symbol": pos.symbol,
-        "magic": pos.magic,
-        "comment": "Modify SL",
-    })
-    if result.retcode == mt5.TRADE_RETCODE_DONE:
-        logging.info(f"SL berhasil diubah ke {new_sl}")
+    lot = calculate_lot_size(atr, risk_per_trade=0.01, balance=balance)
+    lot = min(lot, symbol_info.volume_max)
+    lot = max(lot, symbol_info.volume_min)
+    min_distance = symbol_info.trade_stops_level * symbol_info.point
+    sl, tp = dynamic_sl_tp(entry_level, trend, atr, min_distance, symbol_info.digits)
+
+    profiler.stage('order_send')
+    placed = limit_entry.sync(trend, entry_level, sl, tp, lot)
+    profiler.stage('entry')
+    if placed:
+        logging.info(f"[LIMIT] {trend.upper()} @ {round(entry_level, symbol_info.digits)} | SL: {sl} | TP: {tp} | Lot: {lot}")
     else:
-        logging.error(f"Gagal modify SL: {result.retcode} | {result.comment}")
-        send_notification(f"Gagal modify SL: {result.retcode} | {result.comment}")
-
-# --- PARTIAL CLOSE ---
-def close_partial_position(ticket, volume_to_close):
-    pos = mt5.positions_get(ticket=ticket)
-    if not pos:
-        logging.warning(f'Posisi dengan ticket {ticket} tidak ditemukan saat partial close')
-        return
-    pos = pos[0]
-    tick = mt5.symbol_info_tick(pos.symbol)
-    price = tick.bid if pos.type == mt5.ORDER_TYPE_BUY else tick.ask
-    request = {
-        "action": mt5.TRADE_ACTION_DEAL,
-        "symbol": pos.symbol,
-        "volume": round(volume_to_close, 2),
-        "type": mt5.ORDER_TYPE_SELL if pos.type == mt5.ORDER_TYPE_BUY else mt5.ORDER_TYPE_BUY,
-        "position": ticket,
-        "price": price,
-        "deviation": DEVIATION,
-        "magic": MAGIC,
-        "comment": "Partial Close",
-        "type_time": mt5.ORDER_TIME_GTC,
-        "type_filling": mt5.ORDER_FILLING_IOC,
-    }
-    result = mt5.order_send(request)
-    if result.retcode == mt5.TRADE_RETCODE_DONE:
-        logging.info(f"Partial close berhasil: {round(volume_to_close, 2)}")
-        send_notification(f"Partial close berhasil: {round(volume_to_close, 2)}")
+        # Harga sudah melewati level: limit tidak valid, pakai logika entry market
+        auto_open_trade(trend, fib, strength, rsi_value, df_m15, atr, balance, higher_tf_trend)
+
+# --- STOP MANAGER (BE / trailing / partial close per tick) ---
+def on_stop_event(kind, pos, value, result):
+    retcode = result.retcode if result is not None else -1
+    detail = result.comment if result is not None else mt5.last_error()
+    if kind == 'modify_sl':
+        journal.record(journal.EVENT_MODIFY_SL, pos['symbol'], pos['magic'], pos['ticket'], retcode, value)
+        if retcode == mt5.TRADE_RETCODE_DONE:
+            logging.info(f"SL berhasil diubah ke {value}")
+        else:
+            logging.error(f"Gagal modify SL: {retcode} | {detail}")
+            send_notification(f"Gagal modify SL: {retcode} | {detail}")
     else:
-        logging.error(f"Gagal partial close: {result.retcode} | {result.comment}")
-        send_notification(f"Gagal partial close: {result.retcode} | {result.comment}")
+        journal.record(journal.EVENT_ORDER, pos['symbol'], MAGIC, pos['ticket'], volume=value, text='Partial Close')
+        record_result(result, pos['symbol'], pos['ticket'])
+        if retcode == mt5.TRADE_RETCODE_DONE:
+            logging.info(f"Partial close berhasil: {value}")
+            send_notification(f"Partial close berhasil: {value}")
+        else:
+            logging.error(f"Gagal partial close: {retcode} | {detail}")
+            send_notification(f"Gagal partial close: {retcode} | {detail}")
+
+# --- POSITION BOOK ---
+def on_book_drift(drift):
+    logging.warning(f"Position book drift ({len(drift)}): {drift}")
+    send_notification(f"Position book tidak sinkron dengan terminal: {len(drift)} selisih, sudah dikoreksi")
+
+# Posisi & pending order di memori, diperbarui dari setiap order_send lewat execution_stats
+book = PositionBook(SYMBOL, MAGIC, on_drift=on_book_drift)
+execution_stats.listeners.append(book.on_result)
+
+# Trailing stop dinamis: jarak = ATR M15 yang diperbarui dari main loop
+stop_manager = StopManager(SYMBOL, MAGIC, BE_TRIGGER, BE_OFFSET, TRAIL_START, PARTIAL_TRIGGER,
+                           PARTIAL_CLOSE_RATIO, BASE_LOT, DEVIATION, trail_points=TRAIL_START,
+                           on_event=on_stop_event, book=book)
 
 # --- DAILY DRAWDOWN CHECK ---
 def get_daily_drawdown():
@@ -352,46 +434,125 @@ def get_daily_drawdown():
     drawdown_percent = abs(pnl_today) / balance * 100
     return drawdown_percent
 
+# --- EMERGENCY FLATTEN ---
+def on_flatten_result(ticket, result):
+    journal.record(journal.EVENT_ORDER, SYMBOL, MAGIC, ticket, text='Emergency flatten')
+    record_result(result, SYMBOL, ticket)
+
+def emergency_flatten():
+    # Stop manager dihentikan dulu supaya tidak ada modify/partial close yang bentrok
+    stop_manager.stop()
+    profiler.stage('flatten')
+    report = flatten.flatten(SYMBOL, MAGIC, DEVIATION, on_result=on_flatten_result)
+    message = (f"Emergency flatten: {report['closed']}/{report['positions']} posisi ditutup, "
+               f"{report['pending_removed']} pending dihapus, {report['rounds']} ronde, "
+               f"{report['time_to_flat_ms']:.0f} ms")
+    if report['remaining']:
+        message += f" | MASIH TERBUKA: {report['remaining']} {report['failures']}"
+        logging.error(message)
+    else:
+        logging.warning(message)
+    send_notification(message)
+    return report
+
+# --- HOT RELOAD CONFIG ---
+def check_config(values):
+    errors = []
+    if values['BE_OFFSET'] >= values['BE_TRIGGER']:
+        errors.append('BE_OFFSET harus lebih kecil dari BE_TRIGGER')
+    if values['CANDLE_COUNT'] < values['ATR_PERIOD'] * 3:
+        errors.append('CANDLE_COUNT minimal 3x ATR_PERIOD')
+    return errors
+
+config = HotConfig(CONFIG_FILE, globals(), CONFIG_SCHEMA, check_config)
+
+STOP_MANAGER_FIELDS = {
+    'BE_TRIGGER': ('be_trigger',),
+    'BE_OFFSET': ('be_offset',),
+    'TRAIL_START': ('trail_start', 'trail_points'),
+    'PARTIAL_TRIGGER': ('partial_trigger',),
+    'PARTIAL_CLOSE_RATIO': ('partial_ratio',),
+    'BASE_LOT': ('base_lot',),
+    'DEVIATION': ('deviation',),
+}
+
+def reload_config():
+    changed, errors = config.poll()
+    if errors:
+        logging.error(f"Config {CONFIG_FILE} ditolak, tetap pakai nilai lama: {'; '.join(errors)}")
+        send_notification(f"Config ditolak: {'; '.join(errors)}")
+        return
+    if not changed:
+        return
+    logging.info(f"Config diperbarui: {', '.join(f'{k} {old} -> {new}' for k, (old, new) in changed.items())}")
+    # Hanya cache yang parameternya berubah yang di-invalidate; stop manager jalan di thread
+    # sendiri, nilai barunya diserahkan sekaligus lewat configure()
+    fields = {field: changed[key][1] for key, names in STOP_MANAGER_FIELDS.items() if key in changed
+              for field in names}
+    if fields:
+        stop_manager.configure(**fields)
+    if 'ATR_PERIOD' in changed:
+        old, new = changed['ATR_PERIOD']
+        indicators.replace(f'atr({old})@M15', f'atr({new})@M15')
+    if 'CANDLE_COUNT' in changed:
+        indicators.set_timeframe('M15', TIMEFRAME, CANDLE_COUNT)
+    if changed.get('ENTRY_MODE', ('', ''))[1] == 'market':
+        limit_entry.cancel()
+
 # --- MAIN LOOP ---
 def main_loop():
     connect()
+    journal.start(JOURNAL_FILE)
+    execution_stats.start()
+    profiler.install_signal()
+    notifier.start()
+    book.start()
+    stop_manager.start()
+    if STATUS_PORT:
+        status_server.start(STATUS_PORT)
     balance = mt5.account_info().balance if mt5.account_info() else 1000
     logging.info(f'Balance akun: {balance}')
+    cycles = 0
+    cycle_total = 0.0
+    cycle_max = 0.0
     while True:
+        cycle_start = time.perf_counter()
+        reload_config()
+        profiler.stage('risk_check')
         try:
             # --- Risk Management: Cek drawdown harian ---
             drawdown = get_daily_drawdown()
+            status_server.publish('drawdown', {'percent': drawdown, 'limit': MAX_DRAWDOWN_PERCENT,
+                                               'halted': drawdown > MAX_DRAWDOWN_PERCENT})
             if drawdown > MAX_DRAWDOWN_PERCENT:
                 logging.warning(f"Max drawdown harian tercapai: {drawdown:.2f}%")
+                emergency_flatten()
                 send_notification(f"Trading dihentikan, drawdown harian: {drawdown:.2f}%")
                 time.sleep(3600)  # Pause 1 jam
+                stop_manager.start()
                 continue
 
             # --- Get Trend Multi-Timeframe ---
-            df_trend = get_latest_candle(SYMBOL, TREND_TIMEFRAME, 200)
-            df_higher = get_latest_candle(SYMBOL, HIGHER_TF, 200)
-            if df_trend is None or df_higher is None:
-                time.sleep(60)
-                continue
-
-            trend = detect_trend(df_trend)
-            strength = detect_trend_strength(df_trend)
-            higher_tf_trend = detect_trend(df_higher)
-
-            df_m15 = get_latest_candle(SYMBOL, TIMEFRAME, CANDLE_COUNT)
-            if df_m15 is None:
+            if not indicators.evaluate():
                 time.sleep(60)
                 continue
+            profiler.stage('signal')
 
-            rsi_series = calculate_rsi(df_m15)
-            rsi_value = rsi_series.iloc[-1]
+            trend = detect_trend(indicators, 'H1')
+            strength = detect_trend_strength(indicators, 'H1')
+            higher_tf_trend = detect_trend(indicators, 'H4')
 
-            atr_series = calculate_atr(df_m15, ATR_PERIOD)
-            atr = atr_series.iloc[-1]
+            df_m15 = indicators.frame('M15')
+            rsi_value = indicators.get('rsi(14)@M15').iloc[-1]
+            atr = indicators.get(f'atr({ATR_PERIOD})@M15').iloc[-1]
+            logging.info(indicators.summary())
+            stop_manager.configure(trail_distance=atr)
 
             swing_highs, swing_lows = detect_fractals(df_m15)
             if not swing_highs or not swing_lows:
                 logging.info("Swing tidak ditemukan")
+                if ENTRY_MODE == 'limit':
+                    limit_entry.cancel()
                 time.sleep(60)
                 continue
 
@@ -403,17 +564,41 @@ def main_loop():
             logging.info(f"Swing High: {sh_price} | Swing Low: {sl_price}")
             logging.info(f"TP: {fibo['fib_0']} | SL: {fibo['fib_100']}")
             logging.info(f"ENTRY LEVEL: {fibo['fib_382'] if strength == 'strong' else fibo['fib_618']}")
+            journal.record(journal.EVENT_SIGNAL, SYMBOL, MAGIC,
+                           price=fibo['fib_382'] if strength == 'strong' else fibo['fib_618'],
+                           value=rsi_value, text=f'{trend}/{strength}/{higher_tf_trend}')
+            status_server.publish('signal', {
+                'symbol': SYMBOL, 'time': datetime.now(), 'trend': trend, 'strength': strength,
+                'h4_trend': higher_tf_trend, 'rsi': rsi_value, 'atr': atr,
+                'swing_high': sh_price, 'swing_low': sl_price, 'fibonacci': fibo,
+                'entry_level': fibo['fib_382'] if strength == 'strong' else fibo['fib_618'],
+            })
 
             positions = check_open_positions()
+            status_server.publish('positions', positions)
             if len(positions) < MAX_OPEN_POSITIONS:
-                auto_open_trade(trend, fibo, strength, rsi_value, df_m15, atr, balance, higher_tf_trend)
-            else:
-                manage_positions()
+                if ENTRY_MODE == 'limit':
+                    place_limit_entry(trend, fibo, strength, rsi_value, df_m15, atr, balance, higher_tf_trend)
+                else:
+                    auto_open_trade(trend, fibo, strength, rsi_value, df_m15, atr, balance, higher_tf_trend)
+                stop_manager.refresh()
+            elif ENTRY_MODE == 'limit':
+                limit_entry.cancel()
 
         except Exception as e:
             logging.error(f"Error: {e}")
+            journal.record(journal.EVENT_ERROR, SYMBOL, MAGIC, text=str(e))
             send_notification(f"Error: {e}")
 
+        cycle_ms = (time.perf_counter() - cycle_start) * 1000
+        journal.record(journal.EVENT_CYCLE, SYMBOL, MAGIC, value=cycle_ms)
+        cycles += 1
+        cycle_total += cycle_ms
+        cycle_max = max(cycle_max, cycle_ms)
+        status_server.publish('cycle', {'count': cycles, 'last_ms': cycle_ms, 'avg_ms': cycle_total / cycles,
+                                        'max_ms': cycle_max, 'finished': datetime.now()})
+        profiler.stage('sleep')
+        profiler.poll()
         time.sleep(60)
 
 if __name__ == '__main__':
@@ -0,0 +1,99 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+import MetaTrader5 as mt5
+import execution_stats
+
+# Emergency flatten: snapshot semua posisi (filter magic / simbol), kirim close untuk
+# semuanya sekaligus dari thread pool sehingga round-trip ke server saling tumpang tindih,
+# lalu ulangi yang gagal dengan harga terbaru. Pending order dengan magic yang sama ikut dihapus
+# dari pool yang sama di ronde pertama, jadi time-to-flat tetap sekitar satu round-trip.
+
+MAX_ROUNDS = 5
+RETRY_DELAY = 0.2   # detik antar ronde retry
+WORKERS = 16
+
+def snapshot(symbol=None, magic=None):
+    positions = mt5.positions_get(symbol=symbol) if symbol else mt5.positions_get()
+    return [p for p in positions or [] if magic is None or p.magic == magic]
+
+def close_position(pos, deviation, magic):
+    tick = mt5.symbol_info_tick(pos.symbol)
+    info = mt5.symbol_info(pos.symbol)
+    if not tick or not info:
+        return pos.ticket, None
+    is_buy = pos.type == mt5.ORDER_TYPE_BUY
+    result = execution_stats.timed_send(mt5.order_send, {
+        'action': mt5.TRADE_ACTION_DEAL,
+        'symbol': pos.symbol,
+        'volume': pos.volume,
+        'type': mt5.ORDER_TYPE_SELL if is_buy else mt5.ORDER_TYPE_BUY,
+        'position': pos.ticket,
+        'price': tick.bid if is_buy else tick.ask,
+        'deviation': deviation,
+        'magic': magic if magic is not None else pos.magic,
+        'comment': 'Emergency flatten',
+        'type_time': mt5.ORDER_TIME_GTC,
+        'type_filling': mt5.ORDER_FILLING_IOC,
+    }, info.point)
+    return pos.ticket, result
+
+def pending_orders(symbol=None, magic=None):
+    orders = mt5.orders_get(symbol=symbol) if symbol else mt5.orders_get()
+    return [o for o in orders or [] if magic is None or o.magic == magic]
+
+def remove_order(order):
+    result = execution_stats.timed_send(mt5.order_send, {
+        'action': mt5.TRADE_ACTION_REMOVE,
+        'order': order.ticket,
+        'symbol': order.symbol,
+    })
+    return order.ticket, result
+
+def flatten(symbol=None, magic=None, deviation=20, max_rounds=MAX_ROUNDS, on_result=None):
+    start = time.perf_counter()
+    orders = pending_orders(symbol, magic)
+    positions = snapshot(symbol, magic)
+    total = len(positions)
+    closed = 0
+    removed = 0
+    rounds = 0
+    failures = {}
+    with ThreadPoolExecutor(max_workers=min(WORKERS, max(total + len(orders), 1))) as pool:
+        # Hapus pending dikirim bersama close ronde pertama: satu round-trip, bukan N remove berurutan
+        removals = [pool.submit(remove_order, order) for order in orders]
+        while (positions or removals) and rounds < max_rounds:
+            rounds += 1
+            futures = [pool.submit(close_position, pos, deviation, magic) for pos in positions]
+            for future in futures:
+                ticket, result = future.result()
+                if on_result:
+                    on_result(ticket, result)
+                if result is not None and result.retcode == mt5.TRADE_RETCODE_DONE:
+                    closed += 1
+                else:
+                    failures[ticket] = result.retcode if result is not None else mt5.last_error()
+            pending_failed = False
+            for future in removals:
+                ticket, result = future.result()
+                if result is not None and result.retcode == mt5.TRADE_RETCODE_DONE:
+                    removed += 1
+                else:
+                    pending_failed = True
+            removals = []
+            # Pending yang gagal dihapus bisa saja sudah terisi: cek snapshot baru
+            if closed == total and not pending_failed:
+                break
+            time.sleep(RETRY_DELAY)
+            # Ronde berikutnya pakai snapshot baru: volume / status posisi bisa sudah berubah
+            positions = snapshot(symbol, magic)
+            total = closed + len(positions)
+    remaining = snapshot(symbol, magic)
+    return {
+        'positions': total,
+        'closed': closed,
+        'remaining': len(remaining),
+        'pending_removed': removed,
+        'rounds': rounds,
+        'time_to_flat_ms': (time.perf_counter() - start) * 1000,
+        'failures': {t: failures[t] for t in (p.ticket for p in remaining) if t in failures},
+    }
@@ -0,0 +1,139 @@
+import re
+import numpy as np
+import pandas as pd
+
+# Graf indikator deklaratif: strategi meminta node bernama seperti
+# 'ema(close,50)@H1' atau 'atr(14)@M15', engine mengambil tiap timeframe sekali,
+# menghitung tiap node unik sekali per snapshot bar, lalu hasilnya dibagi ke semua
+# konsumen. Node yang dipakai ulang dicatat supaya terlihat di log.
+# Loader boleh mengembalikan DataFrame atau dict kolom -> array (mis. view read-only dari
+# BarStore). Dict hanya disalin ke DataFrame saat snapshot timeframe berubah, karena frame
+# itu disimpan sampai bar berikutnya sementara view-nya ikut berubah saat sync.
+
+SPEC_RE = re.compile(r'^\s*(\w+)\s*(?:\((.*)\))?\s*@\s*(\w+)\s*$')
+COLUMNS = ('open', 'high', 'low', 'close', 'tick_volume', 'spread', 'real_volume', 'time')
+
+def parse_spec(spec):
+    match = SPEC_RE.match(spec)
+    if not match:
+        raise ValueError(f'Spesifikasi indikator tidak valid: {spec}')
+    name, args, tf = match.groups()
+    parsed = []
+    for arg in _split_args(args or ''):
+        try:
+            parsed.append(int(arg))
+        except ValueError:
+            try:
+                parsed.append(float(arg))
+            except ValueError:
+                # Argumen non-angka adalah node lain di timeframe yang sama, mis. close
+                parsed.append(f'{arg}@{tf}' if '@' not in arg else arg)
+    return name, tuple(parsed), tf
+
+def _split_args(text):
+    args, depth, current = [], 0, ''
+    for ch in text:
+        if ch == ',' and depth == 0:
+            args.append(current.strip())
+            current = ''
+            continue
+        depth += ch == '('
+        depth -= ch == ')'
+        current += ch
+    if current.strip():
+        args.append(current.strip())
+    return args
+
+def canonical(spec):
+    name, args, tf = parse_spec(spec)
+    if not args:
+        return f'{name}@{tf}'
+    shown = [a.rsplit('@', 1)[0] if isinstance(a, str) and a.endswith(f'@{tf}') else str(a) for a in args]
+    return f"{name}({','.join(shown)})@{tf}"
+
+class IndicatorGraph:
+    # timeframes: {'M15': (mt5.TIMEFRAME_M15, 100), ...}
+    # loader(timeframe, count) -> DataFrame, dict kolom -> array, atau None
+    # functions: {'ema': fn(df, *args), ...}, argumen node sudah di-resolve jadi Series
+    def __init__(self, loader, timeframes, functions):
+        self.loader = loader
+        self.timeframes = timeframes
+        self.functions = dict(functions)
+        self.required = []
+        self.frames = {}
+        self.versions = {}
+        self.values = {}
+        self.computed = []
+        self.reused = {}
+
+    def require(self, *specs):
+        for spec in specs:
+            key = canonical(spec)
+            if key not in self.required:
+                self.required.append(key)
+
+    # Ganti node yang diminta (mis. periode ATR berubah); node lain tetap di cache
+    def replace(self, old, new):
+        key = canonical(old)
+        if key in self.required:
+            self.required.remove(key)
+        self.values.pop(key, None)
+        self.require(new)
+
+    # Ubah jumlah bar / timeframe satu timeframe; hanya node timeframe itu yang dibuang
+    def set_timeframe(self, tf, timeframe, count):
+        self.timeframes[tf] = (timeframe, count)
+        self.invalidate(tf)
+
+    def invalidate(self, tf):
+        self.frames.pop(tf, None)
+        self.versions.pop(tf, None)
+        suffix = f'@{tf}'
+        self.values = {k: v for k, v in self.values.items() if not k.endswith(suffix)}
+
+    # --- EVALUATE ---
+    def evaluate(self):
+        self.computed = []
+        self.reused = {}
+        for tf, (timeframe, count) in self.timeframes.items():
+            bars = self.loader(timeframe, count)
+            close = None if bars is None else np.asarray(bars['close'])
+            if close is None or len(close) == 0:
+                return False
+            # Snapshot = waktu, close dan volume candle terakhir; jika sama, node timeframe ini tetap berlaku
+            volume = np.asarray(bars['tick_volume'])[-1] if 'tick_volume' in bars else None
+            version = (np.asarray(bars['time'])[-1], close[-1], volume, len(close))
+            if self.versions.get(tf) != version:
+                self.frames[tf] = bars if isinstance(bars, pd.DataFrame) else pd.DataFrame(bars, copy=True)
+                self.versions[tf] = version
+                suffix = f'@{tf}'
+                self.values = {k: v for k, v in self.values.items() if not k.endswith(suffix)}
+        for key in self.required:
+            self.get(key)
+        return True
+
+    def frame(self, tf):
+        return self.frames[tf]
+
+    def get(self, spec):
+        key = canonical(spec)
+        if key in self.values:
+            if key.split('@')[0] not in COLUMNS:
+                self.reused[key] = self.reused.get(key, 0) + 1
+            return self.values[key]
+        name, args, tf = parse_spec(key)
+        df = self.frames[tf]
+        if name in COLUMNS and not args:
+            value = df[name]
+        else:
+            resolved = [self.get(a) if isinstance(a, str) else a for a in args]
+            value = self.functions[name](df, *resolved)
+        self.values[key] = value
+        if name not in COLUMNS:
+            self.computed.append(key)
+        return value
+
+    def summary(self):
+        computed = ', '.join(self.computed) or '-'
+        reused = ', '.join(f'{k} x{n}' for k, n in self.reused.items()) or '-'
+        return f'Indikator dihitung: {computed} | dipakai ulang: {reused}'
@@ -0,0 +1,149 @@
+import argparse
+import collections
+import threading
+import time
+from datetime import datetime
+import numpy as np
+
+# Jurnal trading terstruktur:
+# - record() dari hot path cukup append tuple ke deque (O(1), tanpa I/O)
+# - thread writer menulis batch sebagai record biner ukuran tetap
+# - query() membaca file lewat np.memmap dan filter secara vektor
+
+# --- EVENT TYPES ---
+EVENT_SIGNAL = 1
+EVENT_ORDER = 2
+EVENT_RESULT = 3
+EVENT_FILL = 4
+EVENT_MODIFY_SL = 5
+EVENT_CYCLE = 6
+EVENT_ERROR = 7
+
+EVENT_NAMES = {
+    EVENT_SIGNAL: 'signal',
+    EVENT_ORDER: 'order',
+    EVENT_RESULT: 'result',
+    EVENT_FILL: 'fill',
+    EVENT_MODIFY_SL: 'modify_sl',
+    EVENT_CYCLE: 'cycle',
+    EVENT_ERROR: 'error',
+}
+EVENT_CODES = {name: code for code, name in EVENT_NAMES.items()}
+
+RECORD_DTYPE = np.dtype([
+    ('time', '<f8'),
+    ('event', 'u1'),
+    ('symbol', 'S16'),
+    ('magic', '<i8'),
+    ('ticket', '<i8'),
+    ('retcode', '<i4'),
+    ('price', '<f8'),
+    ('volume', '<f8'),
+    ('value', '<f8'),
+    ('text', 'S48'),
+])
+
+JOURNAL_FILE = 'trade_journal.bin'
+FLUSH_INTERVAL = 1.0  # detik
+
+_pending = collections.deque()
+_writer = None
+_stop = threading.Event()
+_path = JOURNAL_FILE
+
+# --- HOT PATH ---
+def record(event, symbol='', magic=0, ticket=0, retcode=0, price=0.0, volume=0.0, value=0.0, text=''):
+    _pending.append((time.time(), event, symbol, magic, ticket, retcode, price, volume, value, text))
+
+# --- BACKGROUND WRITER ---
+def _encode(item):
+    ts, event, symbol, magic, ticket, retcode, price, volume, value, text = item
+    return (ts, event, symbol.encode('utf-8')[:16], int(magic or 0), int(ticket or 0),
+            int(retcode or 0), float(price or 0.0), float(volume or 0.0), float(value or 0.0),
+            str(text).encode('utf-8')[:48])
+
+def flush():
+    batch = []
+    while _pending:
+        batch.append(_encode(_pending.popleft()))
+    if not batch:
+        return 0
+    with open(_path, 'ab') as f:
+        f.write(np.array(batch, dtype=RECORD_DTYPE).tobytes())
+    return len(batch)
+
+def _run():
+    while not _stop.wait(FLUSH_INTERVAL):
+        flush()
+    flush()
+
+def start(path=JOURNAL_FILE):
+    global _writer, _path
+    if _writer is not None:
+        return
+    _path = path
+    _stop.clear()
+    _writer = threading.Thread(target=_run, name='journal-writer', daemon=True)
+    _writer.start()
+
+def stop():
+    global _writer
+    if _writer is None:
+        return
+    _stop.set()
+    _writer.join()
+    _writer = None
+
+# --- QUERY ---
+def load(path=JOURNAL_FILE):
+    try:
+        return np.memmap(path, dtype=RECORD_DTYPE, mode='r')
+    except (FileNotFoundError, ValueError):
+        return np.zeros(0, dtype=RECORD_DTYPE)
+
+def query(path=JOURNAL_FILE, start=None, end=None, symbol=None, magic=None, event=None):
+    data = load(path)
+    # Record ditulis berurutan waktu, jadi rentang waktu cukup dicari dengan searchsorted
+    lo = np.searchsorted(data['time'], start.timestamp()) if start else 0
+    hi = np.searchsorted(data['time'], end.timestamp(), side='right') if end else len(data)
+    data = data[lo:hi]
+    mask = np.ones(len(data), dtype=bool)
+    if symbol is not None:
+        mask &= data['symbol'] == symbol.encode('utf-8')
+    if magic is not None:
+        mask &= data['magic'] == magic
+    if event is not None:
+        code = EVENT_CODES[event] if isinstance(event, str) else event
+        mask &= data['event'] == code
+    return np.asarray(data[mask])
+
+def format_record(rec):
+    ts = datetime.fromtimestamp(rec['time']).strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]
+    return (f"{ts} {EVENT_NAMES.get(int(rec['event']), rec['event']):<9} "
+            f"{rec['symbol'].decode():<10} magic={rec['magic']} ticket={rec['ticket']} "
+            f"retcode={rec['retcode']} price={rec['price']} volume={rec['volume']} "
+            f"value={rec['value']:.4f} {rec['text'].decode(errors='replace')}")
+
+def _parse_time(text):
+    return datetime.fromisoformat(text) if text else None
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Query jurnal trading')
+    parser.add_argument('path', nargs='?', default=JOURNAL_FILE)
+    parser.add_argument('--start', help='waktu awal ISO, mis. 2025-07-15T08:00')
+    parser.add_argument('--end', help='waktu akhir ISO')
+    parser.add_argument('--symbol')
+    parser.add_argument('--magic', type=int)
+    parser.add_argument('--event', choices=list(EVENT_CODES))
+    parser.add_argument('--count', action='store_true', help='hanya tampilkan jumlah per event')
+    args = parser.parse_args()
+
+    rows = query(args.path, _parse_time(args.start), _parse_time(args.end),
+                 args.symbol, args.magic, args.event)
+    if args.count:
+        codes, counts = np.unique(rows['event'], return_counts=True)
+        for code, n in zip(codes, counts):
+            print(f'{EVENT_NAMES.get(int(code), code):<10} {n}')
+    else:
+        for rec in rows:
+            print(format_record(rec))
@@ -0,0 +1,87 @@
+import MetaTrader5 as mt5
+import execution_stats
+
+# Entry lewat pending limit order di level Fibonacci: order dipasang di server broker
+# dengan SL/TP terpasang, lalu setiap siklus disesuaikan (modify) atau dibatalkan
+# (remove) jika swing/trend berubah. Fill terjadi tepat di level tanpa menunggu polling.
+
+COMMENT = 'Fibo limit entry'
+
+class LimitEntry:
+    def __init__(self, symbol, magic, on_event=None):
+        self.symbol = symbol
+        self.magic = magic
+        self.on_event = on_event
+
+    def pending(self):
+        orders = mt5.orders_get(symbol=self.symbol) or []
+        return [o for o in orders if o.magic == self.magic and o.comment.startswith(COMMENT[:20])]
+
+    def _send(self, request, point):
+        result = execution_stats.timed_send(mt5.order_send, request, point)
+        if self.on_event:
+            self.on_event(request, result)
+        return result is not None and result.retcode in (mt5.TRADE_RETCODE_DONE, mt5.TRADE_RETCODE_PLACED)
+
+    def cancel(self, orders=None):
+        for order in self.pending() if orders is None else orders:
+            self._send({
+                'action': mt5.TRADE_ACTION_REMOVE,
+                'order': order.ticket,
+                'symbol': self.symbol,
+                'magic': self.magic,
+            }, 0.0)
+
+    # Pasang / sesuaikan satu limit order. Return False jika harga sudah melewati level
+    # (limit tidak valid), supaya pemanggil bisa kembali ke entry market.
+    def sync(self, trend, level, sl, tp, volume):
+        info = mt5.symbol_info(self.symbol)
+        tick = mt5.symbol_info_tick(self.symbol)
+        if not info or not tick:
+            return True
+        digits = info.digits
+        point = info.point
+        min_distance = info.trade_stops_level * point
+        order_type = mt5.ORDER_TYPE_BUY_LIMIT if trend == 'bullish' else mt5.ORDER_TYPE_SELL_LIMIT
+        level = round(level, digits)
+        sl = round(sl, digits)
+        tp = round(tp, digits)
+
+        if (order_type == mt5.ORDER_TYPE_BUY_LIMIT and level > tick.ask - min_distance) or \
+                (order_type == mt5.ORDER_TYPE_SELL_LIMIT and level < tick.bid + min_distance):
+            self.cancel()
+            return False
+
+        orders = self.pending()
+        keep = [o for o in orders if o.type == order_type]
+        self.cancel([o for o in orders if o.type != order_type] + keep[1:])
+        if keep:
+            order = keep[0]
+            if abs(order.price_open - level) < point and abs(order.sl - sl) < point and abs(order.tp - tp) < point:
+                return True
+            self._send({
+                'action': mt5.TRADE_ACTION_MODIFY,
+                'order': order.ticket,
+                'symbol': self.symbol,
+                'price': level,
+                'sl': sl,
+                'tp': tp,
+                'type_time': mt5.ORDER_TIME_GTC,
+                'magic': self.magic,
+            }, point)
+            return True
+
+        self._send({
+            'action': mt5.TRADE_ACTION_PENDING,
+            'symbol': self.symbol,
+            'volume': volume,
+            'type': order_type,
+            'price': level,
+            'sl': sl,
+            'tp': tp,
+            'magic': self.magic,
+            'comment': COMMENT,
+            'type_time': mt5.ORDER_TIME_GTC,
+            'type_filling': mt5.ORDER_FILLING_RETURN,
+        }, point)
+        return True
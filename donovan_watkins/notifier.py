@@ -0,0 +1,165 @@
+import collections
+import json
+import queue
+import re
+import smtplib
+import threading
+import time
+import urllib.request
+from email.message import EmailMessage
+
+# Pipeline notifikasi asinkron:
+# - notify() hanya put_nowait ke queue berukuran tetap, tidak pernah blok
+# - thread worker menggabungkan pesan berulang jadi ringkasan dan membatasi laju kirim
+# - outbox (pesan menunggu token rate limit) juga dibatasi; kelebihannya dihitung sebagai dibuang
+# - transport bisa diganti (print, email, telegram, atau MemoryTransport untuk uji lokal)
+
+# --- TRANSPORTS ---
+class PrintTransport:
+    def send(self, message):
+        print(f"NOTIFIKASI: {message}")
+
+class MemoryTransport:
+    def __init__(self):
+        self.messages = []
+
+    def send(self, message):
+        self.messages.append(message)
+
+class EmailTransport:
+    def __init__(self, to, host='localhost', port=25, user=None, password=None, sender=None):
+        self.to = to
+        self.host = host
+        self.port = port
+        self.user = user
+        self.password = password
+        self.sender = sender or user or to
+
+    def send(self, message):
+        msg = EmailMessage()
+        msg['Subject'] = message[:80]
+        msg['From'] = self.sender
+        msg['To'] = self.to
+        msg.set_content(message)
+        with smtplib.SMTP(self.host, self.port, timeout=10) as smtp:
+            if self.user:
+                smtp.starttls()
+                smtp.login(self.user, self.password)
+            smtp.send_message(msg)
+
+class TelegramTransport:
+    def __init__(self, token, chat_id):
+        self.url = f'https://api.telegram.org/bot{token}/sendMessage'
+        self.chat_id = chat_id
+
+    def send(self, message):
+        body = json.dumps({'chat_id': self.chat_id, 'text': message}).encode()
+        req = urllib.request.Request(self.url, data=body, headers={'Content-Type': 'application/json'})
+        urllib.request.urlopen(req, timeout=10).read()
+
+# --- NOTIFIER ---
+class Notifier:
+    def __init__(self, transport=None, max_queue=1000, rate_per_minute=20, coalesce_seconds=30, max_outbox=1000):
+        self.transport = transport or PrintTransport()
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.rate_per_minute = rate_per_minute
+        self.coalesce_seconds = coalesce_seconds
+        self.dropped = 0
+        self.sent = 0
+        self.failed = 0
+        self._tokens = float(rate_per_minute)
+        self._last_refill = time.monotonic()
+        self._windows = {}  # key -> [waktu pertama, jumlah berulang, pesan terakhir]
+        self.max_outbox = max_outbox
+        self._outbox = collections.deque()
+        self._stop = threading.Event()
+        self._thread = None
+
+    # Dipanggil dari thread trading: tidak ada I/O, tidak pernah menunggu
+    def notify(self, message):
+        try:
+            self.queue.put_nowait((time.monotonic(), message))
+        except queue.Full:
+            self.dropped += 1
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='notifier', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=5):
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout)
+        self._thread = None
+
+    # Angka (retcode, harga, ticket) diabaikan supaya error sejenis tergabung
+    @staticmethod
+    def _key(message):
+        return re.sub(r'\d+(\.\d+)?', '#', message)
+
+    def _accept(self, ts, message):
+        key = self._key(message)
+        window = self._windows.get(key)
+        if window is None:
+            # Pesan yang dibuang tidak membuka jendela, jadi _windows ikut terbatas oleh outbox
+            if self._enqueue(message):
+                self._windows[key] = [ts, 0, message]
+        else:
+            window[1] += 1
+            window[2] = message
+
+    def _expire(self, now, force=False):
+        for key, (first, count, last) in list(self._windows.items()):
+            if force or now - first >= self.coalesce_seconds:
+                del self._windows[key]
+                if count:
+                    self._enqueue(f'{last} (berulang {count}x dalam {self.coalesce_seconds} detik)')
+
+    def _enqueue(self, message):
+        if len(self._outbox) >= self.max_outbox:
+            self.dropped += 1
+            return False
+        self._outbox.append(message)
+        return True
+
+    def _deliver(self, now, force=False):
+        self._tokens = min(self.rate_per_minute,
+                           self._tokens + (now - self._last_refill) * self.rate_per_minute / 60)
+        self._last_refill = now
+        # Laporan dibuang menunggu slot outbox (saat berhenti tetap dikirim); sampai ada, hitungannya bertambah
+        if self.dropped and (force or len(self._outbox) < self.max_outbox):
+            self._outbox.append(f'{self.dropped} notifikasi dibuang karena antrean penuh')
+            self.dropped = 0
+        while self._outbox and (force or self._tokens >= 1):
+            message = self._outbox.popleft()
+            self._tokens -= 1
+            try:
+                self.transport.send(message)
+                self.sent += 1
+            except Exception as e:
+                self.failed += 1
+                print(f'Gagal kirim notifikasi: {e}')
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                ts, message = self.queue.get(timeout=0.5)
+                self._accept(ts, message)
+                while True:
+                    ts, message = self.queue.get_nowait()
+                    self._accept(ts, message)
+            except queue.Empty:
+                pass
+            now = time.monotonic()
+            self._expire(now)
+            self._deliver(now)
+        # Saat berhenti kirim semua yang tersisa tanpa menunggu jendela / rate limit
+        while not self.queue.empty():
+            self._accept(*self.queue.get_nowait())
+        now = time.monotonic()
+        self._expire(now, force=True)
+        self._deliver(now, force=True)
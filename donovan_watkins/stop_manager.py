@@ -0,0 +1,194 @@
+import threading
+import time
+import MetaTrader5 as mt5
+import profiler
+import execution_stats
+
+# Stop manager di thread terpisah: cek setiap tick baru untuk posisi terbuka
+# dan jalankan aturan break-even, trailing dan partial close saat itu juga,
+# tidak menunggu jadwal loop entry (60 detik).
+
+POLL_INTERVAL = 0.05      # detik antar cek tick
+REFRESH_INTERVAL = 1.0    # detik antar sinkronisasi posisi dari terminal
+RETRY_INTERVAL = 1.0      # jeda sebelum mencoba lagi ticket yang gagal dimodifikasi
+MIN_STEP_POINTS = 10      # SL baru harus lebih baik minimal sekian point
+
+class StopManager:
+    def __init__(self, symbol, magic, be_trigger, be_offset, trail_start, partial_trigger,
+                 partial_ratio, base_lot, deviation, trail_points=None, on_event=None, book=None):
+        self.symbol = symbol
+        self.magic = magic
+        self.be_trigger = be_trigger
+        self.be_offset = be_offset
+        self.trail_start = trail_start
+        self.partial_trigger = partial_trigger
+        self.partial_ratio = partial_ratio
+        self.base_lot = base_lot
+        self.deviation = deviation
+        self.trail_points = trail_points
+        self.trail_distance = None  # jarak trailing dalam harga (mis. ATR), diisi dari main loop
+        self.on_event = on_event
+        self.book = book
+        self.positions = {}
+        self.point = None
+        self.digits = None
+        self._lock = threading.Lock()
+        self._blocked = {}
+        self._partial_done = set()  # ticket yang sudah partial close: sekali per posisi
+        self._last_msc = 0
+        self._last_refresh = 0.0
+        self._stop = threading.Event()
+        self._thread = None
+
+    # --- LIFECYCLE ---
+    def start(self):
+        if self._thread is not None:
+            return
+        info = mt5.symbol_info(self.symbol)
+        self.point = info.point
+        self.digits = info.digits
+        self.refresh()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='stop-manager', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    # Nilai aturan dari hot config: diganti sekaligus di bawah lock, on_tick memakai salinannya
+    def configure(self, **fields):
+        with self._lock:
+            for name, value in fields.items():
+                setattr(self, name, value)
+
+    # --- POSITION VIEW ---
+    def refresh(self):
+        if self.book is not None:
+            # Posisi dari PositionBook di memori, terminal hanya dicek saat reconcile
+            self.book.update()
+            view = {pos['ticket']: pos for pos in self.book.snapshot() if pos['magic'] == self.magic}
+            with self._lock:
+                self.positions = view
+                self._partial_done &= view.keys()
+            self._last_refresh = time.monotonic()
+            return
+        positions = mt5.positions_get(symbol=self.symbol) or []
+        view = {}
+        for pos in positions:
+            if pos.magic != self.magic:
+                continue
+            view[pos.ticket] = {
+                'ticket': pos.ticket,
+                'type': pos.type,
+                'price_open': pos.price_open,
+                'volume': pos.volume,
+                'sl': pos.sl,
+                'tp': pos.tp,
+                'symbol': pos.symbol,
+                'magic': pos.magic,
+            }
+        with self._lock:
+            self.positions = view
+            self._partial_done &= view.keys()
+        self._last_refresh = time.monotonic()
+
+    def _run(self):
+        profiler.stage('position_management')
+        while not self._stop.is_set():
+            now = time.monotonic()
+            if now - self._last_refresh >= REFRESH_INTERVAL:
+                self.refresh()
+            if self.positions:
+                tick = mt5.symbol_info_tick(self.symbol)
+                if tick and tick.time_msc != self._last_msc:
+                    self._last_msc = tick.time_msc
+                    self.on_tick(tick)
+            self._stop.wait(POLL_INTERVAL)
+
+    # --- RULES ---
+    def on_tick(self, tick):
+        with self._lock:
+            positions = list(self.positions.values())
+            partial_trigger, partial_ratio, base_lot = self.partial_trigger, self.partial_ratio, self.base_lot
+            be_trigger, be_offset, trail_start = self.be_trigger, self.be_offset, self.trail_start
+            trail_distance, trail_points = self.trail_distance, self.trail_points
+        now = time.monotonic()
+        point = self.point
+        digits = self.digits
+        for pos in positions:
+            if self._blocked.get(pos['ticket'], 0) > now:
+                continue
+            is_buy = pos['type'] == mt5.ORDER_TYPE_BUY
+            if is_buy:
+                profit_point = (tick.bid - pos['price_open']) / point
+            else:
+                profit_point = (pos['price_open'] - tick.ask) / point
+
+            if (profit_point > partial_trigger and pos['volume'] >= base_lot * 2
+                    and pos['ticket'] not in self._partial_done):
+                self.close_partial(pos, tick, pos['volume'] * partial_ratio)
+
+            new_sl = None
+            if profit_point > be_trigger:
+                new_sl = pos['price_open'] + be_offset * point * (1 if is_buy else -1)
+            if profit_point > trail_start:
+                distance = trail_distance
+                if distance is None:
+                    distance = trail_points * point
+                trail = tick.bid - distance if is_buy else tick.ask + distance
+                if new_sl is None or (trail > new_sl if is_buy else trail < new_sl):
+                    new_sl = trail
+            if new_sl is None:
+                continue
+            new_sl = round(new_sl, digits)
+            sl = pos['sl']
+            step = MIN_STEP_POINTS * point
+            if sl == 0 or (is_buy and new_sl >= sl + step) or (not is_buy and new_sl <= sl - step):
+                self.modify_sl(pos, new_sl)
+
+    # --- REQUESTS ---
+    def modify_sl(self, pos, new_sl):
+        result = execution_stats.timed_send(mt5.order_send, {
+            "action": mt5.TRADE_ACTION_SLTP,
+            "position": pos['ticket'],
+            "sl": new_sl,
+            "tp": pos['tp'],
+            "symbol": pos['symbol'],
+            "magic": pos['magic'],
+            "comment": "Modify SL",
+        }, self.point)
+        if result is not None and result.retcode == mt5.TRADE_RETCODE_DONE:
+            pos['sl'] = new_sl
+        else:
+            self._blocked[pos['ticket']] = time.monotonic() + RETRY_INTERVAL
+        if self.on_event:
+            self.on_event('modify_sl', pos, new_sl, result)
+
+    def close_partial(self, pos, tick, volume_to_close):
+        volume = round(volume_to_close, 2)
+        is_buy = pos['type'] == mt5.ORDER_TYPE_BUY
+        result = execution_stats.timed_send(mt5.order_send, {
+            "action": mt5.TRADE_ACTION_DEAL,
+            "symbol": pos['symbol'],
+            "volume": volume,
+            "type": mt5.ORDER_TYPE_SELL if is_buy else mt5.ORDER_TYPE_BUY,
+            "position": pos['ticket'],
+            "price": tick.bid if is_buy else tick.ask,
+            "deviation": self.deviation,
+            "magic": self.magic,
+            "comment": "Partial Close",
+            "type_time": mt5.ORDER_TIME_GTC,
+            "type_filling": mt5.ORDER_FILLING_IOC,
+        }, self.point)
+        if result is not None and result.retcode == mt5.TRADE_RETCODE_DONE:
+            pos['volume'] = round(pos['volume'] - volume, 2)
+            with self._lock:
+                self._partial_done.add(pos['ticket'])
+        else:
+            self._blocked[pos['ticket']] = time.monotonic() + RETRY_INTERVAL
+        if self.on_event:
+            self.on_event('partial_close', pos, volume, result)
@@ -0,0 +1,240 @@
+import abc
+import argparse
+import time
+import numpy as np
+import pandas as pd
+
+# Pembentuk bar dari tick: time bar dengan periode bebas (mis. 30 detik), range bar dan Renko.
+# Tiap tick O(1): hanya bar berjalan yang diperbarui; bar selesai ditulis ke array berkapasitas
+# 2x (saat penuh, separuh terakhir disalin ke depan sekali) sehingga N bar terakhir selalu view
+# kontigu. Output berformat sama dengan copy_rates_from_pos (time, open, high, low, close,
+# tick_volume, spread, real_volume), jadi bisa langsung dipakai detect_fractal / RSI / ATR dan
+# sebagai loader IndicatorGraph. Harga bar dari bid, seperti bar terminal.
+
+RATES_DTYPE = np.dtype([('time', '<i8'), ('open', '<f8'), ('high', '<f8'), ('low', '<f8'), ('close', '<f8'),
+                        ('tick_volume', '<u8'), ('spread', '<i4'), ('real_volume', '<u8')])
+CAPACITY = 5000
+POINT = 0.01
+
+class BarBuilder(abc.ABC):
+    def __init__(self, capacity=CAPACITY, point=POINT):
+        self.capacity = capacity
+        self.point = point
+        self.bars = np.zeros(2 * capacity, RATES_DTYPE)
+        self.count = 0
+        self.end = 0
+        self.current = None  # [time, open, high, low, close, ticks, spread, volume]
+        self.last_msc = 0
+
+    # --- TICK ---
+    def on_tick(self, time_msc, bid, ask, volume=0):
+        # Mengembalikan jumlah bar yang selesai karena tick ini
+        self.last_msc = time_msc
+        spread = int(round((ask - bid) / self.point))
+        bar = self.current
+        if bar is None:
+            self._open(time_msc, bid, spread, volume)
+            return 0
+        closed = self._update(bar, time_msc, bid, spread, volume)
+        return closed
+
+    def _open(self, time_msc, price, spread, volume):
+        self.current = [self._bar_time(time_msc), price, price, price, price, 1, spread, volume]
+
+    def _extend(self, bar, price, spread, volume):
+        if price > bar[2]:
+            bar[2] = price
+        if price < bar[3]:
+            bar[3] = price
+        bar[4] = price
+        bar[5] += 1
+        if spread < bar[6]:
+            bar[6] = spread  # seperti terminal: spread minimum dalam bar
+        bar[7] += volume
+
+    def _emit(self, bar):
+        if self.end == len(self.bars):
+            keep = self.capacity - 1
+            self.bars[:keep] = self.bars[self.end - keep:self.end]
+            self.end = keep
+        self.bars[self.end] = tuple(bar)
+        self.end += 1
+        self.count += 1
+
+    def _bar_time(self, time_msc):
+        return time_msc // 1000
+
+    # Terapkan tick ke bar berjalan; return jumlah bar yang selesai
+    @abc.abstractmethod
+    def _update(self, bar, time_msc, price, spread, volume):
+        pass
+
+    # --- VIEWS ---
+    def completed(self, n=None):
+        filled = min(self.count, self.capacity)
+        n = filled if n is None else min(n, filled)
+        return self.bars[self.end - n:self.end]
+
+    def copy_rates_from_pos(self, start, count):
+        # Posisi 0 = bar berjalan (seperti terminal), 1 = bar selesai terakhir, dst.
+        if self.current is None:
+            return None
+        if start > 0:
+            done = self.completed(count + start - 1)
+            return done[:max(len(done) - start + 1, 0)].copy()
+        out = np.empty(min(count, min(self.count, self.capacity) + 1), RATES_DTYPE)
+        out[:-1] = self.completed(len(out) - 1)
+        out[-1] = tuple(self.current)
+        return out
+
+    def frame(self, count, forming=True):
+        rates = self.copy_rates_from_pos(0 if forming else 1, count)
+        if rates is None:
+            return None
+        df = pd.DataFrame(rates)
+        df['time'] = df['time'].to_numpy().astype('datetime64[s]')
+        return df
+
+    def window(self, n):
+        bars = self.completed(n)
+        return {name: bars[name] for name in RATES_DTYPE.names}
+
+    # --- LIVE ---
+    def poll(self, symbol):
+        # Tick yang sudah dipantau bot; time_msc sama = tick lama, diabaikan
+        import MetaTrader5 as mt5
+        tick = mt5.symbol_info_tick(symbol)
+        if not tick or tick.time_msc == self.last_msc:
+            return 0
+        return self.on_tick(tick.time_msc, tick.bid, tick.ask, tick.volume)
+
+class TimeBars(BarBuilder):
+    def __init__(self, seconds, capacity=CAPACITY, point=POINT):
+        super().__init__(capacity, point)
+        self.seconds = seconds
+
+    def _bar_time(self, time_msc):
+        return time_msc // 1000 // self.seconds * self.seconds
+
+    def _update(self, bar, time_msc, price, spread, volume):
+        if time_msc // 1000 - bar[0] < self.seconds:
+            self._extend(bar, price, spread, volume)
+            return 0
+        # Periode tanpa tick tidak menghasilkan bar kosong (sama seperti terminal)
+        self._emit(bar)
+        self._open(time_msc, price, spread, volume)
+        return 1
+
+class RangeBars(BarBuilder):
+    # Bar selesai saat high - low mencapai `size` (harga); bar baru dibuka di harga penutup
+    def __init__(self, size, capacity=CAPACITY, point=POINT):
+        super().__init__(capacity, point)
+        self.size = size
+
+    def _update(self, bar, time_msc, price, spread, volume):
+        if max(bar[2], price) - min(bar[3], price) < self.size:
+            self._extend(bar, price, spread, volume)
+            return 0
+        # Tutup tepat di batas range; sisa gerakan (gap) masuk ke bar baru
+        if price > bar[2]:
+            edge = bar[3] + self.size
+        else:
+            edge = bar[2] - self.size
+        bar[2] = max(bar[2], edge)
+        bar[3] = min(bar[3], edge)
+        bar[4] = edge
+        self._emit(bar)
+        self.current = [time_msc // 1000, edge, max(edge, price), min(edge, price), price, 1, spread, volume]
+        return 1
+
+class RenkoBars(BarBuilder):
+    # Brick baru tiap `box` searah brick terakhir; pembalikan butuh 2 box (Renko klasik).
+    # Bar berjalan berisi tick sejak brick terakhir; gap besar menghasilkan beberapa brick.
+    def __init__(self, box, capacity=CAPACITY, point=POINT):
+        super().__init__(capacity, point)
+        self.box = box
+        self.base = None
+        self.direction = 0
+
+    def _open(self, time_msc, price, spread, volume):
+        super()._open(time_msc, price, spread, volume)
+        if self.base is None:
+            self.base = price
+
+    def _update(self, bar, time_msc, price, spread, volume):
+        self._extend(bar, price, spread, volume)
+        box = self.box
+        up = self.base + (box if self.direction >= 0 else 2 * box)
+        down = self.base - (box if self.direction <= 0 else 2 * box)
+        if down < price < up:
+            return 0
+        step = 1 if price >= up else -1
+        first = up if step > 0 else down
+        n = 1 + int((abs(price - first) + 1e-9) // box)
+        # Open brick = sisi brick sebelumnya (pembalikan mulai dari ujung lain brick terakhir)
+        brick_open = first - step * box
+        for k in range(n):
+            close = first + step * k * box
+            self._emit([bar[0], brick_open, max(brick_open, close), min(brick_open, close), close,
+                        bar[5] if k == 0 else 0, bar[6], bar[7] if k == 0 else 0])
+            brick_open = close
+        self.base = brick_open
+        self.direction = step
+        self.current = [time_msc // 1000, price, price, price, price, 0, spread, 0]
+        return n
+
+def make_builder(kind, size, capacity=CAPACITY, point=POINT):
+    if kind == 'time':
+        return TimeBars(int(size), capacity, point)
+    if kind == 'range':
+        return RangeBars(float(size), capacity, point)
+    if kind == 'renko':
+        return RenkoBars(float(size), capacity, point)
+    raise ValueError(f'Jenis bar tidak dikenal: {kind}')
+
+# --- REPLAY ARSIP TICK ---
+def load_ticks(path):
+    # .npy hasil copy_ticks_range (field time_msc, bid, ask, volume) atau CSV export tick MT5:
+    # <DATE> <TIME> <BID> <ASK> <LAST> <VOLUME> <FLAGS>, bid/ask kosong = tidak berubah
+    if path.endswith('.npy'):
+        ticks = np.load(path)
+        volume = ticks['volume'] if 'volume' in ticks.dtype.names else np.zeros(len(ticks))
+        return ticks['time_msc'].astype(np.int64), ticks['bid'], ticks['ask'], volume.astype(np.int64)
+    df = pd.read_csv(path, sep='\t')
+    df.columns = [c.strip('<>').lower() for c in df.columns]
+    stamp = pd.to_datetime(df['date'] + ' ' + df['time'], format='%Y.%m.%d %H:%M:%S.%f')
+    msc = stamp.to_numpy().astype('datetime64[ms]').astype(np.int64)
+    bid = df['bid'].ffill().to_numpy(dtype=np.float64)
+    ask = df['ask'].ffill().to_numpy(dtype=np.float64)
+    valid = ~(np.isnan(bid) | np.isnan(ask))
+    volume = df['volume'].fillna(0).to_numpy(dtype=np.int64) if 'volume' in df.columns else np.zeros(len(df), np.int64)
+    return msc[valid], bid[valid], ask[valid], volume[valid]
+
+def replay(builder, msc, bid, ask, volume, on_bar=None):
+    # on_bar(builder) dipanggil tiap ada bar selesai, mis. untuk menghitung sinyal seperti live
+    on_tick = builder.on_tick
+    for t, b, a, v in zip(msc.tolist(), bid.tolist(), ask.tolist(), volume.tolist()):
+        if on_tick(t, b, a, v) and on_bar:
+            on_bar(builder)
+    return builder
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Bentuk time / range / Renko bar dari arsip tick')
+    parser.add_argument('ticks', help='CSV export tick MT5 atau .npy dari copy_ticks_range')
+    parser.add_argument('--type', choices=['time', 'range', 'renko'], default='time')
+    parser.add_argument('--size', type=float, default=30, help='detik (time) atau harga (range/renko)')
+    parser.add_argument('--point', type=float, default=POINT)
+    parser.add_argument('--capacity', type=int, default=CAPACITY)
+    parser.add_argument('--out', help='simpan bar selesai ke .npy')
+    args = parser.parse_args()
+
+    msc, bid, ask, volume = load_ticks(args.ticks)
+    builder = make_builder(args.type, args.size, args.capacity, args.point)
+    start = time.perf_counter()
+    replay(builder, msc, bid, ask, volume)
+    elapsed = time.perf_counter() - start
+    print(f'{len(msc)} tick -> {builder.count} bar {args.type} {args.size:g} '
+          f'({len(msc) / max(elapsed, 1e-9):,.0f} tick/detik)')
+    print(builder.frame(10))
+    if args.out:
+        np.save(args.out, builder.completed())
@@ -1,8 +1,15 @@
 import MetaTrader5 as mt5
 import pandas as pd
 import time
+import os
+import sys
 from datetime import datetime, timedelta
 from ta.momentum import RSIIndicator
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'shared'))
+from position_book import PositionBook
+import execution_stats
+from hot_config import HotConfig
+from bar_builder import make_builder
 
 # Config
 SYMBOL = 'XAUUSDm'
@@ -13,31 +20,78 @@ USD_IDR_RATE = 16000
 RSI_PERIOD = 14
 TIMEFRAME = mt5.TIMEFRAME_M1
 ENTRY_INTERVAL_MINUTES = 5
+# Bar dari tick sendiri: None = bar TIMEFRAME terminal, ('time', 30) / ('range', 1.0) / ('renko', 0.5)
+BAR_TYPE = None
+BAR_POLL_SECONDS = 0.05  # interval poll tick builder selama bot menunggu
+CONFIG_FILE = 'plekendu_config.json'  # override konstanta di atas, dibaca ulang sebelum tiap entry
+
+# Konstanta yang boleh diubah tanpa restart: (tipe, cek, keterangan)
+CONFIG_SCHEMA = {
+    'LOT': (float, lambda v: 0 < v <= 10, '0-10 lot'),
+    'TP_RUPIAH': (int, lambda v: v > 0, '> 0'),
+    'USD_IDR_RATE': (int, lambda v: v > 0, '> 0'),
+    'RSI_PERIOD': (int, lambda v: 2 <= v <= 200, '2-200'),
+    'ENTRY_INTERVAL_MINUTES': (int, lambda v: 1 <= v <= 1440, '1-1440'),
+}
+config = HotConfig(CONFIG_FILE, globals(), CONFIG_SCHEMA)
+
+def reload_config():
+    changed, errors = config.poll()
+    if errors:
+        print(f"[{datetime.now()}] config {CONFIG_FILE} ditolak, tetap pakai nilai lama: {'; '.join(errors)}")
+    elif changed:
+        print(f"[{datetime.now()}] config diperbarui: "
+              f"{', '.join(f'{k} {old} -> {new}' for k, (old, new) in changed.items())}")
 
 # Connect
+point = None  # point SYMBOL, diisi init_mt5 (dipakai statistik slippage)
+
 def init_mt5():
+    global point
     if not mt5.initialize():
         print("Gagal terkoneksi ke MT5")
         quit()
     if not mt5.symbol_select(SYMBOL, True):
         print(f"Gagal menemukan symbol {SYMBOL}")
         quit()
+    point = mt5.symbol_info(SYMBOL).point
     print("Berhasil terkoneksi ke MT5")
 
 # RSI
+bar_builder = make_builder(*BAR_TYPE) if BAR_TYPE else None
+
 def get_rsi(symbol, timeframe, period):
-    rates = mt5.copy_rates_from_pos(symbol, timeframe, 0, period + 50)
-    if rates is None:
+    if bar_builder:
+        rates = bar_builder.copy_rates_from_pos(0, period + 50)
+    else:
+        rates = mt5.copy_rates_from_pos(symbol, timeframe, 0, period + 50)
+    if rates is None or len(rates) <= period:
         return None
     df = pd.DataFrame(rates)
     df['close'] = df['close'].astype(float)
     rsi = RSIIndicator(close=df['close'], window=period).rsi()
     return rsi.iloc[-1]
 
-# Open position
+# Jeda yang tetap memberi tick ke builder: sleep panjang akan melewatkan tick bar custom
+def wait(seconds):
+    if not bar_builder:
+        time.sleep(seconds)
+        return
+    until = time.monotonic() + seconds
+    while time.monotonic() < until:
+        bar_builder.poll(SYMBOL)
+        time.sleep(BAR_POLL_SECONDS)
+
+# Open position (dari position book di memori, dicocokkan ke terminal berkala)
+def on_book_drift(drift):
+    print(f"[{datetime.now()}] position book dikoreksi: {drift}")
+
+book = PositionBook(SYMBOL, on_drift=on_book_drift)
+execution_stats.listeners.append(book.on_result)
+
 def has_open_position():
-    positions = mt5.positions_get(symbol=SYMBOL)
-    return positions and len(positions) > 0
+    book.update()
+    return book.count(symbol=SYMBOL) > 0
 
 # Calculate TP
 def calculate_tp_distance(lot):
@@ -67,7 +121,7 @@ def open_order(order_type, lot):
         "type_filling": mt5.ORDER_FILLING_IOC,
     }
 
-    result = mt5.order_send(request)
+    result = execution_stats.timed_send(mt5.order_send, request, point)
     if result.retcode == mt5.TRADE_RETCODE_DONE:
         direction = "BUY" if order_type == mt5.ORDER_TYPE_BUY else "SELL"
         print(f"[{datetime.now()}] {direction} berhasil @ {price:.2f}, TP: {tp_price:.2f}")
@@ -77,13 +131,18 @@ def open_order(order_type, lot):
 # Main
 def main():
     init_mt5()
+    execution_stats.start()
+    book.start()
 
     next_entry = datetime.now()
     
     while True:
         now = datetime.now()
+        if bar_builder:
+            bar_builder.poll(SYMBOL)
 
         if now >= next_entry:
+            reload_config()
             if not has_open_position():
                 rsi = get_rsi(SYMBOL, TIMEFRAME, RSI_PERIOD)
                 if rsi is None:
@@ -102,7 +161,7 @@ def main():
                 print(f"[{now}] masih ada open posisi")
             
             next_entry = now + timedelta(minutes=ENTRY_INTERVAL_MINUTES)
-            time.sleep(5)
+            wait(5)
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -0,0 +1,113 @@
+import numpy as np
+import MetaTrader5 as mt5
+
+# Penyimpanan bar berkapasitas tetap per timeframe untuk satu atau banyak simbol.
+# Array dialokasikan sekali dan dipakai sebagai ring buffer: tiap simbol punya indeks head,
+# candle baru cukup memajukan head dan menulis 1 slot (O(1) per bar, RSS tetap datar).
+# Tiap slot ditulis dua kali (slot dan slot + capacity), jadi n bar terakhir selalu berupa
+# potongan kontigu: window/ohlc mengembalikan view read-only tanpa menyalin. View ikut berubah
+# saat sync berikutnya menulis bar; konsumen yang menyimpan hasil (mis. frame di IndicatorGraph)
+# wajib menyalin sendiri. Tiap siklus hanya mengambil SYNC_BARS bar terakhir dari terminal.
+
+SYNC_BARS = 3
+COLUMNS = ('open', 'high', 'low', 'close', 'tick_volume', 'spread')
+
+def _readonly(array):
+    view = array.view()
+    view.flags.writeable = False
+    return view
+
+class BarStore:
+    def __init__(self, symbols, timeframe, capacity):
+        self.symbols = list(symbols)
+        self.index = {s: i for i, s in enumerate(self.symbols)}
+        self.timeframe = timeframe
+        self.capacity = capacity
+        k = len(self.symbols)
+        self.data = np.zeros((len(COLUMNS), k, 2 * capacity))
+        self.time = np.zeros((k, 2 * capacity), dtype=np.int64)
+        self.filled = np.zeros(k, dtype=np.int64)
+        self.head = np.zeros(k, dtype=np.int64)  # slot untuk bar berikutnya
+
+    # --- SYNC ---
+    def _reload(self, i):
+        rates = mt5.copy_rates_from_pos(self.symbols[i], self.timeframe, 0, self.capacity)
+        if rates is None or len(rates) == 0:
+            return False
+        n = len(rates)
+        for start in (0, self.capacity):
+            self.time[i, start:start + n] = rates['time']
+            for c, name in enumerate(COLUMNS):
+                self.data[c, i, start:start + n] = rates[name]
+        self.filled[i] = n
+        self.head[i] = n % self.capacity
+        return True
+
+    def _advance(self, i):
+        self.head[i] = (self.head[i] + 1) % self.capacity
+        self.filled[i] = min(self.filled[i] + 1, self.capacity)
+
+    def _write_last(self, i, bar):
+        slot = (self.head[i] - 1) % self.capacity
+        slots = [slot, slot + self.capacity]
+        self.time[i, slots] = bar['time']
+        for c, name in enumerate(COLUMNS):
+            self.data[c, i, slots] = bar[name]
+
+    def sync(self, symbol):
+        i = self.index[symbol]
+        if self.filled[i] == 0:
+            return self._reload(i)
+        rates = mt5.copy_rates_from_pos(symbol, self.timeframe, 0, SYNC_BARS)
+        if rates is None or len(rates) == 0:
+            return False
+        last = self.time[i, (self.head[i] - 1) % self.capacity]
+        # Terlewat lebih dari SYNC_BARS bar (mis. reconnect): isi ulang penuh
+        if rates['time'][0] > last:
+            return self._reload(i)
+        for bar in rates:
+            t = bar['time']
+            if t < last:
+                continue
+            if t > last:
+                self._advance(i)
+                last = t
+            self._write_last(i, bar)
+        return True
+
+    # --- VIEW (read-only, urut dari bar terlama) ---
+    # Potongan [end - n, end) di salinan kedua selalu berisi n bar terakhir secara berurutan
+    def _span(self, i, n):
+        end = int(self.head[i]) + self.capacity
+        return slice(end - n, end)
+
+    def window(self, symbol, n):
+        i = self.index[symbol]
+        span = self._span(i, min(n, int(self.filled[i])))
+        bars = {'time': _readonly(self.time[i, span])}
+        for c, name in enumerate(COLUMNS):
+            bars[name] = _readonly(self.data[c, i, span])
+        return bars
+
+    # Bar ke-`back` dari belakang (1 = bar berjalan, 2 = bar close terakhir)
+    def bar(self, symbol, back=1):
+        i = self.index[symbol]
+        slot = (self.head[i] - back) % self.capacity
+        bar = {'time': self.time[i, slot]}
+        for c, name in enumerate(COLUMNS):
+            bar[name] = self.data[c, i, slot]
+        return bar
+
+    # Array (4, simbol, bar) open/high/low/close untuk semua simbol (atau sebagian). View jika
+    # simbolnya berurutan di store dan head-nya sama (kasus normal: satu timeframe, sync bersama),
+    # selain itu dikumpulkan ke salinan baru
+    def ohlc(self, n, symbols=None):
+        rows = np.arange(len(self.symbols)) if symbols is None else np.array([self.index[s] for s in symbols])
+        heads = self.head[rows]
+        if (heads == heads[0]).all() and (np.diff(rows) == 1).all():
+            return _readonly(self.data[:4, rows[0]:rows[-1] + 1, self._span(rows[0], n)])
+        slots = heads[:, None] + self.capacity - n + np.arange(n)
+        return _readonly(self.data[:4, rows[:, None], slots])
+
+    def ready(self, n):
+        return bool((self.filled >= n).all())
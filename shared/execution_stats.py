@@ -0,0 +1,199 @@
+import argparse
+import collections
+import math
+import os
+import threading
+import time
+import numpy as np
+import pandas as pd
+
+# Analitik kualitas eksekusi: setiap pasangan request/result order_send dicatat
+# (harga diminta vs harga eksekusi, latency round-trip, retcode), lalu diringkas per
+# simbol, jam dan tipe order untuk menentukan DEVIATION dan filling mode.
+# Modul ini sengaja tidak mengimpor MetaTrader5 supaya analisis bisa jalan di mesin lain.
+
+STATS_FILE = 'execution_stats.bin'
+FLUSH_INTERVAL = 1.0
+
+RETCODE_DONE = 10009
+RETCODE_DONE_PARTIAL = 10010
+RETCODE_PLACED = 10008
+RETCODE_NO_CHANGES = 10025
+RETCODE_REQUOTE = 10004
+RETCODE_REJECT = 10006
+RETCODE_CANCEL = 10007
+RETCODE_INVALID = 10013
+RETCODE_INVALID_VOLUME = 10014
+RETCODE_INVALID_PRICE = 10015
+RETCODE_INVALID_STOPS = 10016
+RETCODE_TRADE_DISABLED = 10017
+RETCODE_MARKET_CLOSED = 10018
+RETCODE_NO_MONEY = 10019
+RETCODE_PRICE_CHANGED = 10020
+RETCODE_PRICE_OFF = 10021
+RETCODE_INVALID_EXPIRATION = 10022
+RETCODE_LIMIT_ORDERS = 10033
+RETCODE_LIMIT_VOLUME = 10034
+RETCODE_INVALID_FILL = 10030
+FILLED_CODES = (RETCODE_DONE, RETCODE_DONE_PARTIAL)
+# Diterima server: order pending yang terpasang (PLACED) juga sukses, bukan reject
+ACCEPTED_CODES = FILLED_CODES + (RETCODE_PLACED,)
+REQUOTE_CODES = (RETCODE_REQUOTE, RETCODE_PRICE_CHANGED, RETCODE_PRICE_OFF)
+# Ditolak server/broker. NO_CHANGES (SL/TP sama) netral; timeout/koneksi/-1 dihitung sebagai error
+REJECT_CODES = (RETCODE_REJECT, RETCODE_CANCEL, RETCODE_INVALID, RETCODE_INVALID_VOLUME, RETCODE_INVALID_PRICE,
+                RETCODE_INVALID_STOPS, RETCODE_TRADE_DISABLED, RETCODE_MARKET_CLOSED, RETCODE_NO_MONEY,
+                RETCODE_INVALID_EXPIRATION, RETCODE_INVALID_FILL, RETCODE_LIMIT_ORDERS, RETCODE_LIMIT_VOLUME)
+FILLING_NAMES = {0: 'FOK', 1: 'IOC', 2: 'RETURN', 3: 'BOC'}
+TYPE_NAMES = {0: 'BUY', 1: 'SELL', 2: 'BUY_LIMIT', 3: 'SELL_LIMIT', 4: 'BUY_STOP', 5: 'SELL_STOP'}
+ACTION_NAMES = {1: 'DEAL', 5: 'PENDING', 6: 'SLTP', 7: 'MODIFY', 8: 'REMOVE', 10: 'CLOSE_BY'}
+
+RECORD_DTYPE = np.dtype([
+    ('time', '<f8'),
+    ('symbol', 'S16'),
+    ('action', '<i4'),
+    ('type', '<i4'),
+    ('filling', '<i4'),
+    ('deviation', '<i4'),
+    ('retcode', '<i4'),
+    ('requested', '<f8'),
+    ('executed', '<f8'),
+    ('point', '<f8'),
+    ('volume', '<f8'),
+    ('latency_ms', '<f8'),
+])
+
+_pending = collections.deque()
+listeners = []  # fungsi(request, result) yang dipanggil setiap order_send, mis. PositionBook.on_result
+_writer = None
+_stop = threading.Event()
+_path = STATS_FILE
+
+# --- CAPTURE ---
+def timed_send(order_send, request, point=0.0):
+    start = time.perf_counter()
+    result = order_send(request)
+    latency = (time.perf_counter() - start) * 1000
+    _pending.append((
+        time.time(),
+        str(request.get('symbol', '')).encode()[:16],
+        request.get('action', 0),
+        request.get('type', -1),
+        request.get('type_filling', -1),
+        request.get('deviation', 0),
+        result.retcode if result is not None else -1,
+        request.get('price', 0.0),
+        result.price if result is not None else 0.0,
+        point,
+        request.get('volume', 0.0),
+        latency,
+    ))
+    for listener in listeners:
+        listener(request, result)
+    return result
+
+def flush():
+    batch = []
+    while _pending:
+        batch.append(_pending.popleft())
+    if batch:
+        with open(_path, 'ab') as f:
+            f.write(np.array(batch, dtype=RECORD_DTYPE).tobytes())
+
+def _run():
+    while not _stop.wait(FLUSH_INTERVAL):
+        flush()
+    flush()
+
+def start(path=STATS_FILE):
+    global _writer, _path
+    if _writer is not None:
+        return
+    _path = path
+    _stop.clear()
+    _writer = threading.Thread(target=_run, name='execution-stats', daemon=True)
+    _writer.start()
+
+def stop():
+    global _writer
+    if _writer is None:
+        return
+    _stop.set()
+    _writer.join()
+    _writer = None
+
+# --- ANALYSIS ---
+def load(path=STATS_FILE):
+    # Belum ada order yang dicatat: DataFrame kosong dengan kolom yang sama
+    data = np.fromfile(path, dtype=RECORD_DTYPE) if os.path.exists(path) else np.zeros(0, RECORD_DTYPE)
+    df = pd.DataFrame(data)
+    df['symbol'] = df['symbol'].str.decode('utf-8')
+    df['time'] = pd.to_datetime(df['time'], unit='s')
+    df['hour'] = df['time'].dt.hour
+    df['order_type'] = df['type'].map(TYPE_NAMES).fillna(df['action'].map(ACTION_NAMES)).fillna('?')
+    df['filling_mode'] = df['filling'].map(FILLING_NAMES).fillna('-')
+    df['filled'] = df['retcode'].isin(FILLED_CODES)
+    df['accepted'] = df['retcode'].isin(ACCEPTED_CODES)
+    df['requote'] = df['retcode'].isin(REQUOTE_CODES)
+    df['rejected'] = df['retcode'].isin(REJECT_CODES)
+    df['error'] = ~(df['accepted'] | df['requote'] | df['rejected'] | (df['retcode'] == RETCODE_NO_CHANGES))
+    # Slippage positif = merugikan (buy lebih mahal, sell lebih murah)
+    sign = np.where(df['type'] % 2 == 0, 1.0, -1.0)
+    priced = df['filled'] & (df['requested'] > 0) & (df['executed'] > 0) & (df['point'] > 0)
+    df['slippage'] = np.where(priced, (df['executed'] - df['requested']) * sign / df['point'].where(priced, 1.0), np.nan)
+    return df
+
+def summarize(df, by):
+    g = df.groupby(by)
+    return pd.DataFrame({
+        'orders': g.size(),
+        'fill_rate_%': g['filled'].mean() * 100,
+        'accept_%': g['accepted'].mean() * 100,
+        'requote_%': g['requote'].mean() * 100,
+        'reject_%': g['rejected'].mean() * 100,
+        'error_%': g['error'].mean() * 100,
+        'slip_mean': g['slippage'].mean(),
+        'slip_p95': g['slippage'].quantile(0.95),
+        'lat_p50_ms': g['latency_ms'].quantile(0.5),
+        'lat_p95_ms': g['latency_ms'].quantile(0.95),
+        'lat_p99_ms': g['latency_ms'].quantile(0.99),
+    }).round(2)
+
+def recommend(df, current_deviation=20):
+    lines = []
+    deals = df[df['action'] == 1]
+    for symbol, part in deals.groupby('symbol'):
+        adverse = part['slippage'].dropna().clip(lower=0)
+        requote = part['requote'].mean() * 100
+        if len(adverse):
+            # Deviation cukup untuk menutup p95 slippage merugikan, ditambah 20% cadangan
+            suggested = max(1, math.ceil(adverse.quantile(0.95) * 1.2))
+            if requote > 5:
+                suggested = max(suggested, current_deviation + 10)
+            lines.append(f'{symbol}: DEVIATION saran {suggested} (sekarang {current_deviation}), requote {requote:.1f}%')
+        fills = part.groupby('filling_mode')['rejected'].mean() * 100
+        if len(fills) > 1:
+            best = fills.idxmin()
+            lines.append(f'{symbol}: filling mode dengan reject terendah {best} ({fills[best]:.1f}%)')
+        elif len(fills) == 1:
+            lines.append(f'{symbol}: hanya ada data filling {fills.index[0]} (reject {fills.iloc[0]:.1f}%)')
+    return lines
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Analitik kualitas eksekusi order')
+    parser.add_argument('path', nargs='?', default=STATS_FILE)
+    parser.add_argument('--deviation', type=int, default=20, help='DEVIATION yang dipakai sekarang')
+    args = parser.parse_args()
+
+    df = load(args.path)
+    if df.empty:
+        print(f'Belum ada data eksekusi di {args.path}')
+        quit()
+    pd.set_option('display.width', 200)
+    pd.set_option('display.max_columns', None)
+    print('=== Per simbol & tipe order ===')
+    print(summarize(df, ['symbol', 'order_type']))
+    print('\n=== Per jam ===')
+    print(summarize(df, ['symbol', 'hour']))
+    print('\n=== Rekomendasi ===')
+    for line in recommend(df, args.deviation):
+        print(line)
@@ -0,0 +1,69 @@
+import json
+import os
+
+# Konfigurasi hot-reload: file JSON berisi sebagian konstanta modul bot ({"TRAIL_START": 180}).
+# poll() dipanggil dari loop trading sendiri di antara siklus (bukan dari thread watcher),
+# jadi global modul hanya berubah saat loop tidak sedang memakainya. Jika file berubah, semua
+# nilai divalidasi dulu dan hanya diterapkan jika semuanya lolos (atomik). Hasilnya daftar key
+# yang berubah supaya bot cukup meng-invalidate cache terkait dan meneruskan nilai baru ke
+# thread lain lewat method-nya sendiri (mis. StopManager.configure), tanpa restart MT5.
+
+class HotConfig:
+    # schema: {'NAMA': (tipe, fn_cek(nilai) -> bool, 'keterangan')}
+    # check_all: fn(kandidat_dict) -> list pesan error untuk aturan antar-key
+    def __init__(self, path, namespace, schema, check_all=None):
+        self.path = path
+        self.namespace = namespace
+        self.schema = schema
+        self.check_all = check_all
+        self._stamp = None
+
+    def current(self):
+        return {key: self.namespace[key] for key in self.schema}
+
+    def _coerce(self, key, value):
+        kind, check, rule = self.schema[key]
+        if kind is float and isinstance(value, int) and not isinstance(value, bool):
+            value = float(value)
+        if not isinstance(value, kind) or isinstance(value, bool) and kind is not bool:
+            raise ValueError(f'{key}: harus {kind.__name__}, dapat {value!r}')
+        if check and not check(value):
+            raise ValueError(f'{key}: {value!r} tidak valid ({rule})')
+        return value
+
+    def poll(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return {}, []
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        if stamp == self._stamp:
+            return {}, []
+        self._stamp = stamp
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            return {}, [f'{self.path}: gagal dibaca ({e})']
+        if not isinstance(data, dict):
+            return {}, [f'{self.path}: isi harus object JSON']
+
+        errors = []
+        candidate = self.current()
+        for key, value in data.items():
+            if key not in self.schema:
+                errors.append(f'{key}: tidak dikenal atau tidak bisa diubah tanpa restart')
+                continue
+            try:
+                candidate[key] = self._coerce(key, value)
+            except ValueError as e:
+                errors.append(str(e))
+        if not errors and self.check_all:
+            errors.extend(self.check_all(candidate))
+        if errors:
+            return {}, errors
+
+        old = self.current()
+        changed = {key: (old[key], value) for key, value in candidate.items() if old[key] != value}
+        self.namespace.update({key: new for key, (_, new) in changed.items()})
+        return changed, []
@@ -0,0 +1,318 @@
+import itertools
+import threading
+import time
+import MetaTrader5 as mt5
+
+# Buku posisi & pending order lokal. Diperbarui dari hasil order_send kita sendiri
+# (on_result, dipasang di execution_stats.listeners) dan deal baru dari history (SL/TP kena,
+# close manual, pending terisi). Deal hanya diambil saat positions_total/orders_total berubah,
+# mulai dari waktu deal terakhir yang sudah dilihat (bukan jendela 12 jam tiap detik).
+# Pencocokan penuh dengan positions_get/orders_get hanya saat ada ketidakcocokan, plus
+# jaring pengaman berkala untuk perubahan yang tidak mengubah jumlah (mis. SL diubah manual).
+# Hitungan posisi dan volume per side / simbol / magic (dan kombinasinya) O(1).
+
+DEALS_INTERVAL = 1.0        # detik antar cek positions_total/orders_total
+RECONCILE_INTERVAL = 300.0  # detik antar pencocokan penuh pengaman
+DEAL_SLACK = 60             # detik mundur dari deal terakhir (deal dengan waktu sama / terlambat)
+FIRST_WINDOW = 86400        # detik history saat pertama kali (jam server bisa di depan jam lokal)
+OK_CODES = (mt5.TRADE_RETCODE_DONE, mt5.TRADE_RETCODE_DONE_PARTIAL, mt5.TRADE_RETCODE_PLACED)
+MISSING_CODES = (mt5.TRADE_RETCODE_POSITION_CLOSED, mt5.TRADE_RETCODE_INVALID_ORDER)
+
+def _keys(pos):
+    fields = (pos['type'], pos['symbol'], pos['magic'])
+    # Semua kombinasi (side, simbol, magic) dengan None sebagai wildcard: 8 kunci per posisi
+    return [tuple(f if use else None for f, use in zip(fields, mask))
+            for mask in itertools.product((False, True), repeat=3)]
+
+class PositionBook:
+    def __init__(self, symbol=None, magic=None, on_drift=None):
+        self.symbol = symbol
+        self.magic = magic
+        self.on_drift = on_drift
+        self.positions = {}
+        self.orders = {}
+        self.counts = {}
+        self.volumes = {}
+        self.suspect = False
+        self.drift_total = 0
+        self._seen_deals = {}
+        self._own_orders = {}     # order dari on_result: deal-nya tidak diproses ulang
+        self._synced_orders = {}  # order yang sudah diterapkan dari deal sebelum hasilnya datang
+        self._last_deal_time = 0
+        self._baseline = True
+        self._totals = None
+        self._last_deals = 0.0
+        self._last_reconcile = 0.0
+        self._lock = threading.RLock()
+
+    def _match(self, symbol, magic):
+        return (self.symbol is None or symbol == self.symbol) and (self.magic is None or magic == self.magic)
+
+    # --- INDEX ---
+    def _add(self, pos):
+        self.positions[pos['ticket']] = pos
+        for key in _keys(pos):
+            self.counts[key] = self.counts.get(key, 0) + 1
+            self.volumes[key] = self.volumes.get(key, 0.0) + pos['volume']
+
+    def _remove(self, ticket):
+        pos = self.positions.pop(ticket, None)
+        if pos is None:
+            return
+        for key in _keys(pos):
+            self.counts[key] -= 1
+            self.volumes[key] -= pos['volume']
+
+    def _reduce(self, ticket, volume):
+        pos = self.positions.get(ticket)
+        if pos is None:
+            self.suspect = True
+            return
+        if pos['volume'] - volume <= 1e-9:
+            self._remove(ticket)
+            return
+        pos['volume'] = round(pos['volume'] - volume, 8)
+        for key in _keys(pos):
+            self.volumes[key] -= volume
+
+    # --- QUERY (O(1)) ---
+    def count(self, side=None, symbol=None, magic=None):
+        with self._lock:
+            return self.counts.get((side, symbol, magic), 0)
+
+    def volume(self, side=None, symbol=None, magic=None):
+        with self._lock:
+            return round(self.volumes.get((side, symbol, magic), 0.0), 8)
+
+    def snapshot(self):
+        with self._lock:
+            return [dict(pos) for pos in self.positions.values()]
+
+    def pending(self):
+        with self._lock:
+            return [dict(order) for order in self.orders.values()]
+
+    # --- UPDATE DARI ORDER KITA ---
+    def on_result(self, request, result):
+        if not self._match(request.get('symbol'), request.get('magic', self.magic)):
+            return
+        with self._lock:
+            if result is None or result.retcode not in OK_CODES:
+                if result is not None and result.retcode in MISSING_CODES:
+                    self.suspect = True
+                return
+            if result.order in self._synced_orders:
+                # Deal-nya sudah lebih dulu diterapkan oleh sync_deals: cocokkan ulang saja
+                self.suspect = True
+                return
+            action = request['action']
+            # Hanya DEAL / CLOSE_BY yang deal-nya sudah diterapkan di sini. Deal pending yang terisi
+            # (deal.order = ticket pending) tetap diproses sync_deals
+            if action in (mt5.TRADE_ACTION_DEAL, mt5.TRADE_ACTION_CLOSE_BY):
+                self._own_orders[result.order] = time.time()
+            if action == mt5.TRADE_ACTION_DEAL:
+                if request.get('position'):
+                    self._reduce(request['position'], result.volume)
+                elif result.order:
+                    # Akun hedging: ticket posisi = ticket order pembuka
+                    self._add({
+                        'ticket': result.order,
+                        'type': request['type'],
+                        'price_open': result.price,
+                        'volume': result.volume,
+                        'sl': request.get('sl', 0.0),
+                        'tp': request.get('tp', 0.0),
+                        'symbol': request['symbol'],
+                        'magic': request.get('magic', 0),
+                    })
+                else:
+                    self.suspect = True
+            elif action == mt5.TRADE_ACTION_SLTP:
+                pos = self.positions.get(request.get('position'))
+                if pos is None:
+                    self.suspect = True
+                else:
+                    pos['sl'] = request.get('sl', pos['sl'])
+                    pos['tp'] = request.get('tp', pos['tp'])
+            elif action == mt5.TRADE_ACTION_CLOSE_BY:
+                first = self.positions.get(request.get('position'))
+                second = self.positions.get(request.get('position_by'))
+                if first is None or second is None:
+                    self.suspect = True
+                else:
+                    volume = min(first['volume'], second['volume'])
+                    self._reduce(first['ticket'], volume)
+                    self._reduce(second['ticket'], volume)
+            elif action == mt5.TRADE_ACTION_PENDING:
+                self.orders[result.order] = {
+                    'ticket': result.order,
+                    'type': request['type'],
+                    'price_open': request['price'],
+                    'volume': request['volume'],
+                    'sl': request.get('sl', 0.0),
+                    'tp': request.get('tp', 0.0),
+                    'symbol': request['symbol'],
+                    'magic': request.get('magic', 0),
+                }
+            elif action == mt5.TRADE_ACTION_MODIFY:
+                order = self.orders.get(request.get('order'))
+                if order is not None:
+                    order.update(price_open=request['price'], sl=request.get('sl', 0.0), tp=request.get('tp', 0.0))
+            elif action == mt5.TRADE_ACTION_REMOVE:
+                self.orders.pop(request.get('order'), None)
+
+    # --- UPDATE DARI DEAL BARU (SL/TP, close manual, pending terisi) ---
+    # Return jumlah deal baru yang terlihat (None jika terminal tidak menjawab)
+    def _fetch_deals(self):
+        # Waktu deal = jam server: batas bawah dari deal terakhir, batas atas jauh ke depan
+        now = int(time.time())
+        since = self._last_deal_time - DEAL_SLACK if self._last_deal_time else now - FIRST_WINDOW
+        return mt5.history_deals_get(since, now + FIRST_WINDOW)
+
+    def sync_deals(self):
+        deals = self._fetch_deals()
+        if deals is None:
+            return None
+        new = 0
+        with self._lock:
+            baseline = self._baseline
+            self._baseline = False
+            for deal in deals:
+                self._last_deal_time = max(self._last_deal_time, deal.time)
+                if deal.ticket in self._seen_deals:
+                    continue
+                self._seen_deals[deal.ticket] = deal.time
+                new += 1
+                if deal.order in self._own_orders:
+                    continue
+                # Pertama kali: deal lama hanya ditandai, posisi diambil dari reconcile
+                if baseline or deal.type > mt5.DEAL_TYPE_SELL or not self._match(deal.symbol, deal.magic):
+                    continue
+                self._synced_orders[deal.order] = time.time()
+                if deal.entry == mt5.DEAL_ENTRY_IN:
+                    order = self.orders.pop(deal.order, None)
+                    pos = self.positions.get(deal.position_id)
+                    if pos is None and order is not None:
+                        # Pending di buku terisi: SL/TP dibawa dari order
+                        self._add({
+                            'ticket': deal.position_id,
+                            'type': deal.type,
+                            'price_open': deal.price,
+                            'volume': deal.volume,
+                            'sl': order['sl'],
+                            'tp': order['tp'],
+                            'symbol': deal.symbol,
+                            'magic': deal.magic,
+                        })
+                    elif pos is None:
+                        self._add({
+                            'ticket': deal.position_id,
+                            'type': deal.type,
+                            'price_open': deal.price,
+                            'volume': deal.volume,
+                            'sl': 0.0,
+                            'tp': 0.0,
+                            'symbol': deal.symbol,
+                            'magic': deal.magic,
+                        })
+                        self.suspect = True  # SL/TP posisi dari pending belum diketahui
+                    else:
+                        pos['volume'] = round(pos['volume'] + deal.volume, 8)
+                        for key in _keys(pos):
+                            self.volumes[key] += deal.volume
+                elif deal.entry in (mt5.DEAL_ENTRY_OUT, mt5.DEAL_ENTRY_OUT_BY):
+                    self._reduce(deal.position_id, deal.volume)
+                else:
+                    self.suspect = True
+            # Buang ticket deal lama supaya set tidak tumbuh terus
+            cutoff = self._last_deal_time - 2 * DEAL_SLACK
+            self._seen_deals = {t: v for t, v in self._seen_deals.items() if v >= cutoff}
+            horizon = time.time() - RECONCILE_INTERVAL * 2
+            self._own_orders = {t: v for t, v in self._own_orders.items() if v >= horizon}
+            self._synced_orders = {t: v for t, v in self._synced_orders.items() if v >= horizon}
+        return new
+
+    # --- RECONCILE ---
+    # Snapshot diapit dua pengambilan deal: deal sebelum snapshot sudah tercermin di snapshot dan
+    # ditandai terlihat (tidak diterapkan ulang oleh sync_deals); deal yang muncul selama snapshot
+    # tidak pasti ikut, jadi buku tetap suspect dan dicocokkan lagi di update berikutnya
+    def reconcile(self, report=True):
+        with self._lock:
+            return self._reconcile(report)
+
+    def _reconcile(self, report):
+        before = self._fetch_deals()
+        positions = mt5.positions_get(symbol=self.symbol) if self.symbol else mt5.positions_get()
+        orders = mt5.orders_get(symbol=self.symbol) if self.symbol else mt5.orders_get()
+        after = self._fetch_deals()
+        if positions is None or orders is None or before is None or after is None:
+            return None
+        actual = {}
+        for p in positions:
+            if self._match(p.symbol, p.magic):
+                actual[p.ticket] = {'ticket': p.ticket, 'type': p.type, 'price_open': p.price_open,
+                                    'volume': p.volume, 'sl': p.sl, 'tp': p.tp,
+                                    'symbol': p.symbol, 'magic': p.magic}
+        actual_orders = {}
+        for o in orders:
+            if self._match(o.symbol, o.magic):
+                actual_orders[o.ticket] = {'ticket': o.ticket, 'type': o.type, 'price_open': o.price_open,
+                                           'volume': o.volume_current, 'sl': o.sl, 'tp': o.tp,
+                                           'symbol': o.symbol, 'magic': o.magic}
+        with self._lock:
+            drift = []
+            for ticket in actual.keys() - self.positions.keys():
+                drift.append(('posisi_hilang_di_buku', ticket))
+            for ticket in self.positions.keys() - actual.keys():
+                drift.append(('posisi_sudah_tutup', ticket))
+            for ticket in actual.keys() & self.positions.keys():
+                mine, real = self.positions[ticket], actual[ticket]
+                if abs(mine['volume'] - real['volume']) > 1e-9:
+                    drift.append(('volume_beda', ticket, mine['volume'], real['volume']))
+                elif mine['sl'] != real['sl'] or mine['tp'] != real['tp']:
+                    drift.append(('sltp_beda', ticket))
+            for ticket in actual_orders.keys() ^ self.orders.keys():
+                drift.append(('pending_beda', ticket))
+            self.positions = {}
+            self.counts = {}
+            self.volumes = {}
+            for pos in actual.values():
+                self._add(pos)
+            self.orders = actual_orders
+            for deal in before:
+                self._last_deal_time = max(self._last_deal_time, deal.time)
+                self._seen_deals[deal.ticket] = deal.time
+            self.suspect = any(deal.ticket not in self._seen_deals for deal in after)
+            if report:
+                self.drift_total += len(drift)
+        self._last_reconcile = time.monotonic()
+        if drift and report and self.on_drift:
+            self.on_drift(drift)
+        return drift
+
+    def _terminal_totals(self):
+        return mt5.positions_total(), mt5.orders_total()
+
+    def start(self):
+        # Isi awal dari terminal, bukan dianggap drift
+        with self._lock:
+            self._totals = self._terminal_totals()
+            self.sync_deals()
+            self.reconcile(report=False)
+
+    # Dipanggil dari loop utama dan thread StopManager: seluruhnya di bawah lock supaya deal yang
+    # sama tidak diterapkan dua kali dan reconcile tidak berjalan bersamaan
+    def update(self):
+        with self._lock:
+            now = time.monotonic()
+            if now - self._last_deals >= DEALS_INTERVAL:
+                self._last_deals = now
+                totals = self._terminal_totals()
+                if totals != self._totals:
+                    self._totals = totals
+                    # Jumlah berubah tapi tidak ada deal baru (pending dipasang/expired, dsb.): cocokkan penuh
+                    if not self.sync_deals():
+                        self.suspect = True
+            if self.suspect or now - self._last_reconcile >= RECONCILE_INTERVAL:
+                return self.reconcile()
+            return None
@@ -0,0 +1,84 @@
+import os
+import signal
+import sys
+import threading
+import time
+from datetime import datetime
+
+# Sampling profiler on-demand untuk bot yang sedang jalan.
+# - Nyalakan dengan membuat file kontrol (isi: durasi detik) atau kirim sinyal
+#   SIGUSR1 (Linux) / Ctrl+Break (Windows).
+# - Saat mati tidak ada thread yang jalan; stage() hanya menyimpan nama tahap loop.
+# - Hasil ditulis dalam format collapsed stack (flame graph): "thread;stage;frame;... jumlah".
+
+CONTROL_FILE = 'profile.ctl'
+DEFAULT_DURATION = 30      # detik
+SAMPLE_INTERVAL = 0.01     # detik antar sampel (100 Hz)
+
+_stages = {}
+_sampler = None
+
+# --- STAGE TAGGING ---
+def stage(name):
+    _stages[threading.get_ident()] = name
+
+# --- SAMPLER ---
+def _collapse(frame):
+    parts = []
+    while frame is not None:
+        code = frame.f_code
+        parts.append(f'{os.path.basename(code.co_filename)}:{code.co_name}')
+        frame = frame.f_back
+    return ';'.join(reversed(parts))
+
+def _sample(duration, output):
+    global _sampler
+    own = threading.get_ident()
+    names = {}
+    counts = {}
+    samples = 0
+    end = time.monotonic() + duration
+    while time.monotonic() < end:
+        if len(names) != threading.active_count():
+            names = {t.ident: t.name for t in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == own:
+                continue
+            key = f"{names.get(ident, ident)};{_stages.get(ident, 'other')};{_collapse(frame)}"
+            counts[key] = counts.get(key, 0) + 1
+        samples += 1
+        time.sleep(SAMPLE_INTERVAL)
+    with open(output, 'w') as f:
+        for key, n in sorted(counts.items(), key=lambda kv: -kv[1]):
+            f.write(f'{key} {n}\n')
+    print(f'Profil {samples} sampel ditulis ke {output}')
+    _sampler = None
+
+def start(duration=DEFAULT_DURATION, output=None):
+    global _sampler
+    if _sampler is not None:
+        return False
+    output = output or f"profile-{datetime.now().strftime('%Y%m%d-%H%M%S')}.folded"
+    _sampler = threading.Thread(target=_sample, args=(duration, output), name='profiler', daemon=True)
+    _sampler.start()
+    return True
+
+# --- TRIGGERS ---
+# Dipanggil sekali per siklus loop: satu stat file, tanpa thread tambahan
+def poll():
+    if not os.path.exists(CONTROL_FILE):
+        return
+    try:
+        with open(CONTROL_FILE) as f:
+            text = f.read().strip()
+        os.remove(CONTROL_FILE)
+        duration = float(text) if text else DEFAULT_DURATION
+    except (OSError, ValueError):
+        duration = DEFAULT_DURATION
+    start(duration)
+
+def install_signal():
+    signum = getattr(signal, 'SIGUSR1', None) or getattr(signal, 'SIGBREAK', None)
+    if signum is None:
+        return
+    signal.signal(signum, lambda *_: start())
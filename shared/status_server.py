@@ -0,0 +1,95 @@
+import json
+import os
+import socket
+import socketserver
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Endpoint status lokal read-only. Bot mem-publish state (sinyal terakhir, posisi, drawdown,
+# waktu siklus) ke sini; JSON langsung di-encode saat publish dan disimpan sebagai bytes,
+# jadi request hanya mengirim cache tanpa panggilan ke terminal MT5.
+#   curl http://127.0.0.1:8765/            -> semua section
+#   curl http://127.0.0.1:8765/positions   -> satu section
+#   curl --unix-socket bot.sock http://x/  -> mode Unix socket (jika OS mendukung AF_UNIX,
+#                                             selain itu kembali ke TCP localhost)
+
+HOST = '127.0.0.1'
+PORT = 8765
+
+_sections = {}
+_updated = {}
+_body = b'{}'
+_lock = threading.Lock()
+_server = None
+_started = time.time()
+
+def _default(value):
+    if hasattr(value, 'item'):  # skalar numpy
+        return value.item()
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    return str(value)
+
+def publish(name, value):
+    global _body
+    encoded = json.dumps(value, default=_default).encode()
+    with _lock:
+        _sections[name] = encoded
+        _updated[name] = time.time()
+        meta = json.dumps({'started': _started, 'updated': _updated}).encode()
+        parts = [b'"_meta":' + meta] + [json.dumps(k).encode() + b':' + v for k, v in _sections.items()]
+        _body = b'{' + b','.join(parts) + b'}'
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        name = self.path.strip('/')
+        if not name:
+            body = _body
+        else:
+            body = _sections.get(name)
+        if body is None:
+            self.send_response(404)
+            body = json.dumps({'error': f'section {name} tidak ada', 'sections': list(_sections)}).encode()
+        else:
+            self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+class _UnixHandler(_Handler):
+    def address_string(self):
+        return 'unix'
+
+# Kelas server Unix dibuat saat dipakai saja: socketserver.UnixStreamServer tidak ada di Windows
+def _unix_server(unix_path):
+    class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+    if os.path.exists(unix_path):
+        os.remove(unix_path)
+    return UnixHTTPServer(unix_path, _UnixHandler)
+
+def start(port=PORT, host=HOST, unix_path=None):
+    global _server
+    if _server is not None:
+        return
+    if unix_path and hasattr(socket, 'AF_UNIX') and hasattr(socketserver, 'UnixStreamServer'):
+        _server = _unix_server(unix_path)
+    else:
+        _server = ThreadingHTTPServer((host, port), _Handler)
+        _server.daemon_threads = True
+    threading.Thread(target=_server.serve_forever, name='status-server', daemon=True).start()
+
+def stop():
+    global _server
+    if _server is None:
+        return
+    _server.shutdown()
+    _server.server_close()
+    _server = None
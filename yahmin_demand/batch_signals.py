@@ -0,0 +1,99 @@
+import numpy as np
+
+# Perhitungan sinyal HA / RSI / Fibonacci / ATR untuk banyak simbol sekaligus.
+# Input array 2-D (simbol x bar), semua indikator dihitung dalam satu pass vektor
+# sehingga biaya scan 100+ simbol hampir sama dengan 1 simbol.
+# Hasilnya identik dengan generate_heikin_ashi, hitung_rsi, hitung_fibonacci_levels
+# dan hitung_atr di bot.py.
+
+BUY = 1
+SELL = -1
+NAMES = {BUY: 'BUY', SELL: 'SELL', 0: None}
+
+def stack_rates(rates_list, count):
+    ohlc = np.empty((4, len(rates_list), count))
+    for i, rates in enumerate(rates_list):
+        tail = rates[-count:]
+        ohlc[0, i] = tail['open']
+        ohlc[1, i] = tail['high']
+        ohlc[2, i] = tail['low']
+        ohlc[3, i] = tail['close']
+    return ohlc
+
+# --- HEIKIN ASHI ---
+def heikin_ashi_signal(open_, high, low, close):
+    ha_close = (open_ + high + low + close) / 4
+    ha_open = np.empty_like(ha_close)
+    ha_open[:, 0] = (open_[:, 0] + close[:, 0]) / 2
+    for i in range(1, ha_close.shape[1]):
+        ha_open[:, i] = (ha_open[:, i - 1] + ha_close[:, i - 1]) / 2
+    prev_bullish = ha_close[:, -2] > ha_open[:, -2]
+    curr_bullish = ha_close[:, -1] > ha_open[:, -1]
+    return np.where(~prev_bullish & curr_bullish, BUY, np.where(prev_bullish & ~curr_bullish, SELL, 0))
+
+# --- RSI (rolling mean seperti hitung_rsi) ---
+def rolling_mean(values, window):
+    csum = np.cumsum(values, axis=1)
+    out = np.full(values.shape, np.nan)
+    out[:, window - 1] = csum[:, window - 1] / window
+    out[:, window:] = (csum[:, window:] - csum[:, :-window]) / window
+    return out
+
+def rsi_last(close, period=7):
+    delta = np.diff(close, axis=1)
+    delta = np.concatenate([np.zeros((close.shape[0], 1)), delta], axis=1)
+    avg_gain = rolling_mean(np.where(delta > 0, delta, 0.0), period)
+    avg_loss = rolling_mean(np.where(delta < 0, -delta, 0.0), period)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rsi = 100 - (100 / (1 + avg_gain / avg_loss))
+    # Sama dengan rsi_series.dropna().iloc[-1]: ambil nilai valid terakhir per simbol
+    valid = ~np.isnan(rsi)
+    last = rsi.shape[1] - 1 - np.argmax(valid[:, ::-1], axis=1)
+    out = rsi[np.arange(rsi.shape[0]), last]
+    out[~valid.any(axis=1)] = np.nan
+    return out
+
+# --- ATR (rolling mean seperti hitung_atr) ---
+def atr_last(high, low, close, period=14):
+    prev_close = np.concatenate([np.full((close.shape[0], 1), np.nan), close[:, :-1]], axis=1)
+    tr = np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+    return tr[:, -period:].mean(axis=1)
+
+# --- FIBONACCI ---
+def fibonacci_signal(high, low, close):
+    swing_high = high.max(axis=1)
+    swing_low = low.min(axis=1)
+    price = close[:, -1]
+    rng = swing_high - swing_low
+    buy_50 = swing_low + rng * 0.5
+    buy_618 = swing_low + rng * 0.618
+    sell_50 = swing_high - rng * 0.5
+    sell_618 = swing_high - rng * 0.618
+    has_range = swing_high != swing_low
+    buy = has_range & (buy_50 <= price) & (price <= buy_618)
+    sell = has_range & ~buy & (sell_50 >= price) & (price >= sell_618)
+    signal = np.where(buy, BUY, np.where(sell, SELL, 0))
+    fib_50 = np.where(buy, buy_50, sell_50)
+    fib_618 = np.where(buy, buy_618, sell_618)
+    return signal, fib_50, fib_618
+
+# --- BATCH ---
+# ohlc: array (4, simbol, bar) dari BarStore.ohlc atau stack_rates, bar terakhir = candle terbaru
+def compute_signals(ohlc, rsi_bars=50, rsi_period=7, atr_period=14, rsi_buy=40, rsi_sell=60):
+    open_, high, low, close = ohlc
+    ha = heikin_ashi_signal(open_, high, low, close)
+    rsi = rsi_last(close[:, -rsi_bars:], rsi_period)
+    rsi_signal = np.where(rsi < rsi_buy, BUY, np.where(rsi > rsi_sell, SELL, 0))
+    fibo, fib_50, fib_618 = fibonacci_signal(high[:, -rsi_bars:], low[:, -rsi_bars:], close[:, -rsi_bars:])
+    # Prioritas sama dengan run_bot: sinyal_ha or sinyal_rsi or sinyal_fibo
+    signal = np.where(ha != 0, ha, np.where(rsi_signal != 0, rsi_signal, fibo))
+    return {
+        'signal': signal,
+        'ha': ha,
+        'rsi': rsi,
+        'rsi_signal': rsi_signal,
+        'fibo': fibo,
+        'fib_50': fib_50,
+        'fib_618': fib_618,
+        'atr': atr_last(high, low, close, atr_period),
+    }
@@ -4,13 +4,62 @@ from datetime import datetime
 import time
 from dotenv import load_dotenv
 import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'shared'))
+from correlation_guard import CorrelationGuard
+from batch_signals import compute_signals, NAMES
+import profiler
+from bar_store import BarStore
+import status_server
+from hot_config import HotConfig
+from fanout import FanOut, load_accounts
+import netting
 
 load_dotenv()
 
 SYMBOLS = ["XAUUSDm", "EURUSDm", "USDJPYm", "EURJPYm", "GBPJPYm"]
 lot = 0.01
 jumlah_candle = 100
+jumlah_candle_m15 = 50
 FORCE_ENTRY = False
+MAGIC = 123456
+MAX_CORRELATED_LOTS = 0.03
+MIN_CORRELATION = 0.5
+RSI_BUY = 40.0   # RSI di bawah ini = sinyal BUY
+RSI_SELL = 60.0  # RSI di atas ini = sinyal SELL
+# Pasangan BUY/SELL simbol yang sama ditutup satu sama lain (close by) setelah scan, lihat tutup_hedge
+NET_HEDGED = True
+CONFIG_FILE = 'yahmin_config.json'  # override konstanta di atas, dibaca ulang setiap siklus
+FANOUT_ACCOUNTS = os.getenv('FANOUT_ACCOUNTS', '')  # akun tambahan yang mengikuti sinyal, lihat fanout.py
+STATUS_PORT = 8766  # endpoint status lokal (127.0.0.1), None = nonaktif
+
+bars_m15 = BarStore(SYMBOLS, mt5.TIMEFRAME_M15, jumlah_candle)
+guard = CorrelationGuard(SYMBOLS, span=jumlah_candle, max_exposure=MAX_CORRELATED_LOTS, min_corr=MIN_CORRELATION)
+fanout = FanOut(load_accounts(FANOUT_ACCOUNTS)) if FANOUT_ACCOUNTS else None
+
+# Konstanta yang boleh diubah tanpa restart: (tipe, cek, keterangan)
+CONFIG_SCHEMA = {
+    'SYMBOLS': (list, lambda v: len(v) > 0 and all(isinstance(s, str) and s for s in v), 'list simbol, tidak kosong'),
+    'lot': (float, lambda v: 0 < v <= 10, '0-10 lot'),
+    'jumlah_candle': (int, lambda v: 30 <= v <= 5000, '30-5000'),
+    'jumlah_candle_m15': (int, lambda v: 10 <= v <= 5000, '10-5000'),
+    'RSI_BUY': (float, lambda v: 0 < v < 100, '0-100'),
+    'RSI_SELL': (float, lambda v: 0 < v < 100, '0-100'),
+    'FORCE_ENTRY': (bool, None, 'true/false'),
+    'MAX_CORRELATED_LOTS': (float, lambda v: v >= 0, '>= 0'),
+    'MIN_CORRELATION': (float, lambda v: 0 <= v <= 1, '0-1'),
+    'NET_HEDGED': (bool, None, 'true/false'),
+}
+
+def check_config(values):
+    errors = []
+    if values['RSI_BUY'] >= values['RSI_SELL']:
+        errors.append('RSI_BUY harus lebih kecil dari RSI_SELL')
+    if values['jumlah_candle_m15'] > values['jumlah_candle']:
+        errors.append('jumlah_candle_m15 tidak boleh lebih dari jumlah_candle')
+    return errors
+
+config = HotConfig(CONFIG_FILE, globals(), CONFIG_SCHEMA, check_config)
 
 def connect():
     akun = int(os.getenv('LOGIN'))
@@ -24,6 +73,42 @@ def connect():
     print(f"Login MT5 berhasil ({akun})")
     return True
 
+def isi_awal_korelasi():
+    history = {}
+    for symbol in SYMBOLS:
+        rates = mt5.copy_rates_from_pos(symbol, mt5.TIMEFRAME_M15, 1, jumlah_candle * 3)
+        if rates is not None and len(rates) > 0:
+            history[symbol] = (rates['time'], rates['close'])
+    guard.warm_up(history)
+    print(f"Korelasi awal dihitung dari {guard.bars} bar")
+
+def exposure_terbuka():
+    exposure = {}
+    for pos in mt5.positions_get() or []:
+        if pos.magic != MAGIC:
+            continue
+        lots = pos.volume if pos.type == mt5.ORDER_TYPE_BUY else -pos.volume
+        exposure[pos.symbol] = exposure.get(pos.symbol, 0.0) + lots
+    return exposure
+
+# Sinyal berlawanan bisa membuka BUY dan SELL di simbol yang sama; net lot-nya sudah dihitung
+# exposure_terbuka, jadi pasangan itu hanya menahan margin dan swap. Yang ditutup hanya pasangan
+# dengan total profit + swap >= 0, sisanya dibiarkan berjalan ke SL/TP masing-masing.
+# Akun fanout tidak ikut: posisinya ditutup SL/TP sendiri.
+def pasangan_untung(buy, sell):
+    return buy.profit + buy.swap + sell.profit + sell.swap >= 0
+
+def tutup_hedge():
+    sisi = {}
+    for pos in netting.snapshot(magic=MAGIC):
+        sisi.setdefault(pos.symbol, set()).add(pos.type)
+    for symbol, tipe in sisi.items():
+        if len(tipe) < 2:
+            continue
+        laporan = netting.net_positions(symbol, MAGIC, select=pasangan_untung)
+        if laporan['pairs'] or laporan['error'] or laporan['failures']:
+            print(f"{symbol} | {netting.format_report(laporan)}")
+
 def hitung_fibonacci_levels(swing_high, swing_low, trend):
     fib_levels = {}
     if swing_high == swing_low:
@@ -129,6 +214,12 @@ def kirim_order(symbol, sinyal, price, sl, tp):
         print(f"{symbol} | SL/TP terlalu dekat. Jarak minimal: {min_distance:.5f}")
         return
 
+    exposure = exposure_terbuka()
+    status_server.publish('exposure', exposure)
+    if not guard.allows(symbol, sinyal, volume, exposure):
+        print(f"{symbol} | Entry {sinyal} dibatalkan, exposure berkorelasi melebihi {MAX_CORRELATED_LOTS} lot")
+        return
+
     order_type = mt5.ORDER_TYPE_BUY if sinyal == "BUY" else mt5.ORDER_TYPE_SELL
     request = {
         "action": mt5.TRADE_ACTION_DEAL,
@@ -139,19 +230,26 @@ def kirim_order(symbol, sinyal, price, sl, tp):
         "sl": sl,
         "tp": tp,
         "deviation": 20,
-        "magic": 123456,
+        "magic": MAGIC,
         "comment": "TrendCatcherBot",
         "type_time": mt5.ORDER_TIME_GTC,
         "type_filling": mt5.ORDER_FILLING_IOC,
     }
 
+    profiler.stage('order_send')
     result = mt5.order_send(request)
-    if result.retcode != mt5.TRADE_RETCODE_DONE:
-        print(f"{symbol} | Gagal kirim order: {result.retcode} | {result.comment}")
-    else:
-        print(f"{symbol} | Entry {sinyal} @ {price:.2f} | SL: {sl:.2f} | TP: {tp:.2f}")
+    profiler.stage('entry')
+    if result is None or result.retcode != mt5.TRADE_RETCODE_DONE:
+        detail = f"{result.retcode} | {result.comment}" if result is not None else mt5.last_error()
+        print(f"{symbol} | Gagal kirim order: {detail}")
+        return
+    print(f"{symbol} | Entry {sinyal} @ {price:.2f} | SL: {sl:.2f} | TP: {tp:.2f}")
+    # Akun lain hanya mengikuti order akun utama yang terisi (bukan intent yang mungkin ditolak)
+    if fanout:
+        fanout.submit(symbol, sinyal, lot, sl, tp, MAGIC, request['comment'])
 
 def run_bot(symbol):
+    profiler.stage('data_fetch')
     rates_m30 = mt5.copy_rates_from_pos(symbol, mt5.TIMEFRAME_M15, 0, jumlah_candle)
     if rates_m30 is None or len(rates_m30) == 0:
         print(f"{symbol} | Data M30 kosong")
@@ -161,18 +259,21 @@ def run_bot(symbol):
     ha_df = generate_heikin_ashi(df_m30)
     sinyal_ha = detect_heikin_ashi_signal(ha_df)
     ha_valid = sinyal_ha is not None
-    candles_m15 = mt5.copy_rates_from_pos(symbol, mt5.TIMEFRAME_M15, 0, 50)
+    candles_m15 = mt5.copy_rates_from_pos(symbol, mt5.TIMEFRAME_M15, 0, jumlah_candle_m15)
     if candles_m15 is None or len(candles_m15) == 0:
         print(f"{symbol} | Data M15 kosong")
         return
+    if len(candles_m15) >= 2:
+        guard.update(symbol, candles_m15['time'][-2], candles_m15['close'][-2])
+    profiler.stage('indicators')
     df_m15 = pd.DataFrame(candles_m15)
     df_m15['time'] = pd.to_datetime(df_m15['time'], unit='s')
     rsi_series = hitung_rsi(df_m15)
     latest_rsi = rsi_series.dropna().iloc[-1]
     sinyal_rsi = None
-    if latest_rsi < 40:
+    if latest_rsi < RSI_BUY:
         sinyal_rsi = "BUY"
-    elif latest_rsi > 60:
+    elif latest_rsi > RSI_SELL:
         sinyal_rsi = "SELL"
     rsi_valid = sinyal_rsi is not None
     fibo_levels = {}
@@ -194,12 +295,16 @@ def run_bot(symbol):
                 fibo_levels = fibo
                 break
     sinyal = sinyal_ha or sinyal_rsi or sinyal_fibo
+    valid = ha_valid or rsi_valid or fibo_valid
+    profiler.stage('entry')
+    eksekusi_sinyal(symbol, sinyal, valid, latest_rsi, fibo_levels, hitung_atr(df_m30))
+
+def eksekusi_sinyal(symbol, sinyal, valid, latest_rsi, fibo_levels, atr):
     if not sinyal and FORCE_ENTRY:
         sinyal = "BUY"
     if not sinyal and not FORCE_ENTRY:
         print(f"{symbol} | Tidak ada sinyal")
         return
-    atr = hitung_atr(df_m30)
     tick = mt5.symbol_info_tick(symbol)
     if not tick:
         print(f"{symbol} | Gagal ambil harga")
@@ -212,18 +317,97 @@ def run_bot(symbol):
         print(f"RSI: {latest_rsi:.2f} | Fibo: {fibo_levels['0.5']:.2f} - {fibo_levels['0.618']:.2f}")
     else:
         print(f"RSI: {latest_rsi:.2f} | Fibo: Tidak valid")
-    if ha_valid or rsi_valid or fibo_valid or FORCE_ENTRY:
+    if valid or FORCE_ENTRY:
         kirim_order(symbol, sinyal, price, sl, tp)
     else:
         print(f"{symbol} | Tidak ada konfirmasi valid")
 
+# Scan semua simbol sekaligus: OHLC dari ring buffer sudah berupa array (simbol x bar)
+# dan semua indikator + voting sinyal dihitung dalam satu pass vektor
+def scan_batch(symbols):
+    siap = []
+    for symbol in symbols:
+        profiler.stage('data_fetch')
+        i = bars_m15.index[symbol]
+        if not bars_m15.sync(symbol) or bars_m15.filled[i] < jumlah_candle:
+            print(f"Mengecek: {symbol}")
+            run_bot(symbol)
+            continue
+        closed = bars_m15.bar(symbol, 2)
+        guard.update(symbol, closed['time'], closed['close'])
+        siap.append(symbol)
+    if not siap:
+        return
+    profiler.stage('indicators')
+    ohlc = bars_m15.ohlc(jumlah_candle, siap)
+    hasil = compute_signals(ohlc, rsi_bars=jumlah_candle_m15, rsi_buy=RSI_BUY, rsi_sell=RSI_SELL)
+    status_server.publish('signals', {symbol: {
+        'time': datetime.now(),
+        'signal': NAMES[int(hasil['signal'][i])],
+        'ha': NAMES[int(hasil['ha'][i])],
+        'rsi': hasil['rsi'][i],
+        'fibo': NAMES[int(hasil['fibo'][i])],
+        'atr': hasil['atr'][i],
+    } for i, symbol in enumerate(siap)})
+    profiler.stage('entry')
+    for i, symbol in enumerate(siap):
+        print(f"Mengecek: {symbol}")
+        sinyal = NAMES[int(hasil['signal'][i])]
+        fibo_levels = {}
+        if hasil['fibo'][i]:
+            fibo_levels = {'0.5': hasil['fib_50'][i], '0.618': hasil['fib_618'][i]}
+        eksekusi_sinyal(symbol, sinyal, sinyal is not None, hasil['rsi'][i], fibo_levels, hasil['atr'][i])
+
+# Dipanggil di awal tiap siklus dari loop utama (satu-satunya thread yang memakai global ini)
+def reload_config():
+    global bars_m15, guard
+    changed, errors = config.poll()
+    if errors:
+        print(f"Config {CONFIG_FILE} ditolak, tetap pakai nilai lama: {'; '.join(errors)}")
+        return
+    if not changed:
+        return
+    print(f"Config diperbarui: {', '.join(f'{k} {old} -> {new}' for k, (old, new) in changed.items())}")
+    if 'SYMBOLS' in changed or 'jumlah_candle' in changed:
+        # Ukuran ring buffer dan matriks korelasi ikut berubah: dibuat ulang lalu diisi dari terminal
+        for symbol in SYMBOLS:
+            mt5.symbol_select(symbol, True)
+        bars_m15 = BarStore(SYMBOLS, mt5.TIMEFRAME_M15, jumlah_candle)
+        guard = CorrelationGuard(SYMBOLS, span=jumlah_candle, max_exposure=MAX_CORRELATED_LOTS,
+                                 min_corr=MIN_CORRELATION)
+        isi_awal_korelasi()
+    else:
+        guard.max_exposure = MAX_CORRELATED_LOTS
+        guard.min_corr = MIN_CORRELATION
+
 if __name__ == "__main__":
     if not connect():
         exit()
+    isi_awal_korelasi()
+    profiler.install_signal()
+    if fanout:
+        fanout.start()
+    if STATUS_PORT:
+        status_server.start(STATUS_PORT)
+    siklus = 0
     while True:
         print(f"{datetime.now().strftime('%Y-%m-%d %H:%M:%S')} | Menjalankan bot...")
-        for symbol in SYMBOLS:
-            print(f"Mengecek: {symbol}")
-            run_bot(symbol)
+        mulai = time.perf_counter()
+        reload_config()
+        scan_batch(SYMBOLS)
+        if NET_HEDGED:
+            profiler.stage('netting')
+            tutup_hedge()
+        if fanout:
+            for laporan in fanout.poll(timeout=2.0):
+                status = 'OK' if laporan['retcode'] == mt5.TRADE_RETCODE_DONE else 'GAGAL'
+                print(f"[{laporan['account']}] {laporan.get('symbol', '')} {laporan.get('side', '')} {status} "
+                      f"{laporan['retcode']} | {laporan['comment']} | vol {laporan.get('volume', 0)} "
+                      f"| {laporan.get('attempts', 0)}x | {laporan.get('latency_ms', 0):.0f} ms")
+        siklus += 1
+        status_server.publish('cycle', {'count': siklus, 'last_ms': (time.perf_counter() - mulai) * 1000,
+                                        'finished': datetime.now()})
         print("Menunggu 15 menit...\n")
+        profiler.stage('sleep')
+        profiler.poll()
         time.sleep(900)
\ No newline at end of file
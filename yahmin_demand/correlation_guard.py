@@ -0,0 +1,90 @@
+import numpy as np
+
+# Penjaga korelasi portofolio: matriks kovarian/korelasi return antar simbol
+# diperbarui secara inkremental (EWMA) setiap bar close, bukan dihitung ulang dari DataFrame.
+# Tiap simbol cukup menulis 1 elemen return (O(1)); saat bar lengkap, update rank-1
+# matriks k x k dilakukan sekali, yaitu O(k^2) per bar (k = jumlah simbol, kecil).
+# Simbol yang tidak punya bar baru di waktu itu dilewati: mean, varians dan kovariannya
+# tidak diubah, bukan dianggap return 0 (yang menekan varians/korelasi ke bawah).
+
+class CorrelationGuard:
+    def __init__(self, symbols, span=100, max_exposure=0.03, min_corr=0.5):
+        self.symbols = list(symbols)
+        self.index = {s: i for i, s in enumerate(self.symbols)}
+        k = len(self.symbols)
+        self.alpha = 2 / (span + 1)
+        self.max_exposure = max_exposure  # batas net exposure berkorelasi (lot)
+        self.min_corr = min_corr
+        self.mean = np.zeros(k)
+        self.cov = np.zeros((k, k))
+        self.bars = 0
+        self.last_close = np.full(k, np.nan)
+        self.last_time = np.full(k, -1, dtype=np.int64)
+        self.pending = np.zeros(k)
+        self.printed = np.zeros(k, dtype=bool)
+        self.pending_time = None
+
+    # --- UPDATE ---
+    def update(self, symbol, bar_time, close):
+        i = self.index[symbol]
+        bar_time = int(bar_time)
+        if bar_time <= self.last_time[i]:
+            return
+        if self.pending_time is not None and bar_time > self.pending_time:
+            self._commit()
+        if not np.isnan(self.last_close[i]) and self.last_close[i] > 0:
+            self.pending[i] = np.log(close / self.last_close[i])
+            self.printed[i] = True
+            self.pending_time = bar_time if self.pending_time is None else max(self.pending_time, bar_time)
+        self.last_close[i] = close
+        self.last_time[i] = bar_time
+
+    def _commit(self):
+        m = np.flatnonzero(self.printed)
+        diff = self.pending[m] - self.mean[m]
+        self.mean[m] += self.alpha * diff
+        block = np.ix_(m, m)
+        self.cov[block] = (1 - self.alpha) * (self.cov[block] + self.alpha * np.outer(diff, diff))
+        self.bars += 1
+        self.pending = np.zeros(len(self.symbols))
+        self.printed[:] = False
+        self.pending_time = None
+
+    # Isi awal dari histori bar close: {symbol: (times, closes)} diurutkan per waktu
+    def warm_up(self, history):
+        events = []
+        for symbol, (times, closes) in history.items():
+            events.extend(zip(times, [symbol] * len(times), closes))
+        events.sort(key=lambda e: e[0])
+        for bar_time, symbol, close in events:
+            self.update(symbol, bar_time, close)
+        if self.pending_time is not None:
+            self._commit()
+
+    # --- QUERY ---
+    def correlation(self):
+        std = np.sqrt(np.diag(self.cov))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            corr = self.cov / np.outer(std, std)
+        return np.nan_to_num(corr)
+
+    def correlated_exposure(self, symbol, exposure):
+        i = self.index[symbol]
+        corr = self.correlation()[i]
+        weight = np.where(np.abs(corr) >= self.min_corr, corr, 0.0)
+        weight[i] = 1.0
+        return float(weight @ exposure)
+
+    # exposure: dict simbol -> lot bertanda (+buy / -sell) posisi yang sudah terbuka
+    def allows(self, symbol, direction, volume, exposure):
+        if symbol not in self.index:
+            return True
+        vec = np.zeros(len(self.symbols))
+        for s, lots in exposure.items():
+            if s in self.index:
+                vec[self.index[s]] += lots
+        before = self.correlated_exposure(symbol, vec)
+        vec[self.index[symbol]] += volume if direction == 'BUY' else -volume
+        after = self.correlated_exposure(symbol, vec)
+        # Entry yang mengurangi exposure (hedge) selalu diizinkan
+        return abs(after) <= self.max_exposure or abs(after) < abs(before)
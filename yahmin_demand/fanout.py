@@ -0,0 +1,146 @@
+import multiprocessing
+import os
+import queue
+import time
+import MetaTrader5 as mt5
+
+# Fan-out sinyal ke banyak akun. Proses utama menghitung sinyal sekali lalu, setelah order akun
+# utama terisi (retcode DONE), meneruskan order intent ke proses executor per akun. Tiap executor
+# punya koneksi terminal sendiri (satu proses Python hanya bisa terhubung ke satu terminal MT5),
+# menskalakan lot sesuai akun dan mengulang order yang gagal karena requote dengan harga terbaru.
+# Semua executor menerima intent bersamaan: akun lain tertinggal satu round-trip order akun
+# utama, berapa pun jumlah akunnya.
+#
+# Konfigurasi di .env:
+#   FANOUT_ACCOUNTS=AKUN2,AKUN3
+#   AKUN2_LOGIN=...  AKUN2_SERVER=...  AKUN2_PASSWORD=...
+#   AKUN2_PATH=C:/MT5-akun2/terminal64.exe   (satu instalasi terminal per akun)
+#   AKUN2_LOT_SCALE=2.0                       (opsional, default 1.0)
+
+MAX_RETRIES = 3
+RETRY_DELAY = 0.1
+DEVIATION = 20
+RETRY_CODES = (
+    mt5.TRADE_RETCODE_REQUOTE,
+    mt5.TRADE_RETCODE_PRICE_CHANGED,
+    mt5.TRADE_RETCODE_PRICE_OFF,
+    mt5.TRADE_RETCODE_TIMEOUT,
+    mt5.TRADE_RETCODE_CONNECTION,
+)
+
+def load_accounts(names):
+    accounts = []
+    for name in [n.strip() for n in names.split(',') if n.strip()]:
+        accounts.append({
+            'name': name,
+            'login': int(os.getenv(f'{name}_LOGIN')),
+            'server': os.getenv(f'{name}_SERVER'),
+            'password': os.getenv(f'{name}_PASSWORD'),
+            'path': os.getenv(f'{name}_PATH'),
+            'lot_scale': float(os.getenv(f'{name}_LOT_SCALE', '1.0')),
+        })
+    return accounts
+
+# --- EXECUTOR (proses per akun) ---
+def scale_volume(info, volume, scale):
+    volume = round(volume * scale / info.volume_step) * info.volume_step
+    return round(max(info.volume_min, min(volume, info.volume_max)), 8)
+
+def execute(account, intent):
+    report = {'account': account['name'], 'id': intent['id'], 'symbol': intent['symbol'],
+              'side': intent['side'], 'retcode': -1, 'comment': '', 'price': 0.0,
+              'volume': 0.0, 'attempts': 0}
+    if not mt5.symbol_select(intent['symbol'], True) or not mt5.symbol_info(intent['symbol']):
+        report['comment'] = 'simbol tidak tersedia'
+        return report
+    info = mt5.symbol_info(intent['symbol'])
+    volume = scale_volume(info, intent['volume'], account['lot_scale'])
+    is_buy = intent['side'] == 'BUY'
+    for attempt in range(1, MAX_RETRIES + 1):
+        tick = mt5.symbol_info_tick(intent['symbol'])
+        if not tick:
+            report['comment'] = 'tick tidak tersedia'
+            break
+        result = mt5.order_send({
+            'action': mt5.TRADE_ACTION_DEAL,
+            'symbol': intent['symbol'],
+            'volume': volume,
+            'type': mt5.ORDER_TYPE_BUY if is_buy else mt5.ORDER_TYPE_SELL,
+            'price': tick.ask if is_buy else tick.bid,
+            'sl': intent['sl'],
+            'tp': intent['tp'],
+            'deviation': DEVIATION,
+            'magic': intent['magic'],
+            'comment': intent['comment'],
+            'type_time': mt5.ORDER_TIME_GTC,
+            'type_filling': mt5.ORDER_FILLING_IOC,
+        })
+        report['attempts'] = attempt
+        if result is None:
+            report['comment'] = str(mt5.last_error())
+            break
+        report.update(retcode=result.retcode, comment=result.comment, price=result.price, volume=result.volume)
+        if result.retcode not in RETRY_CODES:
+            break
+        time.sleep(RETRY_DELAY)
+    report['latency_ms'] = (time.time() - intent['created']) * 1000
+    return report
+
+def run_executor(account, intents, results):
+    if not mt5.initialize(path=account['path'], login=account['login'],
+                          server=account['server'], password=account['password']):
+        results.put({'account': account['name'], 'id': None, 'retcode': -1,
+                     'comment': f'Gagal login: {mt5.last_error()}'})
+        return
+    try:
+        while True:
+            intent = intents.get()
+            if intent is None:
+                break
+            results.put(execute(account, intent))
+    finally:
+        mt5.shutdown()
+
+# --- PROSES UTAMA ---
+class FanOut:
+    def __init__(self, accounts):
+        self.accounts = accounts
+        self.queues = []
+        self.processes = []
+        self.results = multiprocessing.Queue()
+        self.next_id = 0
+
+    def start(self):
+        for account in self.accounts:
+            intents = multiprocessing.Queue()
+            process = multiprocessing.Process(target=run_executor, args=(account, intents, self.results),
+                                              name=f"executor-{account['name']}", daemon=True)
+            process.start()
+            self.queues.append(intents)
+            self.processes.append(process)
+        print(f"Fan-out aktif ke {len(self.accounts)} akun: {', '.join(a['name'] for a in self.accounts)}")
+
+    def submit(self, symbol, side, volume, sl, tp, magic, comment):
+        self.next_id += 1
+        intent = {'id': self.next_id, 'created': time.time(), 'symbol': symbol, 'side': side,
+                  'volume': volume, 'sl': sl, 'tp': tp, 'magic': magic, 'comment': comment}
+        for intents in self.queues:
+            intents.put(intent)
+        return self.next_id
+
+    def poll(self, timeout=0.0):
+        reports = []
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                reports.append(self.results.get(timeout=max(deadline - time.monotonic(), 0.001)))
+            except queue.Empty:
+                return reports
+
+    def stop(self):
+        for intents in self.queues:
+            intents.put(None)
+        for process in self.processes:
+            process.join(5)
+        self.queues = []
+        self.processes = []
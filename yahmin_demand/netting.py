@@ -0,0 +1,160 @@
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+import MetaTrader5 as mt5
+
+# Netting posisi hedging: pasangan buy/sell simbol yang sama ditutup satu sama lain dengan
+# TRADE_ACTION_CLOSE_BY (1 request, tanpa spread) alih-alih 2 close market (2 spread, 2 round-trip).
+# Tiap ronde: snapshot posisi, susun pasangan yang tidak berbagi ticket (volume sama dulu supaya
+# keduanya habis), kirim semuanya sekaligus dari thread pool. Sisa volume dari pasangan
+# berbeda volume dipasangkan lagi di ronde berikutnya dari snapshot baru; pasangan yang gagal
+# tidak diulang, ticket-nya dipasangkan dengan posisi lain.
+
+MAX_ROUNDS = 5
+RETRY_DELAY = 0.2   # detik antar ronde
+WORKERS = 8
+ACCOUNT_MARGIN_MODE_RETAIL_HEDGING = 2
+SYMBOL_ORDER_CLOSEBY = 64
+
+def snapshot(symbol=None, magic=None):
+    positions = mt5.positions_get(symbol=symbol) if symbol else mt5.positions_get()
+    return [p for p in positions or [] if magic is None or p.magic == magic]
+
+def plan_pairs(positions, select=None):
+    # select(buy, sell) -> bool: strategi bisa membatasi pasangan, mis. hanya jika total profit >= 0
+    by_symbol = {}
+    for p in positions:
+        side = 'buy' if p.type == mt5.ORDER_TYPE_BUY else 'sell'
+        by_symbol.setdefault(p.symbol, {'buy': [], 'sell': []})[side].append(p)
+    pairs = []
+    for sides in by_symbol.values():
+        buys = sorted(sides['buy'], key=lambda p: -p.volume)
+        sells = sorted(sides['sell'], key=lambda p: -p.volume)
+        # Volume sama dulu: satu request menutup dua posisi sekaligus
+        for buy in list(buys):
+            for sell in sells:
+                if abs(buy.volume - sell.volume) < 1e-9 and (select is None or select(buy, sell)):
+                    pairs.append((buy, sell))
+                    buys.remove(buy)
+                    sells.remove(sell)
+                    break
+        for buy in list(buys):
+            for sell in sells:
+                if select is None or select(buy, sell):
+                    pairs.append((buy, sell))
+                    sells.remove(sell)
+                    break
+    return pairs
+
+def close_by(buy, sell, magic, on_result=None):
+    request = {
+        'action': mt5.TRADE_ACTION_CLOSE_BY,
+        'symbol': buy.symbol,
+        'position': buy.ticket,
+        'position_by': sell.ticket,
+        'magic': magic if magic is not None else buy.magic,
+        'comment': 'Close by',
+    }
+    result = mt5.order_send(request)
+    if on_result:
+        on_result(request, result)
+    return result
+
+def spread_cost(symbol, volume):
+    # Biaya spread jika kedua kaki ditutup market: buy di bid + sell di ask = 1 spread penuh x volume
+    tick = mt5.symbol_info_tick(symbol)
+    info = mt5.symbol_info(symbol)
+    if not tick or not info or not info.trade_tick_size:
+        return 0.0
+    return (tick.ask - tick.bid) / info.trade_tick_size * info.trade_tick_value * volume
+
+def supported(symbol=None):
+    account = mt5.account_info()
+    if account is None or account.margin_mode != ACCOUNT_MARGIN_MODE_RETAIL_HEDGING:
+        return 'akun bukan hedging'
+    if symbol:
+        info = mt5.symbol_info(symbol)
+        if info is None or not info.order_mode & SYMBOL_ORDER_CLOSEBY:
+            return f'{symbol} tidak mendukung close by'
+    return None
+
+def net_positions(symbol=None, magic=None, select=None, max_rounds=MAX_ROUNDS, on_result=None):
+    start = time.perf_counter()
+    report = {
+        'pairs': 0,
+        'volume_netted': 0.0,
+        'spread_saved': 0.0,
+        'round_trips': 0,
+        'round_trips_avoided': 0,
+        'rounds': 0,
+        'failures': {},
+        'error': supported(symbol),
+    }
+    if report['error']:
+        report['time_ms'] = (time.perf_counter() - start) * 1000
+        return report
+    failed = report['failures']
+
+    def allowed(buy, sell):
+        return (buy.ticket, sell.ticket) not in failed and (select is None or select(buy, sell))
+
+    pairs = plan_pairs(snapshot(symbol, magic), allowed)
+    with ThreadPoolExecutor(max_workers=WORKERS) as pool:
+        while pairs and report['rounds'] < max_rounds:
+            report['rounds'] += 1
+            # Biaya spread dihitung sebelum kirim: harga saat keputusan netting
+            costs = [spread_cost(buy.symbol, min(buy.volume, sell.volume)) for buy, sell in pairs]
+            futures = [pool.submit(close_by, buy, sell, magic, on_result) for buy, sell in pairs]
+            done = 0
+            for (buy, sell), cost, future in zip(pairs, costs, futures):
+                result = future.result()
+                report['round_trips'] += 1
+                if result is not None and result.retcode == mt5.TRADE_RETCODE_DONE:
+                    done += 1
+                    report['pairs'] += 1
+                    report['volume_netted'] += min(buy.volume, sell.volume)
+                    report['spread_saved'] += cost
+                    # 2 close market -> 1 close by
+                    report['round_trips_avoided'] += 1
+                else:
+                    failed[(buy.ticket, sell.ticket)] = \
+                        result.retcode if result is not None else mt5.last_error()
+            if done < len(pairs):
+                time.sleep(RETRY_DELAY)
+            # Snapshot baru: sisa volume dari pasangan berbeda volume dipasangkan lagi
+            pairs = plan_pairs(snapshot(symbol, magic), allowed)
+    report['volume_netted'] = round(report['volume_netted'], 8)
+    report['remaining_pairs'] = len(plan_pairs(snapshot(symbol, magic), select))
+    report['time_ms'] = (time.perf_counter() - start) * 1000
+    return report
+
+def format_report(report):
+    if report['error']:
+        return f"Netting tidak dijalankan: {report['error']}"
+    text = (f"Netting: {report['pairs']} pasangan, {report['volume_netted']} lot, "
+            f"spread dihemat {report['spread_saved']:.2f}, {report['round_trips_avoided']} round-trip dihemat "
+            f"({report['round_trips']} request, {report['rounds']} ronde, {report['time_ms']:.0f} ms)")
+    if report['remaining_pairs']:
+        text += f" | {report['remaining_pairs']} pasangan tersisa, gagal: {report['failures']}"
+    return text
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Tutup pasangan posisi buy/sell dengan close by')
+    parser.add_argument('--symbol', default='XAUUSDm')
+    parser.add_argument('--magic', type=int)
+    parser.add_argument('--dry-run', action='store_true', help='tampilkan pasangan saja')
+    args = parser.parse_args()
+
+    if not mt5.initialize():
+        print(f'Gagal koneksi MT5: {mt5.last_error()}')
+        quit()
+    try:
+        if args.dry_run:
+            for buy, sell in plan_pairs(snapshot(args.symbol, args.magic)):
+                volume = min(buy.volume, sell.volume)
+                print(f'BUY #{buy.ticket} {buy.volume} x SELL #{sell.ticket} {sell.volume} '
+                      f'-> {volume} lot, spread dihemat {spread_cost(buy.symbol, volume):.2f}')
+        else:
+            print(format_report(net_positions(args.symbol, args.magic)))
+    finally:
+        mt5.shutdown()